@@ -150,7 +150,8 @@ def balance(
 
         live_plot = WheeledInvertedPendulumPlot(pendulum, order="velocities")
 
-    env.reset()  # connects to the spine
+    observation, info = env.reset()  # connects to the spine
+    upkie_env = env.unwrapped
     commanded_velocity = 0.0
     action = np.zeros(env.action_space.shape)
 
@@ -158,11 +159,12 @@ def balance(
     base_pitches = np.empty((nb_env_steps,)) if nb_env_steps > 0 else None
     step = 0
     while True:
+        # Send the last action, then plan the next one from the last
+        # observation while the spine cycles. Actions are thus computed from
+        # observations one control period older than with step(), in
+        # exchange for a planning time that no longer adds to the period.
         action[0] = commanded_velocity
-        observation, _, terminated, truncated, info = env.step(action)
-        if terminated or truncated:
-            observation, info = env.reset()
-            commanded_velocity = 0.0
+        upkie_env.step_async(action)
 
         spine_observation = info["spine_observation"]
         floor_contact = spine_observation["floor_contact"]["contact"]
@@ -226,17 +228,27 @@ def balance(
                 label="commanded_velocity",
             )
 
+        observation, _, terminated, truncated, info = upkie_env.step_wait()
+        if terminated or truncated:
+            observation, info = env.reset()
+            commanded_velocity = 0.0
+
         if nb_env_steps > 0:
             step += 1
             if step >= nb_env_steps:
                 break
 
-    report(mpc_problem, mpc_qp, planning_times)
+    report(mpc_problem, mpc_qp, planning_times, env.unwrapped.get_rate_stats())
     np.save("base_pitches.npy", base_pitches)
     np.save("planning_times.npy", planning_times)
 
 
-def report(mpc_problem, mpc_qp, planning_times: Optional[NDArray[float]]):
+def report(
+    mpc_problem,
+    mpc_qp,
+    planning_times: Optional[NDArray[float]],
+    rate_stats: dict,
+):
     average_ms = 1e3 * np.average(planning_times)
     std_ms = 1e3 * np.std(planning_times)
     nb_env_steps = planning_times.size
@@ -257,6 +269,19 @@ def report(mpc_problem, mpc_qp, planning_times: Optional[NDArray[float]]):
             f"{average_ms:.2} ± {std_ms:.2} ms over {nb_env_steps} calls"
         )
         print("")
+    if rate_stats:
+        jitter = rate_stats["jitter"]
+        print(
+            f"Deadline misses: {rate_stats['deadline_misses']} "
+            f"over {rate_stats['count']} steps, "
+            f"up to {rate_stats['max_consecutive_overruns']} in a row"
+        )
+        print(
+            f"Jitter: {1e6 * jitter['mean']:.0f} ± {1e6 * jitter['std']:.0f} "
+            f"us (p99 <= {1e6 * jitter['p99']:.0f} us, "
+            f"max {1e6 * jitter['max']:.0f} us)"
+        )
+        print("")
 
 
 if __name__ == "__main__":
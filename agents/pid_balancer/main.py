@@ -12,11 +12,11 @@ from os import path
 
 import gin
 import yaml
-from loop_rate_limiters import RateLimiter
 from servo_controller import ServoController
 from vulp.spine import SpineInterface
 
 from upkie.utils.raspi import configure_agent_process, on_raspi
+from upkie.utils.rate_regulator import RateRegulator
 from upkie.utils.spdlog import logging
 
 
@@ -43,6 +43,7 @@ def run(
     spine: SpineInterface,
     spine_config: dict,
     frequency: float = 200.0,
+    spin_duration: float = 0.0,
 ) -> None:
     """!
     Read observations and send actions to the spine.
@@ -50,10 +51,12 @@ def run(
     @param spine Interface to the spine.
     @param spine_config Spine configuration dictionary.
     @param frequency Control frequency in Hz.
+    @param spin_duration Duration before each clock tick, in seconds, during
+        which the rate regulator busy-waits rather than sleeps.
     """
     controller = ServoController()
     dt = 1.0 / frequency
-    rate = RateLimiter(frequency, "controller")
+    rate = RateRegulator(frequency, "controller", spin_duration=spin_duration)
 
     wheel_radius = controller.wheel_radius
     spine_config["wheel_odometry"] = {
@@ -68,7 +71,13 @@ def run(
     while True:
         observation = spine.get_observation()
         action = controller.cycle(observation, dt)
-        action["env"] = {"rate": {"slack": rate.slack}}
+        action["env"] = {
+            "rate": {
+                "consecutive_overruns": rate.consecutive_overruns,
+                "deadline_misses": rate.deadline_misses,
+                "slack": rate.slack,
+            }
+        }
         spine.set_action(action)
         rate.sleep()
 
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Compare steps per second of vectorized environments for training."""
+
+import argparse
+import os
+import time
+from typing import Callable
+
+import gin
+import numpy as np
+from rules_python.python.runfiles import runfiles
+from settings import EnvSettings
+from stable_baselines3.common.vec_env import SubprocVecEnv
+from train import get_bullet_argv
+
+from upkie.envs import UpkieGroundVelocity, UpkieVectorEnv
+from upkie.utils.spdlog import logging
+from upkie.utils.spine_pool import SpinePool
+
+
+def parse_command_line_arguments() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns:
+        Command-line arguments.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--nb-envs",
+        default=[1, 2, 4, 8],
+        nargs="+",
+        type=int,
+        help="numbers of parallel environments to benchmark",
+    )
+    parser.add_argument(
+        "--nb-steps",
+        default=2000,
+        type=int,
+        help="number of vectorized steps per measurement",
+    )
+    return parser.parse_args()
+
+
+def make_velocity_env(shm_name: str) -> UpkieGroundVelocity:
+    env_settings = EnvSettings()
+    return UpkieGroundVelocity(
+        frequency=env_settings.agent_frequency,
+        regulate_frequency=False,
+        shm_name=shm_name,
+        spine_config=env_settings.spine_config,
+        max_ground_velocity=env_settings.max_ground_velocity,
+    )
+
+
+def make_env_fn(shm_name: str) -> Callable[[], UpkieGroundVelocity]:
+    def _init():
+        return make_velocity_env(shm_name)
+
+    return _init
+
+
+def measure_steps_per_second(vec_env, nb_steps: int) -> float:
+    """!
+    Measure the number of environment steps per second.
+
+    @param vec_env Vectorized environment.
+    @param nb_steps Number of vectorized steps.
+    @returns Number of sub-environment steps per second.
+    """
+    actions = np.zeros((vec_env.num_envs, 1))
+    vec_env.reset()
+    t0 = time.perf_counter()
+    for _ in range(nb_steps):
+        vec_env.step(actions)
+    duration = time.perf_counter() - t0
+    return vec_env.num_envs * nb_steps / duration
+
+
+def benchmark(spine_path: str, nb_envs: int, nb_steps: int) -> None:
+    with SpinePool(spine_path, nb_envs, get_bullet_argv(show=False)) as pool:
+        subproc_env = SubprocVecEnv(
+            [make_env_fn(shm_name) for shm_name in pool.shm_names],
+            start_method="fork",
+        )
+        subproc_rate = measure_steps_per_second(subproc_env, nb_steps)
+        subproc_env.close()
+
+        vector_env = UpkieVectorEnv(
+            [make_velocity_env(shm_name) for shm_name in pool.shm_names]
+        )
+        vector_rate = measure_steps_per_second(vector_env, nb_steps)
+        vector_env.close()
+
+    print(
+        f"{nb_envs=:3d}: "
+        f"SubprocVecEnv {subproc_rate:8.0f} steps/s, "
+        f"UpkieVectorEnv {vector_rate:8.0f} steps/s "
+        f"(x{vector_rate / subproc_rate:.2f})"
+    )
+
+
+if __name__ == "__main__":
+    args = parse_command_line_arguments()
+    agent_dir = os.path.dirname(__file__)
+    gin.parse_config_file(f"{agent_dir}/settings.gin")
+
+    deez_runfiles = runfiles.Create()
+    spine_path = os.path.join(
+        agent_dir,
+        deez_runfiles.Rlocation("upkie/spines/bullet_spine"),
+    )
+    logging.info("Benchmarking with %d steps per measurement", args.nb_steps)
+    for nb_envs in args.nb_envs:
+        benchmark(spine_path, nb_envs, args.nb_steps)
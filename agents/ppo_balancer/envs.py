@@ -7,64 +7,42 @@
 import gymnasium
 import numpy as np
 from gymnasium import spaces
-from gymnasium.wrappers import FrameStack, RescaleAction
 from settings import EnvSettings
 
 from upkie.envs import UpkieGroundVelocity
-from upkie.envs.wrappers import (
-    AddActionToObservation,
-    DifferentiateAction,
-    LowPassFilterAction,
-    NoisifyAction,
-    NoisifyObservation,
-)
+from upkie.envs.wrappers import FusedAccelerationWrapper
 
 
-def make_training_env(
-    velocity_env: UpkieGroundVelocity,
-    env_settings: EnvSettings,
-) -> gymnasium.Wrapper:
-    action_noise = np.array(env_settings.action_noise)
-    observation_noise = np.array(env_settings.observation_noise)
-    noisy_obs_env = NoisifyObservation(velocity_env, noise=observation_noise)
-    noisy_env = NoisifyAction(noisy_obs_env, noise=action_noise)
-    filtered_env = LowPassFilterAction(
-        noisy_env,
-        time_constant=spaces.Box(*env_settings.action_lpf),
-    )
-    return filtered_env
-
-
-def make_accel_env(
+def make_ppo_balancer_env(
     velocity_env: UpkieGroundVelocity,
     env_settings: EnvSettings,
     training: bool,
 ) -> gymnasium.Wrapper:
-    inner_env = (
-        make_training_env(velocity_env, env_settings)
-        if training
-        else velocity_env
-    )
-    history_env = FrameStack(
-        AddActionToObservation(inner_env),
-        env_settings.history_size,
-    )
-    accel_env = DifferentiateAction(
-        history_env,
+    """!
+    Wrap a ground velocity environment for the PPO balancer.
+
+    The policy acts on the normalized ground acceleration and observes the
+    history of observations and ground velocities. During training, actions
+    are also low-pass filtered, and noise is added to actions and
+    observations.
+
+    @param velocity_env Ground velocity environment.
+    @param env_settings Environment settings.
+    @param training True if the environment is used for training.
+    @returns Wrapped environment.
+    """
+    return FusedAccelerationWrapper(
+        velocity_env,
+        history_size=env_settings.history_size,
         min_derivative=-env_settings.max_ground_accel,
         max_derivative=+env_settings.max_ground_accel,
+        action_noise=(
+            np.array(env_settings.action_noise) if training else None
+        ),
+        observation_noise=(
+            np.array(env_settings.observation_noise) if training else None
+        ),
+        time_constant=(
+            spaces.Box(*env_settings.action_lpf) if training else None
+        ),
     )
-    rescaled_accel_env = RescaleAction(
-        accel_env,
-        min_action=-1.0,
-        max_action=+1.0,
-    )
-    return rescaled_accel_env
-
-
-def make_ppo_balancer_env(
-    velocity_env: UpkieGroundVelocity,
-    env_settings: EnvSettings,
-    training: bool,
-) -> gymnasium.Wrapper:
-    return make_accel_env(velocity_env, env_settings, training=training)
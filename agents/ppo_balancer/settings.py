@@ -62,4 +62,5 @@ class TrainingSettings:
     init_rand: dict
     max_episode_duration: float
     return_horizon: float
+    soft_reset: bool
     total_timesteps: int
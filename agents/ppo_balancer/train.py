@@ -8,7 +8,6 @@ import argparse
 import datetime
 import os
 import random
-import signal
 import tempfile
 from typing import Callable, List
 
@@ -29,6 +28,7 @@ from torch import nn
 
 import upkie.envs
 from upkie.utils.spdlog import logging
+from upkie.utils.spine_pool import SpinePool
 
 upkie.envs.register()
 
@@ -128,13 +128,13 @@ def get_random_word():
     return words[word_index]
 
 
-def get_bullet_argv(shm_name: str, show: bool) -> List[str]:
+def get_bullet_argv(show: bool) -> List[str]:
     """!
     Get command-line arguments for the Bullet spine.
 
-    @param shm_name Name of the shared-memory file.
     @param show If true, show simulator GUI.
-    @returns Command-line arguments.
+    @returns Command-line arguments, except the shared-memory name which is
+        set by the spine pool.
     """
     env_settings = EnvSettings()
     agent_frequency = env_settings.agent_frequency
@@ -142,7 +142,6 @@ def get_bullet_argv(shm_name: str, show: bool) -> List[str]:
     assert spine_frequency % agent_frequency == 0
     nb_substeps = spine_frequency / agent_frequency
     bullet_argv = []
-    bullet_argv.extend(["--shm-name", shm_name])
     bullet_argv.extend(["--nb-substeps", str(nb_substeps)])
     bullet_argv.extend(["--spine-frequency", str(spine_frequency)])
     if show:
@@ -152,28 +151,21 @@ def get_bullet_argv(shm_name: str, show: bool) -> List[str]:
 
 def init_env(
     max_episode_duration: float,
-    show: bool,
-    spine_path: str,
+    shm_name: str,
+    soft_reset: bool,
 ):
     """!
     Get an environment initialization function for a set of parameters.
 
     @param max_episode_duration Maximum duration of an episode, in seconds.
-    @param show If true, show simulator GUI.
-    @param spine_path Path to the Bullet spine binary.
+    @param shm_name Name of the shared-memory file of a running spine.
+    @param soft_reset If true, re-teleport the robot without restarting the
+        spine upon resets.
     """
     env_settings = EnvSettings()
     seed = random.randint(0, 1_000_000)
 
     def _init():
-        shm_name = f"/{get_random_word()}"
-        pid = os.fork()
-        if pid == 0:  # child process: spine
-            argv = get_bullet_argv(shm_name, show=show)
-            os.execvp(spine_path, ["bullet"] + argv)
-            return
-
-        # parent process: trainer
         agent_frequency = env_settings.agent_frequency
         velocity_env = gymnasium.make(
             env_settings.env_id,
@@ -184,19 +176,11 @@ def init_env(
                 **env_settings.reward_weights
             ),
             shm_name=shm_name,
+            soft_reset=soft_reset,
             spine_config=env_settings.spine_config,
             max_ground_velocity=env_settings.max_ground_velocity,
         )
         velocity_env.reset(seed=seed)
-        velocity_env._prepatch_close = velocity_env.close
-
-        def close_monkeypatch():
-            logging.info(f"Terminating spine {shm_name} with {pid=}...")
-            os.kill(pid, signal.SIGINT)  # interrupt spine child process
-            os.waitpid(pid, 0)  # wait for spine to terminate
-            velocity_env._prepatch_close()
-
-        velocity_env.close = close_monkeypatch
         env = make_ppo_balancer_env(velocity_env, env_settings, training=True)
         return Monitor(env)
 
@@ -263,30 +247,24 @@ def train_policy(
         deez_runfiles.Rlocation("upkie/spines/bullet_spine"),
     )
 
-    vec_env = (
-        SubprocVecEnv(
-            [
-                init_env(
-                    max_episode_duration=training.max_episode_duration,
-                    show=show,
-                    spine_path=spine_path,
-                )
-                for i in range(nb_envs)
-            ],
-            start_method="fork",
+    spine_pool = SpinePool(spine_path, nb_envs, get_bullet_argv(show=show))
+    env_fns = [
+        init_env(
+            max_episode_duration=training.max_episode_duration,
+            shm_name=shm_name,
+            soft_reset=training.soft_reset,
         )
+        for shm_name in spine_pool.shm_names
+    ]
+    vec_env = (
+        SubprocVecEnv(env_fns, start_method="fork")
         if nb_envs > 1
-        else DummyVecEnv(
-            [
-                init_env(
-                    max_episode_duration=training.max_episode_duration,
-                    show=show,
-                    spine_path=spine_path,
-                )
-            ]
-        )
+        else DummyVecEnv(env_fns)
     )
 
+    # Environments reconnect to crashed spines once they are restarted
+    spine_pool.start_watchdog()
+
     env_settings = EnvSettings()
     dt = 1.0 / env_settings.agent_frequency
     gamma = 1.0 - dt / training.return_horizon
@@ -369,6 +347,7 @@ def train_policy(
     # Save policy no matter what!
     policy.save(f"{save_path}/final.zip")
     policy.env.close()
+    spine_pool.close()
 
 
 if __name__ == "__main__":
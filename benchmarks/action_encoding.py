@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Compare spine action encoding times and sizes in UpkieGroundVelocity."""
+
+import math
+import timeit
+from multiprocessing.shared_memory import SharedMemory
+
+import msgpack
+import numpy as np
+from vulp.utils import serialize
+
+from upkie.envs import UpkieGroundVelocity
+from upkie.envs.tests.mock_spine import MockSpine
+from upkie.utils.nested_delta import nested_delta
+
+
+def get_spine_action_from_scratch(
+    env: UpkieGroundVelocity, action: np.ndarray
+) -> dict:
+    """!
+    Reference path building a new action dictionary at every step.
+
+    @param env Ground velocity environment.
+    @param action Environment action.
+    @returns Spine action dictionary.
+    """
+    wheel_velocity = action[0] / env.wheel_radius
+    servo_dict = env.get_leg_servo_action()
+    servo_dict.update(
+        {
+            "left_wheel": {
+                "position": math.nan,
+                "velocity": +wheel_velocity,
+                "maximum_torque": 1.0,
+            },
+            "right_wheel": {
+                "position": math.nan,
+                "velocity": -wheel_velocity,
+                "maximum_torque": 1.0,
+            },
+        }
+    )
+    return {"servo": servo_dict}
+
+
+def report(label: str, durations: list, number: int, size: int) -> float:
+    per_step_us = 1e6 * min(durations) / number
+    print(f"{label:>18}: {per_step_us:6.2f} µs per step, {size:4d} bytes")
+    return per_step_us
+
+
+if __name__ == "__main__":
+    shared_memory = SharedMemory(name=None, size=42, create=True)
+    env = UpkieGroundVelocity(shm_name=shared_memory._name)
+    shared_memory.close()
+    env._spine = MockSpine()
+    env.reset()
+
+    packer = msgpack.Packer(default=serialize, use_bin_type=True)
+    action = np.array([0.1], dtype=np.float32)
+    last_spine_action = {}
+
+    def next_action():
+        action[0] = -action[0]  # wheel velocities change at every step
+        return action
+
+    def encode_from_scratch():
+        action = next_action()
+        return packer.pack(get_spine_action_from_scratch(env, action))
+
+    def encode_template():
+        return packer.pack(env.get_spine_action(next_action()))
+
+    def encode_delta():
+        spine_action = env.get_spine_action(next_action())
+        return packer.pack(nested_delta(spine_action, last_spine_action))
+
+    number, repeat = 10_000, 5
+    results = {}
+    for label, encode in (
+        ("from scratch", encode_from_scratch),
+        ("template", encode_template),
+        ("template + delta", encode_delta),
+    ):
+        durations = timeit.repeat(encode, number=number, repeat=repeat)
+        results[label] = (durations, len(encode()))
+
+    print(f"Best of {repeat} runs of {number} steps:")
+    for label, (durations, size) in results.items():
+        report(label, durations, number, size)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Compare base pitch and orientation throughputs, one quaternion at a time
+or in batch, on one million IMU samples. Pitches are computed both in
+closed form (default) and from rotation matrices."""
+
+import timeit
+
+import numpy as np
+
+from upkie.observers.base_pitch import (
+    compute_base_orientation_from_imu,
+    compute_base_orientations_from_imu,
+    compute_base_pitch_from_imu,
+    compute_base_pitches_from_imu,
+)
+
+
+def report(label: str, durations: list, nb_samples: int) -> float:
+    samples_per_second = nb_samples / min(durations)
+    print(f"{label:>24}: {samples_per_second / 1e6:8.3f} M samples/s")
+    return samples_per_second
+
+
+if __name__ == "__main__":
+    nb_samples = 1_000_000
+    nb_loop_samples = 10_000  # loops are too slow for the full array
+    rng = np.random.default_rng(0)
+    quats = rng.normal(size=(nb_samples, 4))
+    quats /= np.linalg.norm(quats, axis=1, keepdims=True)
+    loop_quats = quats[:nb_loop_samples]
+
+    pitches = compute_base_pitches_from_imu(quats)
+    loop_pitches = [compute_base_pitch_from_imu(quat) for quat in loop_quats]
+    assert np.allclose(pitches[:nb_loop_samples], loop_pitches, atol=1e-10)
+
+    default_mounting = np.diag([-1.0, 1.0, -1.0])
+    repeat = 3
+    durations = {
+        "pitch matrix loop": timeit.repeat(
+            lambda: [
+                compute_base_pitch_from_imu(q, default_mounting)
+                for q in loop_quats
+            ],
+            number=1,
+            repeat=repeat,
+        ),
+        "pitch loop": timeit.repeat(
+            lambda: [compute_base_pitch_from_imu(q) for q in loop_quats],
+            number=1,
+            repeat=repeat,
+        ),
+        "pitch matrix batch": timeit.repeat(
+            lambda: compute_base_pitches_from_imu(quats, default_mounting),
+            number=1,
+            repeat=repeat,
+        ),
+        "pitch batch": timeit.repeat(
+            lambda: compute_base_pitches_from_imu(quats),
+            number=1,
+            repeat=repeat,
+        ),
+        "orientation loop": timeit.repeat(
+            lambda: [compute_base_orientation_from_imu(q) for q in loop_quats],
+            number=1,
+            repeat=repeat,
+        ),
+        "orientation batch": timeit.repeat(
+            lambda: compute_base_orientations_from_imu(quats),
+            number=1,
+            repeat=repeat,
+        ),
+    }
+
+    print(f"Best of {repeat} runs:")
+    report(
+        "pitch matrix loop", durations["pitch matrix loop"], nb_loop_samples
+    )
+    report("pitch matrix batch", durations["pitch matrix batch"], nb_samples)
+    for quantity in ("pitch", "orientation"):
+        loop = report(
+            f"{quantity} loop", durations[f"{quantity} loop"], nb_loop_samples
+        )
+        batch = report(
+            f"{quantity} batch", durations[f"{quantity} batch"], nb_samples
+        )
+        print(f"{quantity.capitalize()} speedup: x{batch / loop:.1f}")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Compare the stacked wrappers of the PPO balancer with the fused wrapper."""
+
+import timeit
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from gymnasium import spaces
+from gymnasium.wrappers import RescaleAction
+
+from upkie.envs import UpkieGroundVelocity
+from upkie.envs.tests.mock_spine import MockSpine
+from upkie.envs.wrappers import (
+    DifferentiateAction,
+    FusedAccelerationWrapper,
+    LowPassFilterAction,
+    NoisifyAction,
+    NoisifyObservation,
+    ObservationActionHistory,
+)
+
+ACTION_LPF = (0.002, 0.02)  # [s]
+ACTION_NOISE = np.array([0.05])
+HISTORY_SIZE = 10
+MAX_GROUND_ACCEL = 10.0  # [m] / [s]²
+OBSERVATION_NOISE = np.array([0.01, 0.01, 0.01, 0.01])
+
+
+def make_stacked_env(velocity_env: UpkieGroundVelocity):
+    """!
+    Stack wrappers as the PPO balancer did before the fused wrapper.
+
+    @param velocity_env Ground velocity environment.
+    @returns Wrapped environment.
+    """
+    env = NoisifyObservation(velocity_env, noise=OBSERVATION_NOISE)
+    env = NoisifyAction(env, noise=ACTION_NOISE)
+    env = LowPassFilterAction(env, time_constant=spaces.Box(*ACTION_LPF))
+    env = ObservationActionHistory(env, HISTORY_SIZE)
+    env = DifferentiateAction(
+        env,
+        min_derivative=-MAX_GROUND_ACCEL,
+        max_derivative=+MAX_GROUND_ACCEL,
+    )
+    return RescaleAction(env, min_action=-1.0, max_action=+1.0)
+
+
+def make_fused_env(velocity_env: UpkieGroundVelocity):
+    """!
+    Wrap the environment in a single fused wrapper.
+
+    @param velocity_env Ground velocity environment.
+    @returns Wrapped environment.
+    """
+    return FusedAccelerationWrapper(
+        velocity_env,
+        history_size=HISTORY_SIZE,
+        min_derivative=-MAX_GROUND_ACCEL,
+        max_derivative=+MAX_GROUND_ACCEL,
+        action_noise=ACTION_NOISE,
+        observation_noise=OBSERVATION_NOISE,
+        time_constant=spaces.Box(*ACTION_LPF),
+    )
+
+
+def report(label: str, durations: list, number: int) -> float:
+    per_step_us = 1e6 * min(durations) / number
+    print(f"{label:>24}: {per_step_us:6.2f} µs per step")
+    return per_step_us
+
+
+if __name__ == "__main__":
+    shared_memory = SharedMemory(name=None, size=42, create=True)
+    velocity_env = UpkieGroundVelocity(
+        regulate_frequency=False,
+        shm_name=shared_memory._name,
+    )
+    shared_memory.close()
+    velocity_env._spine = MockSpine()
+    velocity_env.reset()
+
+    stacked_env = make_stacked_env(velocity_env)
+    fused_env = make_fused_env(velocity_env)
+    stacked_env.reset(seed=0)
+    fused_env.reset(seed=0)
+    action = np.array([0.1], dtype=np.float32)
+    velocity_action = np.array([0.1])
+
+    # Interleave measurements so that all variants see the same machine load
+    number, repeat = 10_000, 10
+    base_durations, stacked_durations, fused_durations = [], [], []
+    for _ in range(repeat):
+        base_durations.append(
+            timeit.timeit(
+                lambda: velocity_env.step(velocity_action), number=number
+            )
+        )
+        stacked_durations.append(
+            timeit.timeit(lambda: stacked_env.step(action), number=number)
+        )
+        fused_durations.append(
+            timeit.timeit(lambda: fused_env.step(action), number=number)
+        )
+
+    print(f"Best of {repeat} runs of {number} steps:")
+    base_us = report("unwrapped environment", base_durations, number)
+    stacked_us = report("stacked wrappers", stacked_durations, number)
+    fused_us = report("fused wrapper", fused_durations, number)
+    print(
+        f"Wrapper overhead: {stacked_us - base_us:.2f} µs "
+        f"-> {fused_us - base_us:.2f} µs per step"
+    )
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Compare observation, reward and fall detection times per step in
+UpkieGroundVelocity."""
+
+import timeit
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from upkie.envs import UpkieGroundVelocity
+from upkie.envs.tests.mock_spine import MockSpine
+from upkie.observers.base_pitch import (
+    compute_base_angular_velocity_from_imu,
+    compute_base_pitch_from_imu,
+)
+
+
+def step_with_matrices(
+    env: UpkieGroundVelocity,
+    spine_observation: dict,
+    action: np.ndarray,
+) -> tuple:
+    """!
+    Reference path computing pitch from rotation matrices, twice, and the
+    reward with NumPy scalar operations.
+
+    @param env Ground velocity environment.
+    @param spine_observation Spine observation dictionary.
+    @param action Environment action vector.
+    @returns Tuple ``(observation, reward, terminated)``.
+    """
+    fields = env.observation_schema.extract(
+        spine_observation, env.observation_schema.allocate()
+    )
+    schema = env.observation_schema
+    pitch = compute_base_pitch_from_imu(
+        fields[schema.index("imu", "orientation")]
+    )
+    angular_velocity = compute_base_angular_velocity_from_imu(
+        fields[schema.index("imu", "angular_velocity")]
+    )
+    observation = np.empty(4, dtype=float)
+    observation[0] = pitch
+    observation[1] = fields[schema.index("wheel_odometry", "position")]
+    observation[2] = angular_velocity[1]
+    observation[3] = fields[schema.index("wheel_odometry", "velocity")]
+    reward = env.get_reward(observation, action)
+    imu = spine_observation["imu"]
+    terminated = abs(compute_base_pitch_from_imu(imu["orientation"])) > 1.0
+    return observation, reward, terminated
+
+
+def step_fused(
+    env: UpkieGroundVelocity,
+    spine_observation: dict,
+    action: np.ndarray,
+) -> tuple:
+    """!
+    Fused path of the environment.
+
+    @param env Ground velocity environment.
+    @param spine_observation Spine observation dictionary.
+    @param action Environment action vector.
+    @returns Tuple ``(observation, reward, terminated)``.
+    """
+    observation = env.get_env_observation(spine_observation)
+    reward = env.get_reward(observation, action)
+    terminated = env.detect_fall(spine_observation)
+    return observation, reward, terminated
+
+
+def report(label: str, durations: list, number: int) -> float:
+    per_step_us = 1e6 * min(durations) / number
+    print(f"{label:>24}: {per_step_us:6.2f} µs per step")
+    return per_step_us
+
+
+if __name__ == "__main__":
+    shared_memory = SharedMemory(name=None, size=42, create=True)
+    env = UpkieGroundVelocity(shm_name=shared_memory._name)
+    shared_memory.close()
+    spine_observation = MockSpine().observation
+    half_angle = 0.15  # [rad]
+    spine_observation["imu"]["orientation"] = [
+        np.cos(half_angle),
+        0.0,
+        np.sin(half_angle),
+        0.0,
+    ]
+    spine_observation["imu"]["angular_velocity"] = [0.0, 0.5, 0.0]
+    spine_observation["wheel_odometry"]["velocity"] = 0.2
+    action = np.zeros(1)
+
+    reference = step_with_matrices(env, spine_observation, action)
+    fused = step_fused(env, spine_observation, action)
+    assert np.allclose(reference[0], fused[0], rtol=0.0, atol=1e-12)
+    assert abs(reference[1] - fused[1]) < 1e-12
+    assert reference[2] == fused[2]
+
+    number, repeat = 10_000, 10
+    matrix_durations = timeit.repeat(
+        lambda: step_with_matrices(env, spine_observation, action),
+        number=number,
+        repeat=repeat,
+    )
+    fused_durations = timeit.repeat(
+        lambda: step_fused(env, spine_observation, action),
+        number=number,
+        repeat=repeat,
+    )
+
+    print(f"Best of {repeat} runs of {number} steps:")
+    matrix_us = report("rotation matrices", matrix_durations, number)
+    fused_us = report("fused scalar kernel", fused_durations, number)
+    print(f"Speedup: x{matrix_us / fused_us:.2f}")
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Compare observation decoding times per step in UpkieGroundVelocity.
+
+The reference path is a frozen copy of the original decoding, which reads
+fields from the nested spine observation dictionary and computes the base
+pitch from rotation matrices, once for the observation and once more for
+fall detection. It does not call library functions, so that it keeps
+measuring the original path as they are optimized."""
+
+import timeit
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from upkie.envs import UpkieGroundVelocity
+from upkie.envs.tests.mock_spine import MockSpine
+
+## Rotation matrix from the base frame to the IMU frame (default mounting).
+ROTATION_BASE_TO_IMU = np.diag([-1.0, 1.0, -1.0])
+
+## Rotation matrix from the attitude reference system to the world frame.
+ROTATION_ARS_TO_WORLD = np.diag([1.0, -1.0, -1.0])
+
+
+def reference_base_pitch(quat) -> float:
+    """!
+    Matrix-based pitch computation from the original base pitch observer.
+
+    @param quat IMU orientation quaternion in ``[w, x, y, z]`` format.
+    @returns Base pitch angle in [rad].
+    """
+    if abs(np.dot(quat, quat) - 1.0) > 1e-5:
+        raise ValueError(f"Quaternion {quat} is not normalized")
+    qw, qx, qy, qz = quat
+    rotation_imu_to_ars = np.array(
+        [
+            [
+                1 - 2 * (qy**2 + qz**2),
+                2 * (qx * qy - qz * qw),
+                2 * (qw * qy + qx * qz),
+            ],
+            [
+                2 * (qx * qy + qz * qw),
+                1 - 2 * (qx**2 + qz**2),
+                2 * (qy * qz - qx * qw),
+            ],
+            [
+                2 * (qx * qz - qy * qw),
+                2 * (qy * qz + qx * qw),
+                1 - 2 * (qx**2 + qy**2),
+            ],
+        ]
+    )
+    rotation_base_to_world = (
+        ROTATION_ARS_TO_WORLD @ rotation_imu_to_ars @ ROTATION_BASE_TO_IMU
+    )
+    sagittal = rotation_base_to_world[:, 0]
+    sagittal /= np.linalg.norm(sagittal)
+    heading_in_world = sagittal - sagittal[2] * np.array([0.0, 0.0, 1.0])
+    heading_in_world /= np.linalg.norm(heading_in_world)
+    if rotation_base_to_world[2, 2] < 0:
+        heading_in_world *= -1.0
+    sign = +1 if sagittal[2] < 0 else -1
+    cos_pitch = min(max(np.dot(sagittal, heading_in_world), -1.0), 1.0)
+    return float(sign * np.arccos(cos_pitch))
+
+
+def reference_step(spine_observation: dict, env) -> tuple:
+    """!
+    Original observation, reward and fall detection of one step.
+
+    @param spine_observation Spine observation dictionary.
+    @param env Environment to read reward weights and fall pitch from.
+    @returns Tuple ``(observation, reward, terminated)``.
+    """
+    imu = spine_observation["imu"]
+    pitch_base_in_world = reference_base_pitch(imu["orientation"])
+    angular_velocity_base_in_base = ROTATION_BASE_TO_IMU.T @ np.array(
+        imu["angular_velocity"]
+    )
+    ground_position = spine_observation["wheel_odometry"]["position"]
+    ground_velocity = spine_observation["wheel_odometry"]["velocity"]
+
+    obs = np.empty(4, dtype=float)
+    obs[0] = pitch_base_in_world
+    obs[1] = ground_position
+    obs[2] = angular_velocity_base_in_base[1]
+    obs[3] = ground_velocity
+
+    pitch, ground_position, angular_velocity, ground_velocity = obs
+    tip_height = 0.58  # [m]
+    tip_position = ground_position + tip_height * np.sin(pitch)
+    tip_velocity = (
+        ground_velocity + tip_height * angular_velocity * np.cos(pitch)
+    )
+    std_position = 0.05  # [m]
+    position_reward = np.exp(-((tip_position / std_position) ** 2))
+    velocity_penalty = -abs(tip_velocity)
+    reward = (
+        env.reward_weights.position * position_reward
+        + env.reward_weights.velocity * velocity_penalty
+    )
+
+    pitch = reference_base_pitch(imu["orientation"])
+    terminated = abs(pitch) > env.fall_pitch
+    return obs, reward, terminated
+
+
+def env_step(spine_observation: dict, env, action) -> tuple:
+    """!
+    Observation, reward and fall detection of one step in the environment.
+
+    @param spine_observation Spine observation dictionary.
+    @param env Environment.
+    @param action Environment action.
+    @returns Tuple ``(observation, reward, terminated)``.
+    """
+    observation = env.get_env_observation(spine_observation)
+    reward = env.get_reward(observation, action)
+    terminated = env.detect_fall(spine_observation)
+    return observation, reward, terminated
+
+
+def report(label: str, durations: list, number: int) -> float:
+    per_step_us = 1e6 * min(durations) / number
+    print(f"{label:>24}: {per_step_us:6.2f} µs per step")
+    return per_step_us
+
+
+if __name__ == "__main__":
+    shared_memory = SharedMemory(name=None, size=42, create=True)
+    env = UpkieGroundVelocity(shm_name=shared_memory._name)
+    shared_memory.close()
+    spine_observation = MockSpine().observation
+    half_angle = 0.1
+    spine_observation["imu"]["orientation"] = [
+        np.cos(half_angle),
+        0.0,
+        np.sin(half_angle),
+        0.0,
+    ]
+    spine_observation["imu"]["angular_velocity"] = [0.1, 0.2, 0.3]
+    action = np.zeros(env.action_space.shape)
+
+    reference = reference_step(spine_observation, env)
+    schema = env_step(spine_observation, env, action)
+    assert np.allclose(reference[0], schema[0])
+    assert np.isclose(reference[1], schema[1])
+    assert reference[2] == schema[2]
+
+    number, repeat = 10_000, 5
+    buffer = env.observation_schema.allocate()
+    reference_durations = timeit.repeat(
+        lambda: reference_step(spine_observation, env),
+        number=number,
+        repeat=repeat,
+    )
+    extract_durations = timeit.repeat(
+        lambda: env.observation_schema.extract(spine_observation, buffer),
+        number=number,
+        repeat=repeat,
+    )
+    schema_durations = timeit.repeat(
+        lambda: env_step(spine_observation, env, action),
+        number=number,
+        repeat=repeat,
+    )
+
+    print(f"Best of {repeat} runs of {number} steps:")
+    reference_us = report("nested dictionary", reference_durations, number)
+    report("schema extraction only", extract_durations, number)
+    schema_us = report("schema observation", schema_durations, number)
+    print(f"Speedup: x{reference_us / schema_us:.2f}")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Compare observation history wrappers on the ground velocity environment."""
+
+import timeit
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from upkie.envs import UpkieGroundVelocity
+from upkie.envs.tests.mock_spine import MockSpine
+from upkie.envs.wrappers import (
+    AddActionToObservation,
+    ObservationActionHistory,
+)
+
+try:
+    from gymnasium.wrappers import FrameStack
+except ImportError:  # gymnasium >= 1.0
+    from gymnasium.wrappers import FrameStackObservation as FrameStack
+
+
+def step_as_array(env, action: np.ndarray) -> np.ndarray:
+    """!
+    Step an environment and convert its observation to an array, as Stable
+    Baselines3 does with ``LazyFrames``.
+
+    @param env Environment to step.
+    @param action Action vector.
+    @returns Observation array.
+    """
+    observation, _, _, _, _ = env.step(action)
+    return np.asarray(observation)
+
+
+def report(label: str, durations: list, number: int) -> float:
+    per_step_us = 1e6 * min(durations) / number
+    print(f"{label:>24}: {per_step_us:6.2f} µs per step")
+    return per_step_us
+
+
+if __name__ == "__main__":
+    history_size = 10
+    shared_memory = SharedMemory(name=None, size=42, create=True)
+    velocity_env = UpkieGroundVelocity(
+        regulate_frequency=False,
+        shm_name=shared_memory._name,
+    )
+    shared_memory.close()
+    velocity_env._spine = MockSpine()
+    velocity_env.reset()
+    action = np.array([0.1])
+
+    stack_env = FrameStack(AddActionToObservation(velocity_env), history_size)
+    history_env = ObservationActionHistory(velocity_env, history_size)
+    stack_env.reset()
+    history_env.reset()
+
+    number, repeat = 10_000, 10
+    base_durations = timeit.repeat(
+        lambda: step_as_array(velocity_env, action),
+        number=number,
+        repeat=repeat,
+    )
+    stack_durations = timeit.repeat(
+        lambda: step_as_array(stack_env, action),
+        number=number,
+        repeat=repeat,
+    )
+    history_durations = timeit.repeat(
+        lambda: step_as_array(history_env, action),
+        number=number,
+        repeat=repeat,
+    )
+
+    print(f"Best of {repeat} runs of {number} steps:")
+    base_us = report("unwrapped environment", base_durations, number)
+    stack_us = report("FrameStack + AddAction", stack_durations, number)
+    history_us = report("ObservationActionHistory", history_durations, number)
+    print(
+        f"Wrapper overhead: {stack_us - base_us:.2f} µs "
+        f"-> {history_us - base_us:.2f} µs per step"
+    )
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Compare spine action conversion times per step in UpkieServos."""
+
+import timeit
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from upkie.envs import UpkieServos
+from upkie.utils.clamp import clamp_and_warn
+
+
+def get_spine_action_per_key(
+    env: UpkieServos,
+    env_action: dict,
+    neutral_action: dict,
+    min_action: dict,
+    max_action: dict,
+) -> dict:
+    """!
+    Reference path clamping each joint and key separately.
+
+    @param env Servos environment.
+    @param env_action Environment action dictionary.
+    @param neutral_action Neutral action dictionary.
+    @param min_action Dictionary of lower bounds.
+    @param max_action Dictionary of upper bounds.
+    @returns Spine action dictionary.
+    """
+    spine_action = {"servo": {}}
+    for joint in env.JOINT_NAMES:
+        servo_action = {}
+        for key in env.ACTION_KEYS:
+            action = (
+                env_action[joint][key]
+                if key in env_action[joint]
+                else neutral_action[joint][key]
+            )
+            servo_action[key] = clamp_and_warn(
+                action,
+                min_action[joint][key],
+                max_action[joint][key],
+                label=f"{joint}: {key}",
+            )
+        spine_action["servo"][joint] = servo_action
+    return spine_action
+
+
+def report(label: str, durations: list, number: int) -> float:
+    per_step_us = 1e6 * min(durations) / number
+    print(f"{label:>24}: {per_step_us:6.2f} µs per step")
+    return per_step_us
+
+
+if __name__ == "__main__":
+    shared_memory = SharedMemory(name=None, size=42, create=True)
+    env = UpkieServos(shm_name=shared_memory._name)
+    shared_memory.close()
+
+    action_dict = {
+        joint: {"position": 0.0, "velocity": 0.0, "feedforward_torque": 0.0}
+        for joint in env.JOINT_NAMES
+    }
+    action_array = env.action_to_array(action_dict)
+    limits = (
+        env.get_neutral_action(),
+        {
+            joint: {
+                key: env.action_space[joint][key].low[0]
+                for key in env.ACTION_KEYS
+            }
+            for joint in env.JOINT_NAMES
+        },
+        {
+            joint: {
+                key: env.action_space[joint][key].high[0]
+                for key in env.ACTION_KEYS
+            }
+            for joint in env.JOINT_NAMES
+        },
+    )
+
+    number, repeat = 10_000, 10
+    per_key_durations = timeit.repeat(
+        lambda: get_spine_action_per_key(env, action_dict, *limits),
+        number=number,
+        repeat=repeat,
+    )
+    dict_durations = timeit.repeat(
+        lambda: env.get_spine_action(action_dict),
+        number=number,
+        repeat=repeat,
+    )
+    array_durations = timeit.repeat(
+        lambda: env.get_spine_action(action_array),
+        number=number,
+        repeat=repeat,
+    )
+    per_key_action = get_spine_action_per_key(env, action_dict, *limits)
+    per_key_action = per_key_action["servo"]
+    array_action = env.get_spine_action(action_dict)["servo"]
+    assert np.allclose(
+        env.action_to_array(per_key_action),
+        env.action_to_array(array_action),
+        equal_nan=True,
+    )
+
+    print(f"Best of {repeat} runs of {number} steps:")
+    per_key_us = report("per-key clamping", per_key_durations, number)
+    dict_us = report("array path (dict action)", dict_durations, number)
+    array_us = report("array path (array action)", array_durations, number)
+    print(f"Speedup: x{per_key_us / dict_us:.2f} with dict actions")
+    print(f"Speedup: x{per_key_us / array_us:.2f} with array actions")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Compare per-env wrappers with batched vector wrappers."""
+
+import timeit
+
+import numpy as np
+
+from upkie.envs import wrappers
+from upkie.envs.wrappers import vector
+from upkie.envs.wrappers.tests.envs import ActionObserverEnv
+from upkie.envs.wrappers.vector.tests.envs import ActionObserverVectorEnv
+
+
+def wrap(module, env):
+    """!
+    Wrap an environment with noise, filtering, history and differentiation
+    wrappers from a given module.
+
+    @param module Either ``upkie.envs.wrappers`` or its vector counterpart.
+    @param env Environment to wrap.
+    @returns Wrapped environment.
+    """
+    env = module.NoisifyObservation(env, noise=np.array([0.01]))
+    env = module.NoisifyAction(env, noise=np.array([0.01]))
+    env = module.LowPassFilterAction(env, time_constant=0.01)
+    env = module.AddActionToObservation(env)
+    return module.DifferentiateAction(
+        env, min_derivative=-1.0, max_derivative=+1.0
+    )
+
+
+def report(label: str, durations: list, number: int) -> float:
+    per_step_us = 1e6 * min(durations) / number
+    print(f"{label:>24}: {per_step_us:7.2f} µs per step")
+    return per_step_us
+
+
+if __name__ == "__main__":
+    number, repeat = 2_000, 10
+    for num_envs in (1, 8, 64):
+        single_envs = [
+            wrap(wrappers, ActionObserverEnv()) for _ in range(num_envs)
+        ]
+        vector_env = wrap(vector, ActionObserverVectorEnv(num_envs))
+        vector_env.reset(seed=0)
+        actions = np.full((num_envs, 1), 0.5)
+
+        def step_single_envs():
+            for env, action in zip(single_envs, actions):
+                env.step(action)
+
+        single_durations = timeit.repeat(
+            step_single_envs, number=number, repeat=repeat
+        )
+        vector_durations = timeit.repeat(
+            lambda: vector_env.step(actions), number=number, repeat=repeat
+        )
+
+        print(f"Best of {repeat} runs of {number} steps, {num_envs=}:")
+        single_us = report("per-env wrappers", single_durations, number)
+        vector_us = report("vector wrappers", vector_durations, number)
+        print(f"Speedup: x{single_us / vector_us:.2f}")
@@ -14,6 +14,7 @@
 
 #include <algorithm>
 #include <cstdlib>
+#include <functional>
 #include <future>
 #include <iostream>
 #include <map>
@@ -22,7 +23,9 @@
 #include <string>
 #include <vector>
 
+#include "upkie/actuation/ActionChunkPlayer.h"
 #include "upkie/config/layout.h"
+#include "upkie/observers/ActionChunk.h"
 #include "upkie/observers/FloorContact.h"
 #include "upkie/observers/WheelOdometry.h"
 #include "upkie/utils/datetime_now_string.h"
@@ -31,9 +34,12 @@
 namespace spines::bullet {
 
 using palimpsest::Dictionary;
+using upkie::actuation::ActionChunkPlayer;
+using upkie::observers::ActionChunk;
 using upkie::observers::FloorContact;
 using upkie::observers::WheelOdometry;
 using vulp::actuation::BulletInterface;
+namespace moteus = vulp::actuation::moteus;
 using vulp::observation::ObserverPipeline;
 using vulp::observation::sources::CpuTemperature;
 
@@ -150,6 +156,109 @@ class CommandLineArguments {
   bool version = false;
 };
 
+/*! Bullet interface that can re-teleport the robot while the spine runs, and
+ * play chunks of servo actions one per spine cycle.
+ */
+class UpkieBulletInterface : public BulletInterface {
+ public:
+  using BulletInterface::BulletInterface;
+
+  /*! Reset interface on spine start.
+   *
+   * \param[in] config Configuration dictionary.
+   */
+  void reset(const Dictionary& config) override {
+    BulletInterface::reset(config);
+    action_chunk_player_.reset();
+    last_soft_reset_id_ = 0;
+  }
+
+  /*! Process action, including soft resets and action chunks.
+   *
+   * \param[in] action Action dictionary.
+   *
+   * A soft reset is requested by the agent by writing a "soft_reset"
+   * dictionary to the "bullet" action, with the same keys as the "reset"
+   * configuration of the simulator plus an "id" integer. The floating base
+   * is re-teleported once for each new id, while the spine keeps running.
+   *
+   * An action chunk is requested by writing an "action_chunk" dictionary to
+   * the "bullet" action, as described in @ref ActionChunkPlayer. Its targets
+   * are then played by \ref cycle, one per spine cycle, including cycles
+   * where the agent sends no new action.
+   */
+  void process_action(const Dictionary& action) override {
+    BulletInterface::process_action(action);
+    process_soft_reset(action);
+    if (action.has("bullet") && action("bullet").has("action_chunk")) {
+      action_chunk_player_.read(action("bullet")("action_chunk"));
+    }
+  }
+
+  /*! Spin a new communication cycle.
+   *
+   * \param[in] data Buffer to read commands from and write replies to.
+   * \param[in] callback Function to call when the cycle is over.
+   *
+   * If an action chunk is playing, its next target replaces the servo
+   * commands of this cycle, unless servos have been stopped by the spine.
+   */
+  void cycle(const moteus::Data& data,
+             std::function<void(const moteus::Output&)> callback) override {
+    if (commands().front().mode == moteus::Mode::kStopped) {
+      action_chunk_player_.stop();
+    } else if (const Dictionary* target = action_chunk_player_.next()) {
+      write_position_commands(*target);
+    }
+    BulletInterface::cycle(data, callback);
+  }
+
+  /*! Write actuation-interface observations to dictionary.
+   *
+   * \param[out] observation Dictionary to write observations to.
+   *
+   * In addition to Bullet observations, the interface reports the progress
+   * of the current action chunk in the "action_chunk" observation.
+   */
+  void observe(Dictionary& observation) const override {
+    BulletInterface::observe(observation);
+    action_chunk_player_.write(observation);
+  }
+
+ private:
+  /*! Re-teleport the floating base if a new soft reset is requested.
+   *
+   * \param[in] action Action dictionary.
+   */
+  void process_soft_reset(const Dictionary& action) {
+    if (!action.has("bullet") || !action("bullet").has("soft_reset")) {
+      return;
+    }
+    const Dictionary& soft_reset = action("bullet")("soft_reset");
+    const int soft_reset_id = soft_reset.get<int>("id");
+    if (soft_reset_id == last_soft_reset_id_) {
+      return;
+    }
+    reset_base_state(
+        soft_reset.get<Eigen::Vector3d>("position_base_in_world",
+                                        Eigen::Vector3d::Zero()),
+        soft_reset.get<Eigen::Quaterniond>("orientation_base_in_world",
+                                           Eigen::Quaterniond::Identity()),
+        soft_reset.get<Eigen::Vector3d>(
+            "linear_velocity_base_to_world_in_world", Eigen::Vector3d::Zero()),
+        soft_reset.get<Eigen::Vector3d>("angular_velocity_base_in_base",
+                                        Eigen::Vector3d::Zero()));
+    last_soft_reset_id_ = soft_reset_id;
+  }
+
+ private:
+  //! Player for action chunks, kept across spine cycles.
+  ActionChunkPlayer action_chunk_player_;
+
+  //! Identifier of the last soft reset applied.
+  int last_soft_reset_id_ = 0;
+};
+
 int clear_shared_memory(const std::string& name) {
   const char* shm_name = name.c_str();
   int file_descriptor = ::shm_open(shm_name, O_RDWR, 0666);
@@ -211,6 +320,12 @@ int main(const char* argv0, const CommandLineArguments& args) {
   auto odometry = std::make_shared<WheelOdometry>(odometry_params);
   observation.append_observer(odometry);
 
+  // Observation: Action chunks, appended last to record other observations
+  ActionChunk::Parameters action_chunk_params;
+  action_chunk_params.keys = {"imu", "servo", "wheel_odometry"};
+  auto action_chunk = std::make_shared<ActionChunk>(action_chunk_params);
+  observation.append_observer(action_chunk);
+
   // Note that we don't lock memory in this spine. Otherwise Bullet will yield
   // a "b3AlignedObjectArray reserve out-of-memory" error below.
 
@@ -226,7 +341,7 @@ int main(const char* argv0, const CommandLineArguments& args) {
   bullet_params.position_base_in_world = Eigen::Vector3d(0., 0., base_altitude);
   bullet_params.robot_urdf_path = "external/upkie_description/urdf/upkie.urdf";
   bullet_params.env_urdf_paths = args.extra_urdf_paths;
-  BulletInterface interface(servo_layout, bullet_params);
+  UpkieBulletInterface interface(servo_layout, bullet_params);
 
   // Spine
   Spine::Parameters spine_params;
@@ -0,0 +1,49 @@
+// SPDX-License-Identifier: Apache-2.0
+// Copyright 2024 Inria
+
+#include "upkie/actuation/ActionChunkPlayer.h"
+
+namespace upkie::actuation {
+
+ActionChunkPlayer::ActionChunkPlayer() : id_(0), size_(0), nb_played_(0) {}
+
+void ActionChunkPlayer::reset() {
+  id_ = 0;
+  size_ = 0;
+  nb_played_ = 0;
+  targets_.clear();
+}
+
+void ActionChunkPlayer::read(const Dictionary& action_chunk) {
+  const int id = action_chunk.get<int>("id");
+  if (id == id_) {
+    return;
+  }
+  id_ = id;
+  size_ = action_chunk.get<int>("size");
+  nb_played_ = 0;
+  targets_.clear();
+  const Dictionary& targets = action_chunk("targets");
+  for (int i = 0; i < size_; ++i) {
+    const std::string key = std::to_string(i);
+    const size_t size = targets(key).serialize(buffer_);
+    targets_(key)("servo").update(buffer_.data(), size);
+  }
+}
+
+const Dictionary* ActionChunkPlayer::next() {
+  if (nb_played_ >= size_) {
+    return nullptr;
+  }
+  const Dictionary* target = &targets_(std::to_string(nb_played_));
+  ++nb_played_;
+  return target;
+}
+
+void ActionChunkPlayer::write(Dictionary& observation) const {
+  auto& output = observation("action_chunk");
+  output("id") = id_;
+  output("nb_played") = nb_played_;
+}
+
+}  // namespace upkie::actuation
@@ -0,0 +1,89 @@
+// SPDX-License-Identifier: Apache-2.0
+// Copyright 2024 Inria
+
+#pragma once
+
+#include <palimpsest/Dictionary.h>
+
+#include <string>
+#include <vector>
+
+namespace upkie::actuation {
+
+using palimpsest::Dictionary;
+
+/*! Play the servo targets of an action chunk, one per spine cycle.
+ *
+ * An action chunk is a sequence of servo targets sent by the agent in a
+ * single action, as an "action_chunk" dictionary with an "id" integer, a
+ * "size" integer, and servo targets in "targets/<i>" for each index \f$i <
+ * \mathit{size}\f$. The player copies these targets when it reads a new id,
+ * which happens once per agent action, then hands them out one per spine
+ * cycle. This way, the chunk plays out on its own while the agent waits.
+ */
+class ActionChunkPlayer {
+ public:
+  //! Initialize player without action chunk.
+  ActionChunkPlayer();
+
+  //! Forget the current action chunk, e.g. when the spine restarts.
+  void reset();
+
+  /*! Read an action chunk from the agent action.
+   *
+   * \param[in] action_chunk Action chunk dictionary.
+   *
+   * Reading the same chunk id again does not restart its playback.
+   */
+  void read(const Dictionary& action_chunk);
+
+  /*! Get the next target of the current action chunk.
+   *
+   * \return Pointer to an action dictionary with the target in its "servo"
+   *     key, or ``nullptr`` if there is no target left to play. It is valid
+   *     until the next call to \ref read or \ref reset.
+   */
+  const Dictionary* next();
+
+  /*! Stop playing the current action chunk, e.g. when servos are stopped.
+   *
+   * Remaining targets are dropped, so that the number of targets played
+   * stays short of the chunk size and the agent can tell the chunk did not
+   * complete.
+   */
+  void stop() noexcept { size_ = nb_played_; }
+
+  /*! Report the progress of the current action chunk.
+   *
+   * \param[out] observation Dictionary to write observations to.
+   *
+   * The chunk id and number of targets played so far are written to the
+   * "action_chunk" observation, where the @ref
+   * upkie::observers::ActionChunk observer expects them.
+   */
+  void write(Dictionary& observation) const;
+
+  //! Identifier of the current action chunk.
+  int id() const noexcept { return id_; }
+
+  //! Number of targets of the current action chunk played so far.
+  int nb_played() const noexcept { return nb_played_; }
+
+ private:
+  //! Identifier of the current action chunk.
+  int id_;
+
+  //! Number of targets in the current action chunk.
+  int size_;
+
+  //! Number of targets of the current action chunk played so far.
+  int nb_played_;
+
+  //! Targets of the current action chunk, as "<i>/servo" actions.
+  Dictionary targets_;
+
+  //! Buffer used to copy targets.
+  std::vector<char> buffer_;
+};
+
+}  // namespace upkie::actuation
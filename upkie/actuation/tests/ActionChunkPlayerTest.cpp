@@ -0,0 +1,154 @@
+// SPDX-License-Identifier: Apache-2.0
+// Copyright 2024 Inria
+
+#include <palimpsest/Dictionary.h>
+
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "gtest/gtest.h"
+#include "upkie/actuation/ActionChunkPlayer.h"
+#include "upkie/observers/ActionChunk.h"
+
+namespace upkie::actuation::tests {
+
+using palimpsest::Dictionary;
+using upkie::observers::ActionChunk;
+
+class ActionChunkPlayerTest : public ::testing::Test {
+ protected:
+  void SetUp() override {
+    ActionChunk::Parameters params;
+    params.keys = {"servo"};
+    observer_ = std::make_unique<ActionChunk>(params);
+    observer_->reset(Dictionary{});
+  }
+
+  //! Build an action chunk with one wheel velocity per target.
+  Dictionary make_action(int id, const std::vector<double>& velocities) {
+    Dictionary action;
+    auto& action_chunk = action("bullet")("action_chunk");
+    action_chunk("id") = id;
+    action_chunk("size") = static_cast<int>(velocities.size());
+    for (size_t i = 0; i < velocities.size(); ++i) {
+      action_chunk("targets")(std::to_string(i))("left_wheel")("velocity") =
+          velocities[i];
+    }
+    return action;
+  }
+
+  /*! Run one spine cycle, in the same order as the spine does.
+   *
+   * \param[in] action Agent action if the spine is in its act state, or
+   *     ``nullptr`` otherwise.
+   */
+  void cycle(const Dictionary* action = nullptr) {
+    // The actuation interface observes the velocity commanded last cycle
+    if (commanded_velocity_ >= 0.0) {
+      observation_("servo")("left_wheel")("velocity") = commanded_velocity_;
+    }
+    player_.write(observation_);
+    observer_->read(observation_);
+    observer_->write(observation_);
+    if (action != nullptr) {
+      player_.read((*action)("bullet")("action_chunk"));
+    }
+    const Dictionary* target = player_.next();
+    if (target != nullptr) {
+      commanded_velocity_ =
+          (*target)("servo")("left_wheel").get<double>("velocity");
+    }
+  }
+
+ protected:
+  //! Observation dictionary shared by the interface and observer
+  Dictionary observation_;
+
+  //! Action chunk observer
+  std::unique_ptr<ActionChunk> observer_;
+
+  //! Player under test
+  ActionChunkPlayer player_;
+
+  //! Last velocity commanded to the left wheel, or -1 if none
+  double commanded_velocity_ = -1.0;
+};
+
+TEST_F(ActionChunkPlayerTest, NoChunk) {
+  ASSERT_EQ(player_.next(), nullptr);
+  cycle();
+  ASSERT_EQ(observation_("action_chunk").get<int>("id"), 0);
+  ASSERT_EQ(observation_("action_chunk").get<int>("nb_played"), 0);
+}
+
+TEST_F(ActionChunkPlayerTest, PlayChunkOverCycles) {
+  const Dictionary action = make_action(1, {0.1, 0.2, 0.3});
+  cycle(&action);
+  ASSERT_DOUBLE_EQ(commanded_velocity_, 0.1);
+  ASSERT_EQ(player_.nb_played(), 1);
+
+  // Remaining targets play without further agent actions
+  cycle();
+  ASSERT_DOUBLE_EQ(commanded_velocity_, 0.2);
+  cycle();
+  ASSERT_DOUBLE_EQ(commanded_velocity_, 0.3);
+  ASSERT_EQ(player_.next(), nullptr);
+
+  // The last snapshot is recorded one cycle after its target was sent
+  cycle();
+  const auto& output = observation_("action_chunk");
+  ASSERT_EQ(output.get<int>("id"), 1);
+  ASSERT_EQ(output.get<int>("nb_played"), 3);
+  ASSERT_EQ(output.get<int>("nb_observed"), 3);
+  for (int i = 0; i < 3; ++i) {
+    const auto& snapshot = output("observations")(std::to_string(i));
+    ASSERT_DOUBLE_EQ(
+        snapshot("servo")("left_wheel").get<double>("velocity"), 0.1 * (i + 1));
+  }
+
+  // Nothing more happens once the chunk is over
+  cycle();
+  ASSERT_DOUBLE_EQ(commanded_velocity_, 0.3);
+  ASSERT_EQ(output.get<int>("nb_observed"), 3);
+}
+
+TEST_F(ActionChunkPlayerTest, SameIdDoesNotRestart) {
+  const Dictionary action = make_action(1, {0.1, 0.2});
+  cycle(&action);
+  cycle(&action);
+  ASSERT_DOUBLE_EQ(commanded_velocity_, 0.2);
+  ASSERT_EQ(player_.next(), nullptr);
+}
+
+TEST_F(ActionChunkPlayerTest, NewChunkReplacesCurrent) {
+  const Dictionary first = make_action(1, {0.1, 0.2, 0.3});
+  const Dictionary second = make_action(2, {0.5});
+  cycle(&first);
+  cycle(&second);
+  ASSERT_DOUBLE_EQ(commanded_velocity_, 0.5);
+  ASSERT_EQ(player_.id(), 2);
+  ASSERT_EQ(player_.next(), nullptr);
+}
+
+TEST_F(ActionChunkPlayerTest, Stop) {
+  const Dictionary action = make_action(1, {0.1, 0.2, 0.3});
+  cycle(&action);
+  player_.stop();
+  ASSERT_EQ(player_.next(), nullptr);
+  ASSERT_EQ(player_.nb_played(), 1);
+}
+
+TEST_F(ActionChunkPlayerTest, Reset) {
+  const Dictionary action = make_action(1, {0.1, 0.2});
+  cycle(&action);
+  player_.reset();
+  ASSERT_EQ(player_.id(), 0);
+  ASSERT_EQ(player_.next(), nullptr);
+
+  // The same chunk id plays again after a reset
+  cycle(&action);
+  ASSERT_EQ(player_.nb_played(), 1);
+}
+
+}  // namespace upkie::actuation::tests
@@ -8,6 +8,15 @@ import os
 
 import yaml
 
+from .spine_config import SpineConfig, structural_hash
+
+__all__ = [
+    "PATH",
+    "SPINE_CONFIG",
+    "SpineConfig",
+    "structural_hash",
+]
+
 PATH = os.path.abspath(os.path.dirname(__file__))
 
 SPINE_CONFIG = None
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+import copy
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from upkie.utils.nested_update import nested_update
+
+
+def _sub_paths(
+    paths: Sequence[Tuple[str, ...]], key: str
+) -> List[Tuple[str, ...]]:
+    return [path[1:] for path in paths if len(path) > 1 and path[0] == key]
+
+
+def structural_hash(value, exclude: Sequence[Tuple[str, ...]] = ()) -> int:
+    """!
+    Hash a nested configuration value from its contents.
+
+    Dictionaries are hashed independently from the order of their keys,
+    lists and arrays from their values, and NaNs are equal to each other.
+
+    @param value Configuration value, for instance a dictionary.
+    @param exclude Paths of keys to skip in nested dictionaries, for instance
+        ``[("bullet", "reset")]``.
+    @returns Hash of the value.
+    """
+    if isinstance(value, dict):
+        items = (
+            (key, structural_hash(sub_value, _sub_paths(exclude, key)))
+            for key, sub_value in value.items()
+            if (key,) not in exclude
+        )
+        return hash(tuple(sorted(items)))
+    if isinstance(value, (list, tuple)):
+        return hash(tuple(structural_hash(item) for item in value))
+    if isinstance(value, np.ndarray):
+        return hash((value.shape, value.tobytes()))
+    if isinstance(value, float) and value != value:
+        return hash("nan")
+    return hash(value)
+
+
+class SpineConfig(dict):
+
+    """!
+    Spine configuration dictionary owned by a single environment.
+
+    Default values from ``spine.yaml`` are deep-copied upon construction, so
+    that modifying the configuration of an environment, for instance its
+    Bullet reset state, does not affect other environments in the same
+    process. Configurations can be compared by their structural hashes to
+    detect which top-level sections changed.
+    """
+
+    def __init__(
+        self,
+        defaults: dict,
+        overrides: Optional[dict] = None,
+    ):
+        """!
+        Initialize configuration.
+
+        @param defaults Default configuration, not modified.
+        @param overrides Configuration values overriding the defaults, not
+            modified either.
+        """
+        super().__init__(copy.deepcopy(defaults))
+        if overrides is not None:
+            nested_update(self, copy.deepcopy(overrides))
+
+    def get_section_hashes(
+        self, exclude: Sequence[Tuple[str, ...]] = ()
+    ) -> Dict[str, int]:
+        """!
+        Get structural hashes of all top-level sections.
+
+        @param exclude Paths of keys to skip, see @ref structural_hash.
+        @returns Dictionary mapping section names to their hashes.
+        """
+        return {
+            section: structural_hash(value, _sub_paths(exclude, section))
+            for section, value in self.items()
+            if (section,) not in exclude
+        }
+
+    def get_changed_sections(
+        self,
+        reference_hashes: Dict[str, int],
+        exclude: Sequence[Tuple[str, ...]] = (),
+    ) -> Set[str]:
+        """!
+        Get top-level sections that changed since reference hashes were taken.
+
+        @param reference_hashes Section hashes from
+            :func:`get_section_hashes`.
+        @param exclude Paths of keys to skip, see @ref structural_hash. They
+            should be the same as when reference hashes were taken.
+        @returns Set of names of sections that were added, removed or
+            modified.
+        """
+        hashes = self.get_section_hashes(exclude)
+        return {
+            section
+            for section in hashes.keys() | reference_hashes.keys()
+            if hashes.get(section) != reference_hashes.get(section)
+        }
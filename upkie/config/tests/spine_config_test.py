@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Test spine configuration."""
+
+import math
+import unittest
+
+import numpy as np
+
+from upkie.config import SPINE_CONFIG, SpineConfig, structural_hash
+
+
+class TestSpineConfig(unittest.TestCase):
+    def test_deep_copy(self):
+        config_1 = SpineConfig(SPINE_CONFIG)
+        config_2 = SpineConfig(SPINE_CONFIG)
+        config_1["bullet"]["reset"]["position_base_in_world"] = [1.0, 2.0]
+        self.assertNotEqual(
+            config_2["bullet"]["reset"]["position_base_in_world"], [1.0, 2.0]
+        )
+        self.assertNotEqual(
+            SPINE_CONFIG["bullet"]["reset"]["position_base_in_world"],
+            [1.0, 2.0],
+        )
+
+    def test_overrides(self):
+        overrides = {"bullet": {"gui": False}}
+        config = SpineConfig(SPINE_CONFIG, overrides)
+        self.assertFalse(config["bullet"]["gui"])
+        self.assertIn("reset", config["bullet"])
+        config["bullet"]["gui"] = True
+        self.assertFalse(overrides["bullet"]["gui"])
+
+    def test_structural_hash(self):
+        self.assertEqual(
+            structural_hash({"a": 1, "b": [1.0, 2.0]}),
+            structural_hash({"b": [1.0, 2.0], "a": 1}),
+        )
+        self.assertEqual(
+            structural_hash({"x": np.array([1.0, math.nan])}),
+            structural_hash({"x": np.array([1.0, math.nan])}),
+        )
+        self.assertEqual(
+            structural_hash({"x": float("nan")}),
+            structural_hash({"x": float("nan")}),
+        )
+        self.assertNotEqual(
+            structural_hash({"a": 1}), structural_hash({"a": 2})
+        )
+
+    def test_changed_sections(self):
+        config = SpineConfig(SPINE_CONFIG)
+        hashes = config.get_section_hashes()
+        self.assertEqual(config.get_changed_sections(hashes), set())
+        config["wheel_odometry"]["signed_radius"]["left_wheel"] = 0.06
+        config["new_section"] = {"foo": 1}
+        self.assertEqual(
+            config.get_changed_sections(hashes),
+            {"new_section", "wheel_odometry"},
+        )
+
+    def test_excluded_paths(self):
+        exclude = [("bullet", "reset")]
+        config = SpineConfig(SPINE_CONFIG)
+        hashes = config.get_section_hashes(exclude)
+        config["bullet"]["reset"]["position_base_in_world"] = [0.0, 0.0, 1.0]
+        self.assertEqual(config.get_changed_sections(hashes, exclude), set())
+        config["bullet"]["gui"] = not config["bullet"]["gui"]
+        self.assertEqual(
+            config.get_changed_sections(hashes, exclude), {"bullet"}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
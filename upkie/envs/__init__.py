@@ -8,10 +8,18 @@ import logging
 
 import gymnasium as gym
 
+from .observation_schema import ObservationSchema
+from .servo_kinematics import ServoKinematics
+from .step_history import StepHistory
 from .upkie_base_env import UpkieBaseEnv
+from .upkie_vector_env import UpkieVectorEnv
 
 __all__ = [
+    "ObservationSchema",
+    "ServoKinematics",
+    "StepHistory",
     "UpkieBaseEnv",
+    "UpkieVectorEnv",
     "register",
 ]
 
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+from gymnasium import spaces
+from numpy.typing import NDArray
+
+from upkie.utils.exceptions import UpkieException
+
+
+class ObservationSchema:
+
+    """!
+    Declared subset of the spine observation used by an environment.
+
+    A schema lists the fields an environment reads from the spine observation
+    dictionary, along with their sizes. It is compiled once into fixed offsets
+    in a flat vector, so that extracting fields at every step boils down to
+    filling a preallocated buffer.
+
+    For instance:
+
+        >>> schema = ObservationSchema(
+        ...     [
+        ...         (("imu", "orientation"), 4),
+        ...         (("wheel_odometry", "position"), 1),
+        ...     ]
+        ... )
+        >>> buffer = schema.allocate()
+        >>> schema.extract(spine_observation, buffer)
+        >>> position = buffer[schema.index("wheel_odometry", "position")]
+    """
+
+    fields: Tuple[Tuple[Tuple[str, ...], int], ...]
+    size: int
+
+    def __init__(self, fields: Sequence[Tuple[Tuple[str, ...], int]]):
+        """!
+        Compile schema.
+
+        @param fields Sequence of ``(keys, size)`` pairs, where ``keys`` is the
+            path to a field in the spine observation dictionary and ``size`` is
+            the number of floats in that field (one for scalar fields).
+        @raise UpkieException If a field is declared twice or has an invalid
+            size.
+        """
+        indices: Dict[Tuple[str, ...], Union[int, slice]] = {}
+        plan: List[Tuple[Tuple[str, ...], Union[int, slice]]] = []
+        offset = 0
+        for keys, size in fields:
+            keys = tuple(keys)
+            if keys in indices:
+                raise UpkieException(f"Field {keys} declared twice in schema")
+            if size < 1:
+                raise UpkieException(f"Field {keys} has invalid {size=}")
+            index = offset if size == 1 else slice(offset, offset + size)
+            indices[keys] = index
+            plan.append((keys, index))
+            offset += size
+        self.__indices = indices
+        self.__plan = tuple(plan)
+        self.fields = tuple((tuple(keys), size) for keys, size in fields)
+        self.size = offset
+
+    def allocate(self) -> NDArray[float]:
+        """!
+        Allocate a buffer for extracted fields.
+
+        @returns Zero vector of dimension ``size``.
+        """
+        return np.zeros(self.size, dtype=float)
+
+    def index(self, *keys: str) -> Union[int, slice]:
+        """!
+        Get the index of a field in the extracted vector.
+
+        @param keys Path to the field in the spine observation dictionary.
+        @returns Integer index for scalar fields, slice for vector fields.
+        """
+        return self.__indices[keys]
+
+    def extract(
+        self, spine_observation: dict, out: NDArray[float]
+    ) -> NDArray[float]:
+        """!
+        Extract declared fields from a spine observation, in place.
+
+        @param spine_observation Spine observation dictionary.
+        @param out Output buffer, for instance from :func:`allocate`.
+        @returns Output buffer.
+        """
+        values = []
+        for keys, index in self.__plan:
+            value = spine_observation
+            for key in keys:
+                value = value[key]
+            if type(index) is int:
+                values.append(value)
+            else:  # vector field
+                values.extend(value)
+        out[:] = values  # single conversion, fields are laid out in order
+        return out
+
+
+def list_observation_fields(
+    space: spaces.Dict, prefix: Tuple[str, ...] = ()
+) -> List[Tuple[Tuple[str, ...], int]]:
+    """!
+    List the fields of a dictionary observation space.
+
+    Fields are listed in the same order as ``gymnasium.spaces.flatten``, so
+    that a schema built from them extracts flattened observations.
+
+    @param space Dictionary observation space, whose leaves are boxes.
+    @param prefix Keys of the space in its parent space, if any.
+    @returns List of ``(keys, size)`` pairs for each leaf of the space.
+    """
+    fields = []
+    for key, subspace in space.spaces.items():
+        keys = prefix + (key,)
+        if isinstance(subspace, spaces.Dict):
+            fields.extend(list_observation_fields(subspace, keys))
+        else:  # leaf box
+            fields.append((keys, spaces.flatdim(subspace)))
+    return fields
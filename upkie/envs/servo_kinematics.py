@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from upkie.utils.exceptions import UpkieException
+from upkie.utils.pinocchio import load_robot_model
+
+
+class ServoKinematics:
+
+    """!
+    Kinematic quantities derived from the last servo observation.
+
+    Nothing is computed when observations are updated. Forward kinematics
+    only run upon the first access to a quantity, and their results are
+    cached until the joint configuration changes. For instance:
+
+        >>> kinematics = env.kinematics
+        >>> wheel_distance = kinematics.wheel_distance  # runs kinematics
+        >>> base_height = kinematics.base_height  # cached
+
+    All positions are expressed in the base frame of the robot. Pinocchio is
+    only imported upon the first computation.
+    """
+
+    CONTACT_FRAMES = ("left_contact", "right_contact")
+
+    def __init__(self):
+        """!
+        Initialize kinematics without allocating any Pinocchio data.
+        """
+        self.__configuration: Optional[NDArray[float]] = None
+        self.__contact_positions = np.zeros((2, 3))
+        self.__data = None
+        self.__frame_ids = None
+        self.__key: Optional[bytes] = None
+        self.__joint_indices = None
+        self.__servo_observation: Optional[dict] = None
+
+    def update(self, servo_observation: dict) -> None:
+        """!
+        Set the last servo observation. Nothing is computed at this point.
+
+        @param servo_observation Servo section of the spine observation.
+        """
+        self.__servo_observation = servo_observation
+
+    def __initialize(self) -> None:
+        import pinocchio as pin
+
+        model = load_robot_model().model
+        self.__configuration = pin.neutral(model)
+        self.__data = model.createData()
+        self.__frame_ids = [
+            model.getFrameId(frame) for frame in self.CONTACT_FRAMES
+        ]
+        self.__joint_indices = [
+            (name, model.joints[model.getJointId(name)].idx_q)
+            for name in list(model.names)[1:]
+        ]
+
+    def __update_kinematics(self) -> None:
+        import pinocchio as pin
+
+        if self.__servo_observation is None:
+            raise UpkieException(
+                "Kinematics are only available after the first observation"
+            )
+        if self.__data is None:
+            self.__initialize()
+        q = self.__configuration
+        for name, idx_q in self.__joint_indices:
+            q[idx_q] = self.__servo_observation[name]["position"]
+        key = q.tobytes()
+        if key == self.__key:
+            return
+        model = load_robot_model().model
+        pin.framesForwardKinematics(model, self.__data, q)
+        for i, frame_id in enumerate(self.__frame_ids):
+            self.__contact_positions[i] = self.__data.oMf[frame_id].translation
+        self.__key = key
+
+    @property
+    def configuration(self) -> NDArray[float]:
+        """!
+        Joint configuration of the robot model, in radians.
+        """
+        self.__update_kinematics()
+        return self.__configuration.copy()
+
+    @property
+    def left_contact_position(self) -> NDArray[float]:
+        """!
+        Position of the left wheel contact point, in meters.
+        """
+        self.__update_kinematics()
+        return self.__contact_positions[0].copy()
+
+    @property
+    def right_contact_position(self) -> NDArray[float]:
+        """!
+        Position of the right wheel contact point, in meters.
+        """
+        self.__update_kinematics()
+        return self.__contact_positions[1].copy()
+
+    @property
+    def position_right_in_left(self) -> NDArray[float]:
+        """!
+        Translation from the left contact point to the right contact point,
+        in meters.
+        """
+        self.__update_kinematics()
+        return self.__contact_positions[1] - self.__contact_positions[0]
+
+    @property
+    def wheel_distance(self) -> float:
+        """!
+        Distance between the two wheel contact points, in meters.
+        """
+        self.__update_kinematics()
+        return float(
+            np.linalg.norm(
+                self.__contact_positions[1] - self.__contact_positions[0]
+            )
+        )
+
+    @property
+    def base_height(self) -> float:
+        """!
+        Height of the base above the average wheel contact point, along the
+        vertical axis of the base frame, in meters.
+        """
+        self.__update_kinematics()
+        return float(-0.5 * np.sum(self.__contact_positions[:, 2]))
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+import numpy as np
+from numpy.typing import NDArray
+
+from upkie.utils.exceptions import UpkieException
+
+
+class StepHistory:
+
+    """!
+    Fixed-size history of the last observations, actions, rewards and
+    timestamps of an environment.
+
+    Entries are written in place into preallocated arrays. Each entry is
+    written twice, at index ``i`` and ``i + capacity``, so that the last
+    entries in chronological order always form a contiguous slice. Properties
+    of this class are therefore views, oldest entry first, that do not copy
+    anything. Views are only valid until the next call to :func:`append` or
+    :func:`clear`.
+
+    For instance:
+
+        >>> history = StepHistory(capacity=3, observation_dim=4, action_dim=1)
+        >>> history.append(observation, action, reward, timestamp)
+        >>> last_observation = history.observations[-1]
+    """
+
+    action_dim: int
+    capacity: int
+    observation_dim: int
+
+    def __init__(self, capacity: int, observation_dim: int, action_dim: int):
+        """!
+        Allocate history.
+
+        @param capacity Maximum number of entries in the history.
+        @param observation_dim Dimension of vectorized observations.
+        @param action_dim Dimension of vectorized actions.
+        @raise UpkieException If the capacity is not positive.
+        """
+        if capacity < 1:
+            raise UpkieException(f"History {capacity=} should be positive")
+        self.__actions = np.zeros((2 * capacity, action_dim))
+        self.__index = 0
+        self.__length = 0
+        self.__observations = np.zeros((2 * capacity, observation_dim))
+        self.__rewards = np.zeros(2 * capacity)
+        self.__timestamps = np.zeros(2 * capacity)
+        self.action_dim = action_dim
+        self.capacity = capacity
+        self.observation_dim = observation_dim
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def append(
+        self,
+        observation: NDArray[float],
+        action: NDArray[float],
+        reward: float,
+        timestamp: float,
+    ) -> None:
+        """!
+        Append a new entry, overwriting the oldest one if the history is full.
+
+        @param observation Vectorized observation.
+        @param action Vectorized action.
+        @param reward Reward.
+        @param timestamp Time of the observation, in seconds.
+        """
+        i, j = self.__index, self.__index + self.capacity
+        self.__observations[i] = observation
+        self.__observations[j] = observation
+        self.__actions[i] = action
+        self.__actions[j] = action
+        self.__rewards[i] = reward
+        self.__rewards[j] = reward
+        self.__timestamps[i] = timestamp
+        self.__timestamps[j] = timestamp
+        self.__index = (i + 1) % self.capacity
+        if self.__length < self.capacity:
+            self.__length += 1
+
+    def clear(self) -> None:
+        """!
+        Remove all entries. Preallocated arrays are kept.
+        """
+        self.__index = 0
+        self.__length = 0
+
+    def __window(self) -> slice:
+        stop = self.__index + self.capacity
+        return slice(stop - self.__length, stop)
+
+    @property
+    def actions(self) -> NDArray[float]:
+        """!
+        View of past actions, of shape ``(len(self), action_dim)``.
+        """
+        return self.__actions[self.__window()]
+
+    @property
+    def observations(self) -> NDArray[float]:
+        """!
+        View of past observations, of shape ``(len(self), observation_dim)``.
+        """
+        return self.__observations[self.__window()]
+
+    @property
+    def rewards(self) -> NDArray[float]:
+        """!
+        View of past rewards, of shape ``(len(self),)``.
+        """
+        return self.__rewards[self.__window()]
+
+    @property
+    def timestamps(self) -> NDArray[float]:
+        """!
+        View of past timestamps in seconds, of shape ``(len(self),)``.
+        """
+        return self.__timestamps[self.__window()]
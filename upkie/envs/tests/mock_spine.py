@@ -43,3 +43,20 @@ class MockSpine:
     def get_observation(self) -> dict:
         self.observation["number"] += 1
         return self.observation
+
+
+class CrashedSpine(MockSpine):
+    def _wait_for_spine(self):
+        raise TimeoutError("Spine did not process last request")
+
+    def get_observation(self) -> dict:
+        self._wait_for_spine()
+
+    def set_action(self, action) -> None:
+        self._wait_for_spine()
+
+    def start(self, config: dict) -> None:
+        self._wait_for_spine()
+
+    def stop(self) -> None:
+        self._wait_for_spine()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Test ObservationSchema."""
+
+import unittest
+
+import numpy as np
+from gymnasium import spaces
+
+from upkie.envs import ObservationSchema
+from upkie.envs.observation_schema import list_observation_fields
+from upkie.envs.tests.mock_spine import MockSpine
+from upkie.utils.exceptions import UpkieException
+
+
+class TestObservationSchema(unittest.TestCase):
+    def setUp(self):
+        self.schema = ObservationSchema(
+            [
+                (("imu", "orientation"), 4),
+                (("wheel_odometry", "position"), 1),
+                (("servo", "left_wheel", "velocity"), 1),
+            ]
+        )
+        self.spine_observation = MockSpine().observation
+        self.spine_observation["imu"]["orientation"] = [0.0, 1.0, 0.0, 0.0]
+        self.spine_observation["wheel_odometry"]["position"] = 0.42
+        self.spine_observation["servo"]["left_wheel"]["velocity"] = -1.5
+
+    def test_size(self):
+        self.assertEqual(self.schema.size, 6)
+        self.assertEqual(self.schema.allocate().shape, (6,))
+
+    def test_extract(self):
+        buffer = self.schema.allocate()
+        output = self.schema.extract(self.spine_observation, buffer)
+        self.assertIs(output, buffer)
+        self.assertTrue(np.allclose(buffer, [0.0, 1.0, 0.0, 0.0, 0.42, -1.5]))
+
+    def test_index(self):
+        buffer = self.schema.extract(
+            self.spine_observation, self.schema.allocate()
+        )
+        orientation = buffer[self.schema.index("imu", "orientation")]
+        position = buffer[self.schema.index("wheel_odometry", "position")]
+        self.assertEqual(orientation.shape, (4,))
+        self.assertAlmostEqual(position, 0.42)
+
+    def test_duplicate_field(self):
+        with self.assertRaises(UpkieException):
+            ObservationSchema(
+                [
+                    (("imu", "orientation"), 4),
+                    (("imu", "orientation"), 4),
+                ]
+            )
+
+    def test_list_observation_fields(self):
+        space = spaces.Dict(
+            {
+                "b": spaces.Box(-1.0, 1.0, shape=(1,)),
+                "a": spaces.Dict({"c": spaces.Box(-1.0, 1.0, shape=(3,))}),
+            }
+        )
+        fields = list_observation_fields(space)
+        self.assertEqual(fields, [(("a", "c"), 3), (("b",), 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Test step history."""
+
+import unittest
+
+import numpy as np
+
+from upkie.envs.step_history import StepHistory
+from upkie.utils.exceptions import UpkieException
+
+
+class TestStepHistory(unittest.TestCase):
+    def setUp(self):
+        self.history = StepHistory(capacity=3, observation_dim=2, action_dim=1)
+
+    def append(self, value: float):
+        self.history.append(
+            np.full(2, value), np.full(1, -value), 10.0 * value, value
+        )
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(UpkieException):
+            StepHistory(capacity=0, observation_dim=2, action_dim=1)
+
+    def test_empty(self):
+        self.assertEqual(len(self.history), 0)
+        self.assertEqual(self.history.observations.shape, (0, 2))
+        self.assertEqual(self.history.actions.shape, (0, 1))
+
+    def test_partial(self):
+        self.append(1.0)
+        self.append(2.0)
+        self.assertEqual(len(self.history), 2)
+        self.assertTrue(np.allclose(self.history.timestamps, [1.0, 2.0]))
+        self.assertTrue(np.allclose(self.history.rewards, [10.0, 20.0]))
+
+    def test_wrap_around(self):
+        for i in range(1, 8):
+            self.append(float(i))
+        self.assertEqual(len(self.history), 3)
+        self.assertTrue(np.allclose(self.history.timestamps, [5.0, 6.0, 7.0]))
+        self.assertTrue(
+            np.allclose(self.history.observations[:, 0], [5.0, 6.0, 7.0])
+        )
+        self.assertTrue(
+            np.allclose(self.history.actions[:, 0], [-5.0, -6.0, -7.0])
+        )
+
+    def test_views(self):
+        for i in range(5):
+            self.append(float(i))
+        observations = self.history.observations
+        self.assertFalse(observations.flags.owndata)
+        self.assertTrue(observations.flags.c_contiguous)
+
+    def test_clear(self):
+        self.append(1.0)
+        self.history.clear()
+        self.assertEqual(len(self.history), 0)
+        self.append(2.0)
+        self.assertTrue(np.allclose(self.history.timestamps, [2.0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
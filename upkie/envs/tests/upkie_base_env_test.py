@@ -8,13 +8,15 @@
 
 import unittest
 from multiprocessing.shared_memory import SharedMemory
+from unittest import mock
 
 import numpy as np
 from gymnasium import spaces
 from numpy.typing import NDArray
 
 from upkie.envs import UpkieBaseEnv
-from upkie.envs.tests.mock_spine import MockSpine
+from upkie.envs.tests.mock_spine import CrashedSpine, MockSpine
+from upkie.utils.exceptions import SpineError, UpkieException
 
 
 class UpkieTestEnv(UpkieBaseEnv):
@@ -65,6 +67,279 @@ class TestUpkieBaseEnv(unittest.TestCase):
         spine_observation = info["spine_observation"]
         self.assertGreaterEqual(spine_observation["number"], 1)
 
+    def test_step_async_wait(self):
+        self.env.reset()
+        action = np.full((1,), 0.2, dtype=np.float32)
+        self.env.step_async(action)
+        self.assertEqual(self.env._spine.action["test"], action)
+        number = self.env._spine.observation["number"]
+        _, reward, terminated, truncated, info = self.env.step_wait()
+        self.assertEqual(info["spine_observation"]["number"], number + 1)
+        self.assertAlmostEqual(reward, 1.0)
+        self.assertFalse(terminated)
+        self.assertFalse(truncated)
+
+    def test_step_wait_without_action(self):
+        self.env.reset()
+        with self.assertRaises(UpkieException):
+            self.env.step_wait()
+        self.env.step_async(np.zeros((1,), dtype=np.float32))
+        self.env.step_wait()
+        with self.assertRaises(UpkieException):
+            self.env.step_wait()
+
+    def test_soft_reset(self):
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        env = UpkieTestEnv(
+            frequency=100.0,
+            shm_name=shared_memory._name,
+            soft_reset=True,
+        )
+        shared_memory.close()
+        env._spine = MockSpine()
+        env.reset()  # first reset starts the spine
+        self.assertFalse(hasattr(env._spine, "action"))
+        number = env._spine.observation["number"]
+        env.reset()
+        soft_reset = env._spine.action["bullet"]["soft_reset"]
+        self.assertEqual(soft_reset["id"], 1)
+        self.assertEqual(  # observation that may predate teleport skipped
+            env._spine.observation["number"], number + 2
+        )
+        self.assertIn("position_base_in_world", soft_reset)
+        env.reset()
+        self.assertEqual(env._spine.action["bullet"]["soft_reset"]["id"], 2)
+
+    def test_reconnect_spine(self):
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        env = UpkieTestEnv(
+            frequency=100.0,
+            shm_name=shared_memory._name,
+            soft_reset=True,
+        )
+        env._spine = MockSpine()
+        env.reset()
+        env.reconnect_spine(spine_retries=1)
+        shared_memory.close()
+        self.assertNotIsInstance(env._spine, MockSpine)
+        env._spine = MockSpine()
+        env.reset()  # spine was reconnected: hard reset
+        self.assertFalse(hasattr(env._spine, "action"))
+
+    def test_spine_crash(self):
+        self.env.reset()
+        action = np.zeros((1,), dtype=np.float32)
+        self.env.step(action)
+        self.env._spine = CrashedSpine()
+        spines = [CrashedSpine(), MockSpine()]  # stale, then restarted
+
+        def reconnect_spine(spine_retries):
+            self.env._spine = spines.pop(0)
+
+        with mock.patch.object(
+            self.env, "reconnect_spine", side_effect=reconnect_spine
+        ), mock.patch("upkie.envs.upkie_base_env.sleep"):
+            observation, reward, terminated, truncated, info = self.env.step(
+                action
+            )
+        self.assertFalse(terminated)
+        self.assertTrue(truncated)
+        self.assertEqual(reward, 0.0)
+        self.assertIn("spine_error", info)
+        self.assertTrue(np.allclose(observation, 0.5))
+        self.assertIsInstance(self.env._spine, MockSpine)
+        self.assertNotIsInstance(self.env._spine, CrashedSpine)
+        self.env.reset()
+        _, _, _, truncated, _ = self.env.step(action)
+        self.assertFalse(truncated)
+
+    def test_spine_crash_async(self):
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        env = UpkieTestEnv(
+            delta_actions=True,
+            frequency=100.0,
+            regulate_frequency=False,
+            shm_name=shared_memory._name,
+        )
+        shared_memory.close()
+        env._spine = MockSpine()
+        env.reset()
+        action = np.zeros((1,), dtype=np.float32)
+        env.log({"foo": 1.0})
+        env.step(action)
+        env._spine = CrashedSpine()
+
+        def reconnect_spine(spine_retries):
+            self.assertEqual(spine_retries, 1)  # single retry budget
+            env._spine = MockSpine()
+
+        with mock.patch.object(
+            env, "reconnect_spine", side_effect=reconnect_spine
+        ) as reconnect, mock.patch("upkie.envs.upkie_base_env.sleep"):
+            env.step_async(action)
+            _, reward, terminated, truncated, info = env.step_wait()
+        self.assertEqual(reconnect.call_count, 1)
+        self.assertTrue(truncated)
+        self.assertFalse(terminated)
+        self.assertEqual(reward, 0.0)
+        self.assertIn("spine_error", info)
+        env.step(action)  # restarted spine gets the full action
+        self.assertEqual(env._spine.action["env"], {"foo": 1.0})
+
+    def test_spine_crash_retries(self):
+        self.env.reset()
+        self.env._spine = CrashedSpine()
+        with mock.patch.object(
+            self.env,
+            "reconnect_spine",
+            side_effect=TimeoutError("Spine did not start"),
+        ) as reconnect, mock.patch(
+            "upkie.envs.upkie_base_env.sleep"
+        ) as sleep:
+            with self.assertRaises(SpineError):
+                self.env.step(np.zeros((1,), dtype=np.float32))
+        self.assertEqual(reconnect.call_count, 10)
+        self.assertEqual(sleep.call_count, 9)
+
+    def test_rate_stats(self):
+        self.env.reset()
+        action = np.zeros((1,), dtype=np.float32)
+        for _ in range(3):
+            self.env.step(action)
+        self.assertEqual(self.env.get_rate_stats()["count"], 3)
+        rate = self.env._spine.action["env"]["rate"]
+        self.assertIn("slack", rate)
+        self.assertIn("deadline_misses", rate)
+        self.env.reset()  # statistics are kept across episodes
+        self.env.step(action)
+        self.assertEqual(self.env.get_rate_stats()["count"], 4)
+
+    def test_rate_stats_without_regulation(self):
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        env = UpkieTestEnv(
+            frequency=100.0,
+            regulate_frequency=False,
+            shm_name=shared_memory._name,
+        )
+        shared_memory.close()
+        with self.assertRaises(UpkieException):
+            env.get_rate_stats()
+
+    def test_history(self):
+        self.assertIsNone(self.env.history)
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        env = UpkieTestEnv(
+            frequency=100.0,
+            history_size=3,
+            shm_name=shared_memory._name,
+        )
+        shared_memory.close()
+        env._spine = MockSpine()
+        env.reset()
+        self.assertEqual(len(env.history), 1)
+        for i in range(4):
+            env.step(np.full((1,), 0.1 * i, dtype=np.float32))
+        history = env.history
+        self.assertEqual(len(history), 3)
+        self.assertTrue(np.allclose(history.actions[:, 0], [0.1, 0.2, 0.3]))
+        self.assertTrue(np.allclose(history.observations, 0.5))
+        self.assertTrue(np.allclose(history.rewards, 1.0))
+        self.assertTrue(np.all(np.diff(history.timestamps) > 0.0))
+        env.reset()
+        self.assertEqual(len(env.history), 1)
+
+    def test_delta_actions(self):
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        env = UpkieTestEnv(
+            delta_actions=True,
+            frequency=100.0,
+            regulate_frequency=False,
+            shm_name=shared_memory._name,
+        )
+        shared_memory.close()
+        env._spine = MockSpine()
+        env.reset()
+        action = np.zeros((1,), dtype=np.float32)
+        env.log({"foo": 1.0})
+        env.step(action)
+        self.assertEqual(env._spine.action["env"], {"foo": 1.0})
+        env.step(action)
+        self.assertNotIn("env", env._spine.action)
+        self.assertIn("test", env._spine.action)  # arrays are always sent
+        env.reset()
+        env.step(action)
+        self.assertEqual(env._spine.action["env"], {"foo": 1.0})
+
+    def test_soft_reset_after_config_change(self):
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        env = UpkieTestEnv(
+            frequency=100.0,
+            shm_name=shared_memory._name,
+            soft_reset=True,
+        )
+        shared_memory.close()
+        env._spine = MockSpine()
+        env.reset()
+        env.reset()
+        self.assertIn("bullet", env._spine.action)  # soft reset
+        env._spine = MockSpine()
+        env._spine_config["wheel_odometry"]["signed_radius"]["left_wheel"] = 1
+        env.reset()
+        self.assertFalse(hasattr(env._spine, "action"))  # hard reset
+        env.reset()
+        self.assertIn("bullet", env._spine.action)  # soft reset
+
+    def test_spine_config_isolation(self):
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        envs = [
+            UpkieTestEnv(frequency=100.0, shm_name=shared_memory._name)
+            for _ in range(2)
+        ]
+        shared_memory.close()
+        for env in envs:
+            env._spine = MockSpine()
+        envs[0].init_state.position_base_in_world[2] = 1.0
+        envs[0].reset()
+        envs[1].reset()
+        reset_0 = envs[0]._spine_config["bullet"]["reset"]
+        reset_1 = envs[1]._spine_config["bullet"]["reset"]
+        self.assertAlmostEqual(reset_0["position_base_in_world"][2], 1.0)
+        self.assertAlmostEqual(reset_1["position_base_in_world"][2], 0.6)
+
+    def test_latencies(self):
+        self.env.reset()
+        action = np.zeros((1,), dtype=np.float32)
+        for _ in range(3):
+            self.env.step(action)
+        latencies = self.env.get_latencies()
+        self.assertEqual(latencies["reset"]["count"], 1)
+        self.assertEqual(latencies["step"]["count"], 3)
+        self.assertGreater(latencies["step"]["mean"], 0.0)
+        self.assertGreaterEqual(
+            latencies["step"]["max"], latencies["step"]["mean"]
+        )
+
+    def test_step_profile(self):
+        with self.assertRaises(UpkieException):
+            self.env.get_step_profile()
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        env = UpkieTestEnv(
+            frequency=100.0,
+            log_step_profile=True,
+            shm_name=shared_memory._name,
+        )
+        shared_memory.close()
+        env._spine = MockSpine()
+        env.reset()
+        action = np.zeros((1,), dtype=np.float32)
+        for _ in range(3):
+            env.step(action)
+        profile = env.get_step_profile()
+        self.assertEqual(set(profile.keys()), set(env.STEP_PHASES))
+        self.assertGreater(profile["sleep"]["max"], 0.0)
+        logged_profile = env._spine.action["env"]["profile"]
+        self.assertEqual(set(logged_profile.keys()), set(env.STEP_PHASES))
+
     def test_spine_config(self):
         """Check that runtime and default configs are merged properly."""
         shared_memory = SharedMemory(name=None, size=42, create=True)
@@ -6,13 +6,24 @@
 
 """Test UpkieGroundVelocity."""
 
+import os
+import tempfile
 import unittest
 from multiprocessing.shared_memory import SharedMemory
 
+import msgpack
 import numpy as np
 
 from upkie.envs import UpkieGroundVelocity
 from upkie.envs.tests.mock_spine import MockSpine
+from upkie.observers.base_pitch import (
+    ImuFrame,
+    compute_base_angular_velocity_from_imu,
+    compute_base_pitch_from_imu,
+    compute_pitch_frame_in_parent,
+)
+from upkie.utils.exceptions import UpkieException
+from upkie.utils.rotations import rotation_matrix_from_quaternion
 
 
 class TestUpkieGroundVelocity(unittest.TestCase):
@@ -41,6 +52,275 @@ class TestUpkieGroundVelocity(unittest.TestCase):
         observation, reward, terminated, truncated, _ = self.env.step(action)
         self.assertAlmostEqual(reward, 1.0)  # survival reward
 
+    def test_fused_observation_and_reward(self):
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        env = UpkieGroundVelocity(
+            frequency=100.0,
+            regulate_frequency=False,
+            reward_weights=UpkieGroundVelocity.RewardWeights(velocity=0.3),
+            shm_name=shared_memory._name,
+        )
+        shared_memory.close()
+        env._spine = MockSpine()
+        env.reset()
+        imu = env._spine.observation["imu"]
+        odometry = env._spine.observation["wheel_odometry"]
+        rng = np.random.default_rng(42)
+        action = np.zeros(env.action_space.shape)
+        default_mounting = np.diag([-1.0, 1.0, -1.0])
+        for _ in range(1000):
+            quat = rng.normal(size=4)
+            quat /= np.linalg.norm(quat)
+            imu["orientation"] = quat
+            imu["angular_velocity"] = rng.normal(size=3)
+            odometry["position"] = rng.normal()
+            odometry["velocity"] = rng.normal()
+            # Reference pitch from the rotation matrix of the base, rather
+            # than from the closed form used by the environment
+            pitch = compute_base_pitch_from_imu(quat, default_mounting)
+            observation, reward, terminated, _, _ = env.step(action)
+            angular_velocity = compute_base_angular_velocity_from_imu(
+                imu["angular_velocity"]
+            )
+            reference = np.array(
+                [
+                    pitch,
+                    odometry["position"],
+                    angular_velocity[1],
+                    odometry["velocity"],
+                ]
+            )
+            # arccos in the matrix computation of the reference pitch
+            # amplifies round-off near pitch=0
+            places = 12 if 1e-3 < abs(pitch) < np.pi - 1e-3 else 7
+            self.assertTrue(
+                np.allclose(observation, reference, rtol=0, atol=10**-places)
+            )
+            self.assertAlmostEqual(
+                reward,
+                env.get_reward(observation.copy(), action),
+                places=places,
+            )
+            self.assertEqual(terminated, abs(pitch) > env.fall_pitch)
+
+    def test_imu_mounting(self):
+        quat_base_in_imu = [0.5, 0.5, -0.5, 0.5]
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        env = UpkieGroundVelocity(
+            frequency=100.0,
+            regulate_frequency=False,
+            shm_name=shared_memory._name,
+            spine_config={
+                "imu": {"orientation_base_in_imu": quat_base_in_imu},
+            },
+        )
+        shared_memory.close()
+        env._spine = MockSpine()
+        env.reset()
+        self.assertFalse(ImuFrame.from_config(env._spine_config).is_default)
+
+        # Reference computations from rotation matrices, without ImuFrame
+        rotation_base_to_imu = rotation_matrix_from_quaternion(
+            quat_base_in_imu
+        )
+        rotation_ars_to_world = np.diag([1.0, -1.0, -1.0])
+        imu = env._spine.observation["imu"]
+        rng = np.random.default_rng(42)
+        action = np.zeros(env.action_space.shape)
+        for _ in range(100):
+            quat = rng.normal(size=4)
+            quat /= np.linalg.norm(quat)
+            imu["orientation"] = quat
+            imu["angular_velocity"] = rng.normal(size=3)
+            observation, _, terminated, _, _ = env.step(action)
+            rotation_base_to_world = (
+                rotation_ars_to_world
+                @ rotation_matrix_from_quaternion(quat)
+                @ rotation_base_to_imu
+            )
+            pitch = compute_pitch_frame_in_parent(rotation_base_to_world)
+            angular_velocity = rotation_base_to_imu.T @ imu["angular_velocity"]
+            # arccos in the matrix computation of the reference pitch
+            # amplifies round-off near pitch=0
+            places = 12 if 1e-3 < abs(pitch) < np.pi - 1e-3 else 7
+            self.assertAlmostEqual(observation[0], pitch, places=places)
+            self.assertAlmostEqual(
+                observation[2], angular_velocity[1], places=12
+            )
+            self.assertEqual(terminated, abs(pitch) > env.fall_pitch)
+
+    def test_batch_rewards(self):
+        rng = np.random.default_rng(0)
+        observations = rng.normal(size=(20, 4))
+        actions = rng.normal(size=(20, 1))
+        reward_weights = [
+            UpkieGroundVelocity.RewardWeights(),
+            UpkieGroundVelocity.RewardWeights(position=0.5, velocity=0.0),
+            UpkieGroundVelocity.RewardWeights(position=0.0, velocity=2.0),
+        ]
+        rewards = UpkieGroundVelocity.get_batch_rewards(
+            observations, actions, reward_weights
+        )
+        self.assertEqual(rewards.shape, (3, 20))
+        for i, weights in enumerate(reward_weights):
+            self.env.reward_weights = weights
+            for t in range(20):
+                reward = self.env.get_reward(observations[t], actions[t])
+                self.assertAlmostEqual(rewards[i, t], reward, places=14)
+
+    def write_spine_log(self, env, log_path: str) -> np.ndarray:
+        _, info = env.reset()
+        spine_observation = info["spine_observation"]
+        half_angle = 0.1
+        spine_observation["imu"]["orientation"] = [
+            np.cos(half_angle),
+            0.0,
+            np.sin(half_angle),
+            0.0,
+        ]
+        spine_observation["imu"]["angular_velocity"] = [0.1, 0.2, 0.3]
+        spine_observation["wheel_odometry"]["velocity"] = 0.3
+        action = np.array([0.6])
+        observation, _, _, _, _ = env.step(action)
+        spine_action = env._spine.action
+        with open(log_path, "wb") as log_file:
+            entries = [
+                {"observation": spine_observation},  # no action yet
+                {"action": spine_action, "observation": spine_observation},
+            ]
+            for entry in entries:
+                log_file.write(msgpack.packb(entry))
+        return observation
+
+    def test_load_spine_log(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            log_path = os.path.join(log_dir, "spine.mpack")
+            observation = self.write_spine_log(self.env, log_path)
+            observations, actions = UpkieGroundVelocity.load_spine_log(
+                log_path, wheel_radius=self.env.wheel_radius
+            )
+        self.assertEqual(observations.shape, (1, 4))
+        self.assertEqual(actions.shape, (1, 1))
+        self.assertTrue(np.allclose(observations[0], observation))
+        self.assertAlmostEqual(actions[0, 0], 0.6)
+
+    def test_load_spine_log_imu_mounting(self):
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        env = UpkieGroundVelocity(
+            frequency=100.0,
+            regulate_frequency=False,
+            shm_name=shared_memory._name,
+            spine_config={
+                "imu": {"orientation_base_in_imu": [0.5, 0.5, -0.5, 0.5]},
+            },
+        )
+        shared_memory.close()
+        env._spine = MockSpine()
+        with tempfile.TemporaryDirectory() as log_dir:
+            log_path = os.path.join(log_dir, "spine.mpack")
+            observation = self.write_spine_log(env, log_path)
+            observations, _ = UpkieGroundVelocity.load_spine_log(
+                log_path,
+                imu_frame=ImuFrame.from_config(env._spine_config),
+                wheel_radius=env.wheel_radius,
+            )
+        self.assertTrue(np.allclose(observations[0], observation))
+
+    def test_observation_features(self):
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        env = UpkieGroundVelocity(
+            frequency=100.0,
+            observation_features=[
+                "leg_positions",
+                "base_pitch",
+                "floor_contact",
+                "base_yaw_rate",
+                "rate_slack",
+            ],
+            shm_name=shared_memory._name,
+        )
+        shared_memory.close()
+        env._spine = MockSpine()
+        env._spine.observation["floor_contact"] = {"contact": True}
+        env._spine.observation["imu"]["angular_velocity"] = [0.0, 0.0, 0.4]
+        env._spine.observation["servo"]["right_hip"]["position"] = 0.2
+        observation, _ = env.reset()
+        self.assertEqual(env.observation_space.shape, (8,))
+        self.assertTrue(env.observation_space.contains(observation))
+        self.assertTrue(np.allclose(observation[:4], [0.0, 0.0, 0.2, 0.0]))
+        self.assertAlmostEqual(observation[4], 0.0)  # pitch
+        self.assertAlmostEqual(observation[5], 1.0)  # floor contact
+        self.assertAlmostEqual(observation[6], -0.4)  # yaw rate
+        action = np.zeros(env.action_space.shape)
+        observation, reward, _, _, _ = env.step(action)
+        self.assertLessEqual(observation[7], 0.01)  # rate slack
+        self.assertAlmostEqual(reward, 1.0)
+        with self.assertRaises(UpkieException):
+            env.get_reward(observation.copy(), action)
+
+    def test_invalid_observation_features(self):
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        for features in (["base_pitch", "base_pitch"], ["unknown"]):
+            with self.assertRaises(UpkieException):
+                UpkieGroundVelocity(
+                    frequency=100.0,
+                    observation_features=features,
+                    shm_name=shared_memory._name,
+                )
+        shared_memory.close()
+        shared_memory.unlink()
+
+    def test_soft_reset_ground_position(self):
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        env = UpkieGroundVelocity(
+            frequency=100.0,
+            shm_name=shared_memory._name,
+            soft_reset=True,
+        )
+        shared_memory.close()
+        env._spine = MockSpine()
+        env.reset()
+        env._spine.observation["wheel_odometry"]["position"] = 1.0
+        observation, _ = env.reset()
+        self.assertAlmostEqual(observation[1], 0.0)
+        env._spine.observation["wheel_odometry"]["position"] = 1.5
+        action = np.zeros(env.action_space.shape)
+        observation, _, _, _, _ = env.step(action)
+        self.assertAlmostEqual(observation[1], 0.5)
+
+    def test_spine_action_template(self):
+        self.env.reset()
+        action_1 = self.env.get_spine_action(np.array([0.1]))
+        velocity_1 = action_1["servo"]["left_wheel"]["velocity"]
+        action_2 = self.env.get_spine_action(np.array([0.2]))
+        self.assertIs(action_1, action_2)
+        self.assertAlmostEqual(
+            action_2["servo"]["left_wheel"]["velocity"], 2.0 * velocity_1
+        )
+        self.assertAlmostEqual(
+            action_2["servo"]["right_wheel"]["velocity"], -2.0 * velocity_1
+        )
+
+    def test_delta_actions(self):
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        env = UpkieGroundVelocity(
+            delta_actions=True,
+            frequency=100.0,
+            regulate_frequency=False,
+            shm_name=shared_memory._name,
+        )
+        shared_memory.close()
+        env._spine = MockSpine()
+        env.reset()
+        env.step(np.array([0.1]))
+        servo_action = env._spine.action["servo"]
+        self.assertIn("maximum_torque", servo_action["left_wheel"])
+        self.assertIn("maximum_torque", servo_action["left_hip"])
+        env.step(np.array([0.2]))
+        servo_action = env._spine.action["servo"]
+        self.assertEqual(set(servo_action["left_wheel"]), {"velocity"})
+        self.assertNotIn("left_hip", servo_action)  # legs at rest
+
     def test_check_env(self):
         try:
             from stable_baselines3.common.env_checker import check_env
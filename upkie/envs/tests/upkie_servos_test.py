@@ -6,13 +6,80 @@
 
 """Tests for UpkieServos environment."""
 
+import copy
 import unittest
 from multiprocessing.shared_memory import SharedMemory
+from unittest import mock
 
 import numpy as np
+import pinocchio as pin
+from gymnasium import spaces
 
 from upkie.envs import UpkieServos
+from upkie.envs.observation_schema import (
+    ObservationSchema,
+    list_observation_fields,
+)
 from upkie.envs.tests.mock_spine import MockSpine
+from upkie.utils.exceptions import UpkieException
+
+
+class ChunkMockSpine(MockSpine):
+    """Mock spine that plays action chunks like the Bullet spine.
+
+    Each request runs a number of spine cycles, like a spine simulating
+    substeps. Chunk targets are played one per cycle, independently from
+    requests, and servo velocities follow the last target played.
+    """
+
+    def __init__(self, cycles_per_request: int):
+        super().__init__()
+        self.cycles_per_request = cycles_per_request
+        self.observation["action_chunk"] = {
+            "id": 0,
+            "nb_observed": 0,
+            "observations": {},
+        }
+        self.new_action = False
+        self.servo_targets = []
+        self.targets = []
+
+    def cycle(self) -> None:
+        output = self.observation["action_chunk"]
+        nb_played = len(self.servo_targets)
+        if output["nb_observed"] < nb_played:
+            output["observations"][str(nb_played - 1)] = {
+                key: copy.deepcopy(self.observation[key])
+                for key in ("imu", "servo", "wheel_odometry")
+            }
+            output["nb_observed"] = nb_played
+        if self.new_action:
+            self.new_action = False
+            chunk = self.action.get("bullet", {}).get("action_chunk")
+            if chunk is not None and chunk["id"] != output["id"]:
+                output["id"] = chunk["id"]
+                output["nb_observed"] = 0
+                output["observations"] = {}
+                self.servo_targets = []
+                self.targets = [
+                    chunk["targets"][str(i)] for i in range(chunk["size"])
+                ]
+        if len(self.servo_targets) < len(self.targets):
+            target = self.targets[len(self.servo_targets)]
+            self.servo_targets.append(target)
+            for joint, joint_target in target.items():
+                self.observation["servo"][joint]["velocity"] = joint_target[
+                    "velocity"
+                ]
+
+    def get_observation(self) -> dict:
+        for _ in range(self.cycles_per_request):
+            self.cycle()
+        return super().get_observation()
+
+    def set_action(self, action) -> None:
+        super().set_action(copy.deepcopy(action))
+        self.new_action = True
 
 
 class TestUpkieServos(unittest.TestCase):
@@ -55,6 +122,23 @@ class TestUpkieServos(unittest.TestCase):
         _, reward, _, _, _ = self.env.step(action)
         self.assertAlmostEqual(reward, 1.0)  # survival reward
 
+    def test_history(self):
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        env = UpkieServos(
+            frequency=100.0,
+            history_size=2,
+            shm_name=shared_memory._name,
+        )
+        shared_memory.close()
+        env._spine = MockSpine()
+        env.reset()
+        action = {servo: {"velocity": 0.5} for servo in env.JOINT_NAMES}
+        env.step(action)
+        history = env.history
+        self.assertEqual(history.actions.shape, (2, 36))
+        self.assertEqual(len(history.observations), 2)
+        self.assertEqual(np.count_nonzero(history.actions[-1] == 0.5), 6)
+
     def test_action_clamping(self):
         action = {
             servo: {
@@ -89,6 +173,166 @@ class TestUpkieServos(unittest.TestCase):
             places=5,
         )
 
+    def test_action_to_array(self):
+        action = {
+            joint: {"position": 0.1 * i, "velocity": np.array([0.2])}
+            for i, joint in enumerate(self.env.JOINT_NAMES)
+        }
+        action_array = self.env.action_to_array(action)
+        neutral_array = self.env.get_neutral_action_array()
+        self.assertEqual(action_array.shape, (6, 6))
+        self.assertTrue(np.allclose(action_array[:, 0], 0.1 * np.arange(6)))
+        self.assertTrue(np.allclose(action_array[:, 1], 0.2))
+        self.assertTrue(np.allclose(action_array[:, 2:], neutral_array[:, 2:]))
+
+    def test_action_to_array_extra_keys(self):
+        action = {
+            joint: {"position": 0.1, "not_a_servo_key": 42.0}
+            for joint in self.env.JOINT_NAMES
+        }
+        action_array = self.env.action_to_array(action)
+        self.assertTrue(np.allclose(action_array[:, 0], 0.1))
+        self.assertFalse(np.any(action_array == 42.0))
+
+    def test_array_action(self):
+        self.env.reset()
+        action_array = self.env.get_neutral_action_array()
+        action_array[0, 1] = 0.5  # left_hip velocity
+        action_array[1, 3] = 2.0  # left_knee kp_scale
+        with self.assertLogs(level="WARNING") as logs:
+            self.env.step(action_array)
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("left_knee: kp_scale", logs.output[0])
+        servo_action = self.env._spine.action["servo"]
+        self.assertAlmostEqual(servo_action["left_hip"]["velocity"], 0.5)
+        self.assertAlmostEqual(servo_action["left_knee"]["kp_scale"], 1.0)
+        self.assertTrue(np.isnan(servo_action["right_wheel"]["position"]))
+
+    def test_flat_observation(self):
+        shared_memory = SharedMemory(name=None, size=42, create=True)
+        flat_env = UpkieServos(
+            flat_observation=True,
+            frequency=100.0,
+            shm_name=shared_memory._name,
+        )
+        shared_memory.close()
+        flat_env._spine = MockSpine()
+        flat_env._spine.observation["servo"]["left_knee"]["torque"] = 1.5
+        flat_env._spine.observation["imu"]["orientation"] = [0.0, 1.0, 0, 0]
+        self.env._spine = flat_env._spine
+
+        flat_observation, _ = flat_env.reset()
+        observation, _ = self.env.reset()
+        self.assertIsInstance(flat_env.observation_space, spaces.Box)
+        self.assertTrue(flat_env.observation_space.contains(flat_observation))
+        self.assertTrue(
+            np.allclose(
+                flat_observation,
+                spaces.flatten(self.env.observation_space, observation),
+            )
+        )
+        schema = flat_env.observation_schema
+        index = schema.index("servo", "left_knee", "torque")
+        self.assertAlmostEqual(flat_observation[index], 1.5)
+
+    def test_kinematics(self):
+        self.env.reset()
+        kinematics = self.env.kinematics
+        self.assertAlmostEqual(kinematics.wheel_distance, 0.3048, places=4)
+        self.assertGreater(kinematics.base_height, 0.5)
+        with mock.patch.object(
+            pin,
+            "framesForwardKinematics",
+            wraps=pin.framesForwardKinematics,
+        ) as forward_kinematics:
+            straight_height = kinematics.base_height
+            self.assertEqual(forward_kinematics.call_count, 0)  # cached
+            for side in ("left", "right"):
+                servo = self.env._spine.observation["servo"]
+                servo[f"{side}_hip"]["position"] = 0.5
+                servo[f"{side}_knee"]["position"] = -1.0
+            self.env.step(self.env.get_neutral_action())
+            self.assertEqual(forward_kinematics.call_count, 0)  # lazy
+            self.assertLess(kinematics.base_height, straight_height)
+            self.assertEqual(forward_kinematics.call_count, 1)
+
+    def test_step_chunk(self):
+        self.env._spine = ChunkMockSpine(cycles_per_request=5)
+        _, info = self.env.reset()
+        number = info["spine_observation"]["number"]
+        action_chunk = np.stack([self.env.get_neutral_action_array()] * 3)
+        action_chunk[:, 0, 1] = [0.1, 0.2, 0.3]  # left_hip velocity
+        self.env._spine.observation["servo"]["left_hip"]["torque"] = 2.0
+        observations, reward, terminated, truncated, info = (
+            self.env.step_chunk(action_chunk)
+        )
+        self.assertEqual(observations.shape[0], 3)
+        self.assertAlmostEqual(reward, 3.0)
+        self.assertFalse(terminated)
+        self.assertFalse(truncated)
+        self.assertEqual(info["spine_observation"]["number"], number + 1)
+        schema = ObservationSchema(
+            list_observation_fields(self.env.observation_space)
+        )
+        torque_index = schema.index("servo", "left_hip", "torque")
+        self.assertTrue(np.allclose(observations[:, torque_index], 2.0))
+        velocity_index = schema.index("servo", "left_hip", "velocity")
+        self.assertTrue(
+            np.allclose(observations[:, velocity_index], [0.1, 0.2, 0.3])
+        )
+        servo_action = self.env._spine.action["servo"]
+        self.assertAlmostEqual(servo_action["left_hip"]["velocity"], 0.3)
+
+        # Chunk actions are sent once
+        self.env.step(action_chunk[0])
+        self.assertNotIn("bullet", self.env._spine.action)
+
+    def test_step_chunk_over_requests(self):
+        self.env._spine = ChunkMockSpine(cycles_per_request=1)
+        _, info = self.env.reset()
+        number = info["spine_observation"]["number"]
+        action_chunk = np.stack([self.env.get_neutral_action_array()] * 3)
+        action_chunk[:, 0, 1] = [0.1, 0.2, 0.3]  # left_hip velocity
+        observations, _, _, _, info = self.env.step_chunk(action_chunk)
+        self.assertEqual(observations.shape[0], 3)
+
+        # The last target is observed one cycle after it is played
+        self.assertEqual(info["spine_observation"]["number"], number + 4)
+        self.assertEqual(len(self.env._spine.servo_targets), 3)
+        for target, velocity in zip(
+            self.env._spine.servo_targets, [0.1, 0.2, 0.3]
+        ):
+            self.assertAlmostEqual(target["left_hip"]["velocity"], velocity)
+
+    def test_step_chunk_fall(self):
+        self.env._spine = ChunkMockSpine(cycles_per_request=5)
+        self.env.reset()
+        self.env._spine.observation["imu"]["orientation"] = [0.0, 1.0, 0, 0]
+        action_chunk = np.stack([self.env.get_neutral_action_array()] * 3)
+        observations, _, terminated, _, _ = self.env.step_chunk(action_chunk)
+        self.assertTrue(terminated)
+        self.assertEqual(observations.shape[0], 1)
+        with self.assertRaises(UpkieException):
+            self.env.step_chunk(action_chunk[:0])
+
+    def test_step_chunk_stalled(self):
+        self.env._spine = ChunkMockSpine(cycles_per_request=5)
+        _, info = self.env.reset()
+        number = info["spine_observation"]["number"]
+        self.env._spine.cycles_per_request = 0
+        action_chunk = np.stack([self.env.get_neutral_action_array()] * 3)
+        with self.assertRaises(UpkieException):
+            self.env.step_chunk(action_chunk)
+        nb_requests = self.env._spine.observation["number"] - number
+        self.assertEqual(nb_requests, 1 + 3 + UpkieServos.CHUNK_WAIT_MARGIN)
+
+    def test_step_chunk_unsupported(self):
+        self.env.reset()
+        action_chunk = np.stack([self.env.get_neutral_action_array()] * 3)
+        with self.assertRaises(UpkieException):
+            self.env.step_chunk(action_chunk)
+        self.assertFalse(hasattr(self.env._spine, "action"))
+
 
 if __name__ == "__main__":
     unittest.main()
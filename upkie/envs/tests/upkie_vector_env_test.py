@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Test UpkieVectorEnv."""
+
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+from unittest import mock
+
+import numpy as np
+
+from upkie.envs import UpkieGroundVelocity, UpkieVectorEnv
+from upkie.envs.tests.mock_spine import CrashedSpine, MockSpine
+from upkie.utils.exceptions import UpkieException
+
+
+class TestUpkieVectorEnv(unittest.TestCase):
+    def setUp(self, num_envs: int = 3):
+        envs = []
+        for _ in range(num_envs):
+            shared_memory = SharedMemory(name=None, size=42, create=True)
+            env = UpkieGroundVelocity(
+                fall_pitch=1.0,
+                frequency=100.0,
+                regulate_frequency=False,
+                shm_name=shared_memory._name,
+            )
+            shared_memory.close()
+            env._spine = MockSpine()
+            envs.append(env)
+        self.num_envs = num_envs
+        self.vector_env = UpkieVectorEnv(envs, max_episode_steps=5)
+
+    def test_spaces(self):
+        self.assertEqual(self.vector_env.observation_space.shape, (3, 4))
+        self.assertEqual(self.vector_env.action_space.shape, (3, 1))
+
+    def test_reset(self):
+        observations, infos = self.vector_env.reset(seed=42)
+        self.assertEqual(observations.shape, (self.num_envs, 4))
+        self.assertTrue(np.all(infos["_spine_observation"]))
+
+    def test_step(self):
+        self.vector_env.reset()
+        actions = np.zeros(self.vector_env.action_space.shape)
+        observations, rewards, terminated, truncated, _ = self.vector_env.step(
+            actions
+        )
+        self.assertEqual(observations.shape, (self.num_envs, 4))
+        self.assertEqual(rewards.shape, (self.num_envs,))
+        self.assertTrue(np.allclose(rewards, 1.0))
+        self.assertFalse(np.any(terminated))
+        self.assertFalse(np.any(truncated))
+        for env in self.vector_env.envs:
+            self.assertIn("servo", env._spine.action)
+
+    def test_autoreset_on_fall(self, pitch: float = 1.2):
+        self.vector_env.reset()
+        falling_env = self.vector_env.envs[1]
+        falling_env._spine.observation["imu"]["orientation"] = [
+            np.cos(pitch / 2),
+            0.0,
+            np.sin(pitch / 2),
+            0.0,
+        ]
+        actions = np.zeros(self.vector_env.action_space.shape)
+        _, _, terminated, _, infos = self.vector_env.step(actions)
+        self.assertEqual(list(terminated), [False, True, False])
+        self.assertEqual(list(infos["_final_obs"]), [False, True, False])
+        self.assertAlmostEqual(abs(infos["final_obs"][1][0]), pitch)
+
+    def test_truncation(self):
+        self.vector_env.reset()
+        actions = np.zeros(self.vector_env.action_space.shape)
+        for _ in range(4):
+            _, _, _, truncated, _ = self.vector_env.step(actions)
+            self.assertFalse(np.any(truncated))
+        _, _, _, truncated, _ = self.vector_env.step(actions)
+        self.assertTrue(np.all(truncated))
+
+    def test_spine_crash(self):
+        self.vector_env.reset()
+        crashed_env = self.vector_env.envs[1]
+        crashed_env._spine = CrashedSpine()
+
+        def reconnect_spine(spine_retries):
+            crashed_env._spine = MockSpine()
+
+        actions = np.zeros(self.vector_env.action_space.shape)
+        with mock.patch.object(
+            crashed_env, "reconnect_spine", side_effect=reconnect_spine
+        ):
+            _, _, terminated, truncated, infos = self.vector_env.step(actions)
+        self.assertFalse(np.any(terminated))
+        self.assertEqual(list(truncated), [False, True, False])
+        self.assertEqual(
+            list(infos["final_info"]["_spine_error"]), [False, True, False]
+        )
+        _, _, _, truncated, _ = self.vector_env.step(actions)
+        self.assertFalse(np.any(truncated))
+
+    def test_call(self):
+        frequencies = self.vector_env.call("frequency")
+        self.assertEqual(frequencies, (100.0,) * self.num_envs)
+
+    def test_no_env(self):
+        with self.assertRaises(UpkieException):
+            UpkieVectorEnv([])
+
+
+if __name__ == "__main__":
+    unittest.main()
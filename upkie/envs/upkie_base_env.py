@@ -5,19 +5,28 @@
 # Copyright 2023 Inria
 
 import abc
-from typing import Optional, Tuple
+from time import perf_counter, sleep
+from typing import Dict, Optional, Tuple
 
 import gymnasium
 import numpy as np
-from loop_rate_limiters import RateLimiter
+from gymnasium import spaces
 from numpy.typing import NDArray
+from vulp.spine import SpineError as VulpSpineError
 from vulp.spine import SpineInterface
 
 import upkie.config
-from upkie.observers.base_pitch import compute_base_pitch_from_imu
-from upkie.utils.exceptions import UpkieException
-from upkie.utils.nested_update import nested_update
+from upkie.config import SpineConfig
+from upkie.observers.base_pitch import ImuFrame, compute_base_pitch_from_imu
+from upkie.utils.exceptions import SpineError, UpkieException
+from upkie.utils.nested_delta import nested_delta
+from upkie.utils.phase_profiler import PhaseProfiler
+from upkie.utils.rate_regulator import RateRegulator
 from upkie.utils.robot_state import RobotState
+from upkie.utils.running_stats import RunningStats
+from upkie.utils.spdlog import logging
+
+from .step_history import StepHistory
 
 
 class UpkieBaseEnv(abc.ABC, gymnasium.Env):
@@ -29,9 +38,16 @@ class UpkieBaseEnv(abc.ABC, gymnasium.Env):
 
     This base environment has the following attributes:
 
+    - ``delta_actions``: If set, only action fields that changed since the
+        previous step are sent to the spine.
     - ``fall_pitch``: Fall pitch angle, in radians.
     - ``init_state``: Initial state for the floating base of the robot, which
         may be randomized upon resets.
+    - ``log_step_profile``: If set, durations of the phases of the last step
+        are logged to the ``env`` section of spine actions.
+    - ``soft_reset``: If set, resets after the first one re-teleport the
+        simulated robot without restarting the spine, unless the spine
+        configuration changed.
 
     @note This environment is made to run on a single CPU thread rather than on
     GPU/TPU. The downside for reinforcement learning is that computations are
@@ -40,43 +56,96 @@ class UpkieBaseEnv(abc.ABC, gymnasium.Env):
     """
 
     __frequency: Optional[float]
+    __last_observation: Optional[object]
     __log: dict
-    __rate: Optional[RateLimiter]
+    __pending_action: Optional[NDArray[float]]
+    __profiler: Optional[PhaseProfiler]
+    __rate: Optional[RateRegulator]
     __regulate_frequency: bool
+    __reset_latency: RunningStats
+    __soft_reset_count: int
+    __spine_error: Optional[str]
+    __spine_started: bool
+    __started_config_hashes: Dict[str, int]
+    __step_duration: float
+    __step_latency: RunningStats
+    _imu_frame: ImuFrame
     _spine: SpineInterface
-    _spine_config: dict
+    _spine_config: SpineConfig
+    delta_actions: bool
     fall_pitch: float
     init_state: RobotState
+    log_step_profile: bool
+    soft_reset: bool
+
+    ## Paths of spine configuration values that soft resets apply.
+    SOFT_RESET_PATHS: Tuple[Tuple[str, ...], ...] = (("bullet", "reset"),)
+
+    STEP_PHASES: Tuple[str, ...] = (
+        "sleep",
+        "get_spine_action",
+        "set_action",
+        "get_observation",
+        "get_env_observation",
+        "get_reward",
+        "detect_fall",
+    )
 
     def __init__(
         self,
+        delta_actions: bool = False,
         fall_pitch: float = 1.0,
         frequency: Optional[float] = 200.0,
+        history_size: int = 0,
         init_state: Optional[RobotState] = None,
+        log_step_profile: bool = False,
+        profile_steps: bool = False,
+        rate_spin_duration: float = 0.0,
         regulate_frequency: bool = True,
         shm_name: str = "/vulp",
+        soft_reset: bool = False,
         spine_config: Optional[dict] = None,
         spine_retries: int = 10,
     ) -> None:
         """!
         Initialize environment.
 
+        @param delta_actions If set, only send to the spine the action fields
+            that changed since the previous step. The spine keeps the values
+            of fields that are not sent.
         @param fall_pitch Fall detection pitch angle, in radians.
         @param frequency Regulated frequency of the control loop, in Hz. Can be
             set even when `regulate_frequency` is false, as some environments
             make use of e.g. `self.dt` internally.
+        @param history_size If positive, keep the last ``history_size``
+            vectorized observations, actions, rewards and timestamps in a
+            preallocated ring buffer available from :attr:`history`.
         @param init_state Initial state of the robot, only used in simulation.
+        @param log_step_profile If set, log the durations of the phases of the
+            last step to the ``env`` section of spine actions. Implies
+            ``profile_steps``.
+        @param profile_steps If set, measure the durations of each phase of
+            :func:`step`. Statistics are available from
+            :func:`get_step_profile`.
+        @param rate_spin_duration Duration before each clock tick, in seconds,
+            during which loop frequency regulation busy-waits rather than
+            sleeps. Increases CPU usage but reduces jitter.
         @param regulate_frequency Enables loop frequency regulation.
         @param shm_name Name of shared-memory file to exchange with the spine.
+        @param soft_reset If set, only the first :func:`reset` stops and
+            restarts the spine. Subsequent resets send the new floating-base
+            state of the robot to the running simulation. This option only
+            works with the Bullet spine.
         @param spine_config Additional spine configuration overriding the
             defaults from ``//config:spine.yaml``. The combined configuration
-            dictionary is sent to the spine at every :func:`reset`.
+            is deep-copied, so that each environment owns its own, and sent to
+            the spine at every :func:`reset` that restarts the spine.
         @param spine_retries Number of times to try opening the shared-memory
             file to communicate with the spine.
         """
-        merged_spine_config = upkie.config.SPINE_CONFIG.copy()
-        if spine_config is not None:
-            nested_update(merged_spine_config, spine_config)
+        merged_spine_config = SpineConfig(
+            upkie.config.SPINE_CONFIG, spine_config
+        )
         if regulate_frequency and frequency is None:
             raise UpkieException(f"{regulate_frequency=} but {frequency=}")
         if init_state is None:
@@ -84,14 +153,39 @@ class UpkieBaseEnv(abc.ABC, gymnasium.Env):
                 position_base_in_world=np.array([0.0, 0.0, 0.6])
             )
 
+        self.__env_action = {}
         self.__frequency = frequency
+        self.__history = None
+        self.__last_spine_action = {}
+        self.__history_size = history_size
+        self.__last_observation = None
         self.__log = {}
+        self.__pending_action = None
+        self.__profiler = (
+            PhaseProfiler(self.STEP_PHASES)
+            if profile_steps or log_step_profile
+            else None
+        )
         self.__rate = None
+        self.__rate_spin_duration = rate_spin_duration
         self.__regulate_frequency = regulate_frequency
+        self.__reset_latency = RunningStats()
+        self.__shm_name = shm_name
+        self.__soft_reset_count = 0
+        self.__spine_error = None
+        self.__spine_retries = spine_retries
+        self.__spine_started = False
+        self.__started_config_hashes = {}
+        self.__step_duration = 0.0
+        self.__step_latency = RunningStats()
+        self.delta_actions = delta_actions
+        self._imu_frame = ImuFrame.from_config(merged_spine_config)
         self._spine = SpineInterface(shm_name, retries=spine_retries)
         self._spine_config = merged_spine_config
         self.fall_pitch = fall_pitch
         self.init_state = init_state
+        self.log_step_profile = log_step_profile
+        self.soft_reset = soft_reset
 
     @property
     def dt(self) -> Optional[float]:
@@ -109,6 +203,78 @@ class UpkieBaseEnv(abc.ABC, gymnasium.Env):
         """
         return self.__frequency
 
+    @property
+    def rate_slack(self) -> float:
+        """!
+        Slack of the last loop frequency regulation in seconds, negative for
+        deadline misses, or zero if there is no frequency regulation.
+        """
+        return self.__rate.slack if self.__rate is not None else 0.0
+
+    @property
+    def history(self) -> Optional[StepHistory]:
+        """!
+        History of the last steps, or ``None`` if ``history_size`` is zero.
+
+        The first entry after a :func:`reset` holds the initial observation,
+        with a zero action and reward. The history is allocated upon the first
+        :func:`reset`, once observation and action spaces are known.
+        """
+        return self.__history
+
+    def get_latencies(self) -> dict:
+        """!
+        Get latency statistics of resets and steps.
+
+        Step latencies only count time spent in the environment after the
+        rate limiter, that is, in :func:`step_async` and :func:`step_wait`.
+
+        @returns Dictionary with ``reset`` and ``step`` keys, each of them
+            mapping to a dictionary of statistics (count, last, max, mean) of
+            durations in seconds.
+        """
+        return {
+            "reset": self.__reset_latency.as_dict(),
+            "step": self.__step_latency.as_dict(),
+        }
+
+    def get_step_profile(self) -> dict:
+        """!
+        Get statistics on the durations of each phase of :func:`step`.
+
+        Phases are, in order: sleeping in the rate limiter, computing the spine
+        action, sending it to the spine, waiting for the spine observation,
+        computing the environment observation, the reward, and detecting
+        falls. Statistics are computed over a rolling window of past steps.
+
+        @returns Dictionary mapping phase names to dictionaries with ``p50``,
+            ``p99`` and ``max`` durations in seconds.
+        @raise UpkieException If step profiling is disabled.
+        """
+        if self.__profiler is None:
+            raise UpkieException(
+                "Step profiling is disabled, enable it with profile_steps=True"
+            )
+        return self.__profiler.get_stats()
+
+    def get_rate_stats(self) -> dict:
+        """!
+        Get timing statistics of loop frequency regulation.
+
+        Statistics are accumulated over all episodes since the first
+        :func:`reset`. See @ref upkie.utils.rate_regulator.RateRegulator for
+        details.
+
+        @returns Dictionary of deadline misses, consecutive overruns and
+            jitter statistics.
+        @raise UpkieException If loop frequency regulation is disabled.
+        """
+        if not self.__regulate_frequency:
+            raise UpkieException("Loop frequency regulation is disabled")
+        if self.__rate is None:
+            return {}
+        return self.__rate.get_stats()
+
     def update_init_rand(self, **kwargs) -> None:
         """!
         Update initial-state randomization.
@@ -123,6 +289,22 @@ class UpkieBaseEnv(abc.ABC, gymnasium.Env):
         Stop the spine properly.
         """
         self._spine.stop()
+        self.__spine_started = False
+
+    def reconnect_spine(self, spine_retries: int = 10) -> None:
+        """!
+        Open the shared memory of the spine again, for instance after it was
+        restarted by a @ref upkie.utils.spine_pool.SpinePool.
+
+        The next call to :func:`reset` will start the spine, even if
+        ``soft_reset`` is set.
+
+        @param spine_retries Number of times to try opening the shared-memory
+            file to communicate with the spine.
+        """
+        self._spine = SpineInterface(self.__shm_name, retries=spine_retries)
+        self.__pending_action = None
+        self.__spine_started = False
 
     def reset(
         self,
@@ -142,22 +324,125 @@ class UpkieBaseEnv(abc.ABC, gymnasium.Env):
             - ``info``: Dictionary with auxiliary diagnostic information. For
               Upkie this is the full observation dictionary sent by the spine.
         """
+        t0 = perf_counter()
         super().reset(seed=seed)
-        self._spine.stop()
+        self.__last_spine_action.clear()
+        self.__pending_action = None
+        self.__spine_error = None
         self.__reset_rate()
         self.__reset_init_state()
-        self._spine.start(self._spine_config)
-        self._spine.get_observation()  # might be a pre-reset observation
-        spine_observation = self._spine.get_observation()
+        soft_reset = self.soft_reset and self.__spine_started
+        if soft_reset and not self.__has_new_config():
+            spine_observation = self.__soft_reset_spine()
+        else:  # hard reset
+            spine_observation = self.__hard_reset_spine()
         self.parse_first_observation(spine_observation)
         observation = self.get_env_observation(spine_observation)
+        if self.__history_size > 0:
+            self.__reset_history(observation)
+        self.__last_observation = observation
         info = {"spine_observation": spine_observation}
+        self.__reset_latency.update(perf_counter() - t0)
         return observation, info
 
+    def __reset_history(self, observation) -> None:
+        if self.__history is None:
+            self.__history = StepHistory(
+                self.__history_size,
+                observation_dim=spaces.flatdim(self.observation_space),
+                action_dim=spaces.flatdim(self.action_space),
+            )
+        self.__history.clear()
+        self.__history.append(
+            self.vectorize_observation(observation),
+            0.0,
+            0.0,
+            perf_counter(),
+        )
+
+    def __has_new_config(self) -> bool:
+        changed_sections = self._spine_config.get_changed_sections(
+            self.__started_config_hashes, exclude=self.SOFT_RESET_PATHS
+        )
+        if changed_sections:
+            logging.info(
+                f"Spine configuration changed in {changed_sections}, "
+                "restarting the spine"
+            )
+        return bool(changed_sections)
+
+    def __hard_reset_spine(self) -> dict:
+        self._spine.stop()
+        self._spine.start(self._spine_config)
+        self._imu_frame = ImuFrame.from_config(self._spine_config)
+        self.__started_config_hashes = self._spine_config.get_section_hashes(
+            exclude=self.SOFT_RESET_PATHS
+        )
+        self._spine.get_observation()  # might be a pre-reset observation
+        spine_observation = self._spine.get_observation()
+        self.__spine_started = True
+        return spine_observation
+
+    def __recover_spine(self, exception: Exception) -> None:
+        """!
+        Reconnect to a spine that stopped responding and restart it, waiting
+        until it is restarted if it crashed.
+
+        @param exception Exception raised when the spine stopped responding.
+        @raise SpineError If the spine does not respond after the prescribed
+            number of retries.
+
+        The next call to :func:`step_wait` returns a truncated transition.
+        """
+        logging.warning(
+            f"Spine {self.__shm_name} stopped responding ({exception}), "
+            "reconnecting..."
+        )
+        self.__last_spine_action.clear()  # send the next action in full
+        self.__spine_error = str(exception)
+        for trial in range(self.__spine_retries):
+            if trial > 0:
+                sleep(1.0)
+            try:
+                self.reconnect_spine(spine_retries=1)
+                self.__hard_reset_spine()
+                return
+            except (TimeoutError, VulpSpineError):
+                pass  # shared memory of the crashed spine, or no spine yet
+        raise SpineError(
+            f"Spine {self.__shm_name} did not respond after "
+            f"{self.__spine_retries} attempts to reconnect"
+        )
+
+    def __truncate_after_spine_error(
+        self,
+    ) -> Tuple[NDArray[float], float, bool, bool, dict]:
+        self.__pending_action = None
+        info = {"spine_error": self.__spine_error}
+        self.__spine_error = None
+        return self.__last_observation, 0.0, False, True, info
+
+    def __soft_reset_spine(self) -> dict:
+        # The Bullet spine teleports the robot once per new soft-reset id
+        self.__soft_reset_count += 1
+        soft_reset = {"id": self.__soft_reset_count}
+        soft_reset.update(self._spine_config["bullet"]["reset"])
+        self._spine.set_action({"bullet": {"soft_reset": soft_reset}})
+        self._spine.get_observation()  # might be a pre-teleport observation
+        spine_observation = self._spine.get_observation()
+        return spine_observation
+
     def __reset_rate(self):
-        if self.__regulate_frequency:
-            rate_name = f"{self.__class__.__name__} rate limiter"
-            self.__rate = RateLimiter(self.__frequency, name=rate_name)
+        if not self.__regulate_frequency:
+            return
+        if self.__rate is None:
+            self.__rate = RateRegulator(
+                self.__frequency,
+                name=f"{self.__class__.__name__} rate regulator",
+                spin_duration=self.__rate_spin_duration,
+            )
+        else:  # keep statistics across episodes
+            self.__rate.restart()
 
     def __reset_init_state(self):
         init_state, np_random = self.init_state, self.np_random
@@ -198,28 +483,142 @@ class UpkieBaseEnv(abc.ABC, gymnasium.Env):
               needs to call :func:`reset()`.
             - ``info``: Dictionary with auxiliary diagnostic information. For
               us this is the full observation dictionary coming from the spine.
+
+        If the spine stops responding, for instance because it crashed and
+        was restarted by a @ref upkie.utils.spine_pool.SpinePool, this
+        function reconnects to it and returns a truncated transition with the
+        last observation, a zero reward, and the error in the ``spine_error``
+        key of ``info``. The same goes for :func:`step_async` and
+        :func:`step_wait`.
         """
+        self.step_async(action)
+        return self.step_wait()
+
+    def step_async(self, action: NDArray[float]) -> None:
+        """!
+        Send an action to the spine and return without waiting for the next
+        observation.
+
+        This is the first half of :func:`step`. The agent can compute anything
+        it needs (e.g. planning or logging) while the spine cycles, then call
+        :func:`step_wait` to collect the outcome of the action.
+
+        @param action Action from the agent.
+        """
+        profiler = self.__profiler
+        if profiler is not None:
+            profiler.start()
         if self.__regulate_frequency:
             self.__rate.sleep()  # wait until clock tick to send the action
+        if profiler is not None:
+            profiler.lap(0)
 
-        # Act
+        t0 = perf_counter()
         spine_action = self.get_spine_action(action)
-        spine_action["env"] = {}
+        if profiler is not None:
+            profiler.lap(1)
+        try:
+            self.__send_spine_action(spine_action)
+        except (TimeoutError, VulpSpineError) as exception:
+            self.__recover_spine(exception)
+        if profiler is not None:
+            profiler.lap(2)
+        self.__pending_action = action
+        self.__step_duration = perf_counter() - t0
+
+    def __send_spine_action(self, spine_action: dict) -> None:
+        env_action = self.__env_action
+        env_action.clear()
         if self.__log:
-            spine_action["env"].update(self.__log)
+            env_action.update(self.__log)
         if self.__regulate_frequency:
-            spine_action["env"]["rate"] = {"slack": self.__rate.slack}
+            rate = self.__rate
+            env_action["rate"] = {
+                "consecutive_overruns": rate.consecutive_overruns,
+                "deadline_misses": rate.deadline_misses,
+                "slack": rate.slack,
+            }
+        if self.log_step_profile:
+            env_action["profile"] = self.__profiler.get_last()
+        spine_action["env"] = env_action
+        if self.delta_actions:
+            spine_action = nested_delta(spine_action, self.__last_spine_action)
         self._spine.set_action(spine_action)
 
-        # Observe
-        spine_observation = self._spine.get_observation()
+    def step_wait(self) -> Tuple[NDArray[float], float, bool, bool, dict]:
+        """!
+        Wait for the spine to process the last action sent by
+        :func:`step_async` and collect its outcome.
+
+        This is the second half of :func:`step`.
+
+        @returns Same tuple ``(observation, reward, terminated, truncated,
+            info)`` as :func:`step`.
+        @raise UpkieException If no action is pending.
+        """
+        if self.__pending_action is None:
+            raise UpkieException("No pending action, call step_async() first")
+        if self.__spine_error is not None:
+            return self.__truncate_after_spine_error()
+        t0 = perf_counter()
+        action = self.__pending_action
+        self.__pending_action = None
+        profiler = self.__profiler
+        if profiler is not None:
+            profiler.start()
+
+        try:
+            spine_observation = self._spine.get_observation()
+        except (TimeoutError, VulpSpineError) as exception:
+            self.__recover_spine(exception)
+            return self.__truncate_after_spine_error()
+        if profiler is not None:
+            profiler.lap(3)
         observation = self.get_env_observation(spine_observation)
+        if profiler is not None:
+            profiler.lap(4)
         reward = self.get_reward(observation, action)
+        if profiler is not None:
+            profiler.lap(5)
         terminated = self.detect_fall(spine_observation)
+        if profiler is not None:
+            profiler.lap(6)
+            profiler.next_cycle()
+        if self.__history is not None:
+            self.__history.append(
+                self.vectorize_observation(observation),
+                self.vectorize_action(action),
+                reward,
+                perf_counter(),
+            )
         truncated = False
         info = {"spine_observation": spine_observation}
+        self.__last_observation = observation
+        duration = self.__step_duration + perf_counter() - t0
+        self.__step_latency.update(duration)
         return observation, reward, terminated, truncated, info
 
+    def _step_spine(self, spine_action: dict) -> dict:
+        """!
+        Send a spine action and wait for the next spine observation, without
+        computing the environment observation, reward or termination.
+
+        This is meant for environments that build their spine actions
+        themselves, for instance to send a whole chunk of actions at once.
+        Frequency regulation and logging are the same as in :func:`step`,
+        but the step is not recorded by the step profiler.
+
+        @param spine_action Spine action dictionary.
+        @returns Spine observation after the action.
+        """
+        if self.__regulate_frequency:
+            self.__rate.sleep()  # wait until clock tick to send the action
+        t0 = perf_counter()
+        self.__send_spine_action(spine_action)
+        spine_observation = self._spine.get_observation()
+        self.__step_latency.update(perf_counter() - t0)
+        return spine_observation
+
     def detect_fall(self, spine_observation: dict) -> bool:
         """!
         Detect a fall based on the body-to-world pitch angle.
@@ -228,7 +627,9 @@ class UpkieBaseEnv(abc.ABC, gymnasium.Env):
         @returns True if and only if a fall is detected.
         """
         imu = spine_observation["imu"]
-        pitch = compute_base_pitch_from_imu(imu["orientation"])
+        pitch = compute_base_pitch_from_imu(
+            imu["orientation"], imu_frame=self._imu_frame
+        )
         return abs(pitch) > self.fall_pitch
 
     def parse_first_observation(self, spine_observation: dict) -> None:
@@ -265,10 +666,35 @@ class UpkieBaseEnv(abc.ABC, gymnasium.Env):
         """!
         Convert environment action to a spine action dictionary.
 
+        Implementations may return the same dictionary at every step, updated
+        in place, rather than allocate a new one.
+
         @param action Environment action.
         @returns Spine action dictionary.
         """
 
+    def vectorize_action(self, action) -> NDArray[float]:
+        """!
+        Flatten an environment action into a vector.
+
+        @param action Environment action.
+        @returns Vector of dimension ``spaces.flatdim(action_space)``.
+        """
+        if isinstance(self.action_space, spaces.Box):
+            return np.ravel(action)
+        return spaces.flatten(self.action_space, action)
+
+    def vectorize_observation(self, observation) -> NDArray[float]:
+        """!
+        Flatten an environment observation into a vector.
+
+        @param observation Environment observation.
+        @returns Vector of dimension ``spaces.flatdim(observation_space)``.
+        """
+        if isinstance(self.observation_space, spaces.Box):
+            return np.ravel(observation)
+        return spaces.flatten(self.observation_space, observation)
+
     def log(self, new_log: dict) -> None:
         """!
         Log anything to the action dictionary.
@@ -7,20 +7,24 @@
 
 import math
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Sequence, Tuple
 
 import numpy as np
 from gymnasium import spaces
 from numpy.typing import NDArray
 
 from upkie.observers.base_pitch import (
-    compute_base_angular_velocity_from_imu,
-    compute_base_pitch_from_imu,
+    DEFAULT_IMU_FRAME,
+    ImuFrame,
+    compute_base_pitch_from_quaternion,
+    compute_base_pitches_from_quaternions,
 )
 from upkie.utils.exceptions import UpkieException
 from upkie.utils.filters import low_pass_filter
 from upkie.utils.robot_state import RobotState
+from upkie.utils.spine_log import read_spine_log
 
+from .observation_schema import ObservationSchema
 from .upkie_base_env import UpkieBaseEnv
 
 
@@ -58,7 +62,7 @@ class UpkieGroundVelocity(UpkieBaseEnv):
 
     ### Observation space
 
-    Vectorized observations have the following structure:
+    By default, vectorized observations have the following structure:
 
     <table>
         <tr>
@@ -86,15 +90,78 @@ class UpkieGroundVelocity(UpkieBaseEnv):
         </tr>
     </table>
 
+    Observations can be configured by passing a list of features to the
+    constructor. They are then concatenated in the order of this list, with
+    the following features available:
+
+    <table>
+        <tr>
+            <td><strong>Feature</strong></td>
+            <td><strong>Dimension</strong></td>
+            <td><strong>Description</strong></td>
+        </tr>
+        <tr>
+            <td>``base_pitch``</td>
+            <td>1</td>
+            <td>Default observation 0.</td>
+        </tr>
+        <tr>
+            <td>``ground_position``</td>
+            <td>1</td>
+            <td>Default observation 1.</td>
+        </tr>
+        <tr>
+            <td>``base_angular_velocity``</td>
+            <td>1</td>
+            <td>Default observation 2.</td>
+        </tr>
+        <tr>
+            <td>``ground_velocity``</td>
+            <td>1</td>
+            <td>Default observation 3.</td>
+        </tr>
+        <tr>
+            <td>``base_yaw_rate``</td>
+            <td>1</td>
+            <td>Body angular velocity of the base frame along its vertical
+            axis, in radians per seconds.</td>
+        </tr>
+        <tr>
+            <td>``floor_contact``</td>
+            <td>1</td>
+            <td>One if the robot touches the floor, zero otherwise.</td>
+        </tr>
+        <tr>
+            <td>``leg_positions``</td>
+            <td>4</td>
+            <td>Angles of the left hip, left knee, right hip and right knee
+            joints, in radians.</td>
+        </tr>
+        <tr>
+            <td>``rate_slack``</td>
+            <td>1</td>
+            <td>Slack of the last loop frequency regulation, in seconds.</td>
+        </tr>
+    </table>
+
     ### Attributes
 
     The environment class defines the following attributes:
 
+    - ``observation_features``: Features of observation vectors.
+    - ``observation_schema``: Fields of the spine observation read by the
+        environment at every step.
     - ``leg_return_period``: Time constant for the legs (hips and knees) to
         revert to their neutral configuration.
     - ``version``: Environment version number.
     - ``wheel_radius``: Wheel radius in [m].
 
+    ### Fused step computations
+
+    At each step, the observation, the reward and the pitch angle used for
+    fall detection are computed together by :func:`get_env_observation`, with
+    closed-form scalar operations rather than rotation matrices. The reward of
+    this observation and its fall detection then reuse these results.
     """
 
     LEG_JOINTS = [
@@ -103,6 +170,43 @@ class UpkieGroundVelocity(UpkieBaseEnv):
         for joint in ("hip", "knee")
     ]
 
+    OBSERVATION_SCHEMA = ObservationSchema(
+        [
+            (("imu", "orientation"), 4),
+            (("imu", "angular_velocity"), 3),
+            (("wheel_odometry", "position"), 1),
+            (("wheel_odometry", "velocity"), 1),
+        ]
+    )
+
+    ## Features of default observation vectors.
+    DEFAULT_FEATURES: Tuple[str, ...] = (
+        "base_pitch",
+        "ground_position",
+        "base_angular_velocity",
+        "ground_velocity",
+    )
+
+    ## Features computed at every step, in their order in the source vector.
+    COMPUTED_FEATURES: Tuple[str, ...] = DEFAULT_FEATURES + (
+        "base_yaw_rate",
+        "rate_slack",
+    )
+
+    ## Spine observation fields read by features that are not computed.
+    SPINE_FEATURES: Dict[str, Tuple[Tuple[str, ...], ...]] = {
+        "floor_contact": (("floor_contact", "contact"),),
+        "leg_positions": tuple(
+            ("servo", joint, "position") for joint in LEG_JOINTS
+        ),
+    }
+
+    ## Height of the virtual tip used in the reward, in meters.
+    TIP_HEIGHT: float = 0.58
+
+    ## Standard deviation of the tip position in the reward, in meters.
+    TIP_POSITION_STD: float = 0.05
+
     @dataclass
     class RewardWeights:
         position: float = 1.0
@@ -113,40 +217,71 @@ class UpkieGroundVelocity(UpkieBaseEnv):
 
     def __init__(
         self,
+        delta_actions: bool = False,
         fall_pitch: float = 1.0,
         frequency: float = 200.0,
+        history_size: int = 0,
         init_state: Optional[RobotState] = None,
         leg_return_period: float = 1.0,
+        log_step_profile: bool = False,
         max_ground_velocity: float = 1.0,
+        observation_features: Optional[Sequence[str]] = None,
+        profile_steps: bool = False,
+        rate_spin_duration: float = 0.0,
         regulate_frequency: bool = True,
         reward_weights: Optional[RewardWeights] = None,
         shm_name: str = "/vulp",
+        soft_reset: bool = False,
         spine_config: Optional[dict] = None,
         wheel_radius: float = 0.06,
     ):
         """!
         Initialize environment.
 
+        @param delta_actions If set, only send to the spine the action fields
+            that changed since the previous step.
         @param fall_pitch Fall detection pitch angle, in radians.
         @param frequency Regulated frequency of the control loop, in Hz.
+        @param history_size If positive, keep the last ``history_size``
+            vectorized observations, actions, rewards and timestamps in a
+            preallocated ring buffer.
         @param init_state Initial state of the robot, only used in simulation.
         @param leg_return_period Time constant for the legs (hips and knees) to
             revert to their neutral configuration.
+        @param log_step_profile If set, log the durations of the phases of the
+            last step to the ``env`` section of spine actions.
         @param max_ground_velocity Maximum commanded ground velocity in m/s.
+        @param observation_features Features of observation vectors, see
+            the class documentation. Defaults to ``DEFAULT_FEATURES``.
+        @param profile_steps If set, measure the durations of each phase of
+            :func:`step`.
+        @param rate_spin_duration Duration before each clock tick, in seconds,
+            during which loop frequency regulation busy-waits rather than
+            sleeps.
         @param regulate_frequency Enables loop frequency regulation.
         @param reward_weights Coefficients before each reward term.
         @param shm_name Name of shared-memory file.
+        @param soft_reset If set, resets after the first one re-teleport the
+            simulated robot without restarting the spine (Bullet spine only).
         @param spine_config Additional spine configuration overriding the
             defaults from ``//config:spine.yaml``. The combined configuration
             dictionary is sent to the spine at every :func:`reset`.
         @param wheel_radius Wheel radius in [m].
+        @raise UpkieException If an observation feature is unknown or listed
+            twice.
         """
         super().__init__(
+            delta_actions=delta_actions,
             fall_pitch=fall_pitch,
             frequency=frequency,
+            history_size=history_size,
             init_state=init_state,
+            log_step_profile=log_step_profile,
+            profile_steps=profile_steps,
+            rate_spin_duration=rate_spin_duration,
             regulate_frequency=regulate_frequency,
             shm_name=shm_name,
+            soft_reset=soft_reset,
             spine_config=spine_config,
         )
 
@@ -163,20 +298,58 @@ class UpkieGroundVelocity(UpkieBaseEnv):
         MAX_BASE_PITCH: float = np.pi
         MAX_GROUND_POSITION: float = float("inf")
         MAX_BASE_ANGULAR_VELOCITY: float = 1000.0  # rad/s
-        observation_limit = np.array(
-            [
-                MAX_BASE_PITCH,
-                MAX_GROUND_POSITION,
-                MAX_BASE_ANGULAR_VELOCITY,
-                max_ground_velocity,
-            ],
-            dtype=float,
+        feature_limits = {
+            "base_pitch": ([-MAX_BASE_PITCH], [MAX_BASE_PITCH]),
+            "ground_position": ([-MAX_GROUND_POSITION], [MAX_GROUND_POSITION]),
+            "base_angular_velocity": (
+                [-MAX_BASE_ANGULAR_VELOCITY],
+                [MAX_BASE_ANGULAR_VELOCITY],
+            ),
+            "ground_velocity": ([-max_ground_velocity], [max_ground_velocity]),
+            "base_yaw_rate": (
+                [-MAX_BASE_ANGULAR_VELOCITY],
+                [MAX_BASE_ANGULAR_VELOCITY],
+            ),
+            "floor_contact": ([0.0], [1.0]),
+            "leg_positions": ([-np.inf] * 4, [np.inf] * 4),
+            "rate_slack": ([-np.inf], [np.inf]),
+        }
+        features = tuple(
+            observation_features
+            if observation_features is not None
+            else self.DEFAULT_FEATURES
         )
+        for feature in features:
+            if feature not in feature_limits:
+                raise UpkieException(f"Unknown observation {feature=}")
+            if features.count(feature) > 1:
+                raise UpkieException(f"Observation {feature=} listed twice")
+
+        # Compile extraction plan: observations are gathered at every step
+        # from a source vector, made of computed features followed by the
+        # fields extracted from the spine observation
+        schema_fields = list(self.OBSERVATION_SCHEMA.fields)
+        for feature in features:
+            for keys in self.SPINE_FEATURES.get(feature, ()):
+                schema_fields.append((keys, 1))
+        schema = ObservationSchema(schema_fields)
+        nb_computed = len(self.COMPUTED_FEATURES)
+        feature_indices = []
+        for feature in features:
+            if feature in self.SPINE_FEATURES:
+                feature_indices.extend(
+                    nb_computed + schema.index(*keys)
+                    for keys in self.SPINE_FEATURES[feature]
+                )
+            else:  # computed feature
+                feature_indices.append(self.COMPUTED_FEATURES.index(feature))
+        observation_low = np.hstack([feature_limits[f][0] for f in features])
+        observation_high = np.hstack([feature_limits[f][1] for f in features])
         self.observation_space = spaces.Box(
-            -observation_limit,
-            +observation_limit,
-            shape=observation_limit.shape,
-            dtype=observation_limit.dtype,
+            observation_low.astype(float),
+            observation_high.astype(float),
+            shape=observation_low.shape,
+            dtype=float,
         )
 
         # gymnasium.Env: action_space
@@ -196,8 +369,52 @@ class UpkieGroundVelocity(UpkieBaseEnv):
             }
             for joint in self.LEG_JOINTS
         }
+        self.__spine_action = {
+            "servo": {
+                **self.__leg_servo_action,
+                "left_wheel": {
+                    "position": math.nan,
+                    "velocity": 0.0,
+                    "maximum_torque": 1.0,  # mj5208 actuator
+                },
+                "right_wheel": {
+                    "position": math.nan,
+                    "velocity": 0.0,
+                    "maximum_torque": 1.0,  # mj5208 actuator
+                },
+            }
+        }
+
+        self.__ground_position_offset = 0.0
+        angular_velocity_index = schema.index("imu", "angular_velocity")
+        self.__angular_velocity_index = angular_velocity_index.start + 1
+        self.__yaw_rate_index = angular_velocity_index.start + 2
+        self.__ground_position_index = schema.index(
+            "wheel_odometry", "position"
+        )
+        self.__ground_velocity_index = schema.index(
+            "wheel_odometry", "velocity"
+        )
+        self.__last_observation = None
+        self.__last_pitch = 0.0
+        self.__last_reward = 0.0
+        self.__last_spine_observation = None
+        self.__feature_indices = np.array(feature_indices, dtype=int)
+        self.__orientation_index = schema.index("imu", "orientation").start
+        self.__reward_indices = (
+            tuple(
+                feature_indices.index(self.COMPUTED_FEATURES.index(feature))
+                for feature in self.DEFAULT_FEATURES
+            )
+            if set(self.DEFAULT_FEATURES) <= set(features)
+            else None
+        )
+        self.__sources = np.zeros(nb_computed + schema.size)
+        self.__spine_fields = self.__sources[nb_computed:]
 
         self.leg_return_period = leg_return_period
+        self.observation_features = features
+        self.observation_schema = schema
         self.reward_weights = reward_weights
         self.wheel_radius = wheel_radius
 
@@ -226,7 +443,15 @@ class UpkieGroundVelocity(UpkieBaseEnv):
         Parse first observation after the spine interface is initialized.
 
         @param spine_observation First observation.
+
+        Wheel odometry is not reset by soft resets, so that in this case the
+        ground position is measured from its value at reset.
         """
+        self.__ground_position_offset = (
+            spine_observation["wheel_odometry"]["position"]
+            if self.soft_reset
+            else 0.0
+        )
         for joint in self.LEG_JOINTS:
             position = spine_observation["servo"][joint]["position"]
             self.__leg_servo_action[joint]["position"] = position
@@ -235,30 +460,70 @@ class UpkieGroundVelocity(UpkieBaseEnv):
         """!
         Extract environment observation from spine observation dictionary.
 
+        The reward of this observation and the base pitch for fall detection
+        are computed in the same pass, see :func:`get_reward` and
+        :func:`detect_fall`.
+
         @param spine_observation Spine observation dictionary.
         @returns Environment observation vector.
         """
-        imu = spine_observation["imu"]
-        pitch_base_in_world = compute_base_pitch_from_imu(imu["orientation"])
-        angular_velocity_base_in_base = compute_base_angular_velocity_from_imu(
-            spine_observation["imu"]["angular_velocity"]
+        fields = self.observation_schema.extract(
+            spine_observation, self.__spine_fields
+        ).tolist()
+
+        i = self.__orientation_index
+        imu_frame = self._imu_frame
+        pitch = compute_base_pitch_from_quaternion(
+            fields[i : i + 4], imu_frame
+        )
+        if imu_frame.is_default:
+            # Rotation from the IMU frame to the base frame is
+            # diag(-1, 1, -1), see compute_base_angular_velocity_from_imu
+            angular_velocity = fields[self.__angular_velocity_index]
+            yaw_rate = -fields[self.__yaw_rate_index]
+        else:  # robot with a different IMU mounting
+            j = self.__angular_velocity_index - 1
+            _, angular_velocity, yaw_rate = (
+                imu_frame.rotation_imu_to_base @ fields[j : j + 3]
+            ).tolist()
+
+        ground_position = (
+            fields[self.__ground_position_index]
+            - self.__ground_position_offset
         )
-        ground_position = spine_observation["wheel_odometry"]["position"]
-        ground_velocity = spine_observation["wheel_odometry"]["velocity"]
+        ground_velocity = fields[self.__ground_velocity_index]
+        self.__sources[: len(self.COMPUTED_FEATURES)] = (
+            pitch,
+            ground_position,
+            angular_velocity,
+            ground_velocity,
+            yaw_rate,
+            self.rate_slack,
+        )
+        # Fancy indexing returns a new array, as callers may keep past
+        # observations
+        observation = self.__sources[self.__feature_indices]
 
-        obs = np.empty(4, dtype=float)
-        obs[0] = pitch_base_in_world
-        obs[1] = ground_position
-        obs[2] = angular_velocity_base_in_base[1]
-        obs[3] = ground_velocity
-        return obs
+        tip_position = ground_position + self.TIP_HEIGHT * math.sin(pitch)
+        tip_velocity = (
+            ground_velocity
+            + self.TIP_HEIGHT * angular_velocity * math.cos(pitch)
+        )
+        position_reward = math.exp(
+            -((tip_position / self.TIP_POSITION_STD) ** 2)
+        )
+        velocity_penalty = -abs(tip_velocity)
+        self.__last_reward = (
+            self.reward_weights.position * position_reward
+            + self.reward_weights.velocity * velocity_penalty
+        )
 
-    def get_leg_servo_action(self) -> Dict[str, Dict[str, float]]:
-        """!
-        Get servo actions for both hip and knee joints.
+        self.__last_observation = observation
+        self.__last_pitch = pitch
+        self.__last_spine_observation = spine_observation
+        return observation
 
-        @returns Servo action dictionary.
-        """
+    def __update_leg_servo_action(self) -> None:
         for joint in self.LEG_JOINTS:
             prev_position = self.__leg_servo_action[joint]["position"]
             new_position = low_pass_filter(
@@ -268,6 +533,14 @@ class UpkieGroundVelocity(UpkieBaseEnv):
                 dt=self.dt,
             )
             self.__leg_servo_action[joint]["position"] = new_position
+
+    def get_leg_servo_action(self) -> Dict[str, Dict[str, float]]:
+        """!
+        Get servo actions for both hip and knee joints.
+
+        @returns Servo action dictionary.
+        """
+        self.__update_leg_servo_action()
         return self.__leg_servo_action.copy()
 
     def get_spine_action(self, action: NDArray[float]) -> dict:
@@ -275,27 +548,16 @@ class UpkieGroundVelocity(UpkieBaseEnv):
         Convert environment action to a spine action dictionary.
 
         @param action Environment action.
-        @returns Spine action dictionary.
+        @returns Spine action dictionary. It is the same dictionary at every
+            step, updated in place.
         """
-        ground_velocity = action[0]
+        ground_velocity = float(action[0])
         wheel_velocity = ground_velocity / self.wheel_radius
-        servo_dict = self.get_leg_servo_action()
-        servo_dict.update(
-            {
-                "left_wheel": {
-                    "position": math.nan,
-                    "velocity": +wheel_velocity,
-                    "maximum_torque": 1.0,  # mj5208 actuator
-                },
-                "right_wheel": {
-                    "position": math.nan,
-                    "velocity": -wheel_velocity,
-                    "maximum_torque": 1.0,  # mj5208 actuator
-                },
-            }
-        )
-        spine_action = {"servo": servo_dict}
-        return spine_action
+        self.__update_leg_servo_action()
+        servo_action = self.__spine_action["servo"]
+        servo_action["left_wheel"]["velocity"] = +wheel_velocity
+        servo_action["right_wheel"]["velocity"] = -wheel_velocity
+        return self.__spine_action
 
     def get_reward(
         self,
@@ -308,19 +570,34 @@ class UpkieGroundVelocity(UpkieBaseEnv):
         @param observation Environment observation vector.
         @param action Environment action vector.
         @returns Reward.
-        """
-        pitch = observation[0]
-        ground_position = observation[1]
-        angular_velocity = observation[2]
-        ground_velocity = observation[3]
+        @raise UpkieException If observations don't include all default
+            features, and the observation is not the last one returned by
+            :func:`get_env_observation`.
 
-        tip_height = 0.58  # [m]
+        The reward of the last observation returned by
+        :func:`get_env_observation` was already computed there and is not
+        recomputed.
+        """
+        if observation is self.__last_observation:
+            return self.__last_reward
+        if self.__reward_indices is None:
+            raise UpkieException(
+                "Reward needs the default features in the observation"
+            )
+        (
+            pitch,
+            ground_position,
+            angular_velocity,
+            ground_velocity,
+        ) = (observation[i] for i in self.__reward_indices)
+
+        tip_height = self.TIP_HEIGHT
         tip_position = ground_position + tip_height * np.sin(pitch)
         tip_velocity = (
             ground_velocity + tip_height * angular_velocity * np.cos(pitch)
         )
 
-        std_position = 0.05  # [m]
+        std_position = self.TIP_POSITION_STD
         position_reward = np.exp(-((tip_position / std_position) ** 2))
         velocity_penalty = -abs(tip_velocity)
 
@@ -328,3 +605,131 @@ class UpkieGroundVelocity(UpkieBaseEnv):
             self.reward_weights.position * position_reward
             + self.reward_weights.velocity * velocity_penalty
         )
+
+    @classmethod
+    def get_batch_rewards(
+        cls,
+        observations: NDArray[float],
+        actions: NDArray[float],
+        reward_weights: Sequence["UpkieGroundVelocity.RewardWeights"],
+    ) -> NDArray[float]:
+        """!
+        Compute the rewards of a trajectory under several reward weights.
+
+        This is the vectorized counterpart of :func:`get_reward`, for instance
+        to re-score trajectories loaded by :func:`load_spine_log`.
+
+        @param observations Array of shape ``(T, 4)`` of observation vectors.
+        @param actions Array of shape ``(T, 1)`` of action vectors.
+        @param reward_weights Sequence of ``W`` reward weights.
+        @returns Array of shape ``(W, T)`` of rewards.
+        @raise UpkieException If array shapes are inconsistent.
+        """
+        observations = np.asarray(observations, dtype=float)
+        if observations.ndim != 2 or observations.shape[1] != 4:
+            raise UpkieException(
+                f"Observations have shape {observations.shape} "
+                "but should be (T, 4)"
+            )
+        if len(actions) != len(observations):
+            raise UpkieException(
+                f"Got {len(actions)} actions for "
+                f"{len(observations)} observations"
+            )
+        pitch = observations[:, 0]
+        ground_position = observations[:, 1]
+        angular_velocity = observations[:, 2]
+        ground_velocity = observations[:, 3]
+
+        tip_height = cls.TIP_HEIGHT
+        tip_position = ground_position + tip_height * np.sin(pitch)
+        tip_velocity = (
+            ground_velocity + tip_height * angular_velocity * np.cos(pitch)
+        )
+
+        std_position = cls.TIP_POSITION_STD
+        position_reward = np.exp(-((tip_position / std_position) ** 2))
+        velocity_penalty = -np.abs(tip_velocity)
+
+        weights = np.array(
+            [[w.position, w.velocity] for w in reward_weights]
+        ).reshape(-1, 2)
+        return (
+            weights[:, 0:1] * position_reward
+            + weights[:, 1:2] * velocity_penalty
+        )
+
+    @classmethod
+    def load_spine_log(
+        cls,
+        path: str,
+        imu_frame: Optional[ImuFrame] = None,
+        wheel_radius: float = 0.06,
+    ) -> Tuple[NDArray[float], NDArray[float]]:
+        """!
+        Load observations and actions of this environment from a spine log.
+
+        Spines log one entry per spine cycle, so that there are usually
+        several entries per environment step. Entries without IMU, wheel
+        odometry or wheel velocity commands are skipped. Ground positions are
+        those of the wheel odometry, without the offset subtracted after soft
+        resets.
+
+        @param path Path to the spine log file.
+        @param imu_frame IMU frame of the robot that produced the log, for
+            instance ``ImuFrame.from_config(spine_config)``. When not
+            specified, the default Upkie mounting orientation is used.
+        @param wheel_radius Wheel radius in [m].
+        @returns Pair ``(observations, actions)`` of arrays with shapes
+            ``(T, 4)`` and ``(T, 1)``.
+        """
+        if imu_frame is None:
+            imu_frame = DEFAULT_IMU_FRAME
+        schema = cls.OBSERVATION_SCHEMA
+        fields = []
+        wheel_velocities = []
+        for entry in read_spine_log(path):
+            try:
+                entry_fields = schema.extract(
+                    entry["observation"], schema.allocate()
+                )
+                servo_action = entry["action"]["servo"]
+                wheel_velocity = servo_action["left_wheel"]["velocity"]
+            except KeyError:  # spine not started or no action yet
+                continue
+            fields.append(entry_fields)
+            wheel_velocities.append(wheel_velocity)
+        fields = np.array(fields, dtype=float).reshape(-1, schema.size)
+
+        pitch = compute_base_pitches_from_quaternions(
+            fields[:, schema.index("imu", "orientation")], imu_frame
+        )
+        angular_velocity = (
+            fields[:, schema.index("imu", "angular_velocity")]
+            @ imu_frame.rotation_imu_to_base.T
+        )
+        observations = np.column_stack(
+            [
+                pitch,
+                fields[:, schema.index("wheel_odometry", "position")],
+                angular_velocity[:, 1],
+                fields[:, schema.index("wheel_odometry", "velocity")],
+            ]
+        )
+        actions = wheel_radius * np.array(wheel_velocities, dtype=float)
+        return observations, actions.reshape(-1, 1)
+
+    def detect_fall(self, spine_observation: dict) -> bool:
+        """!
+        Detect a fall based on the body-to-world pitch angle.
+
+        @param spine_observation Observation dictionary with an "imu" key.
+        @returns True if and only if a fall is detected.
+
+        The pitch of the spine observation last passed to
+        :func:`get_env_observation` is not recomputed.
+        """
+        if spine_observation is not self.__last_spine_observation:
+            return super().detect_fall(spine_observation)
+        self.__last_spine_observation = None  # dictionary may be updated
+        return abs(self.__last_pitch) > self.fall_pitch
@@ -4,22 +4,20 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright 2023 Inria
 
+from time import perf_counter
 from typing import Optional, Tuple
 
 import numpy as np
-import pinocchio as pin
-import upkie_description
 from gymnasium import spaces
+from numpy.typing import NDArray
 
-from upkie.utils.clamp import clamp_and_warn
-from upkie.utils.exceptions import ModelError
-from upkie.utils.pinocchio import (
-    box_position_limits,
-    box_torque_limits,
-    box_velocity_limits,
-)
+from upkie.utils.exceptions import ModelError, UpkieException
+from upkie.utils.pinocchio import get_robot_limits, load_robot_model
 from upkie.utils.robot_state import RobotState
+from upkie.utils.spdlog import logging
 
+from .observation_schema import ObservationSchema, list_observation_fields
+from .servo_kinematics import ServoKinematics
 from .upkie_base_env import UpkieBaseEnv
 
 
@@ -55,11 +53,24 @@ class UpkieServos(UpkieBaseEnv):
     Obversations from this environment are full dictionary reported by the
     spine. See @ref observations.
 
+    With ``flat_observation=True``, observations are instead vectors, equal to
+    the dictionary observation flattened by ``gymnasium.spaces.flatten``:
+    IMU angular velocity, linear acceleration and orientation, then the
+    position, temperature, torque, velocity and voltage of each servo in
+    alphabetical order, then wheel odometry position and velocity. The index
+    of each field is given by the ``observation_schema`` attribute.
+
     ### Attributes
 
     The environment has the following attributes:
 
-    - ``robot``: Pinocchio robot wrapper.
+    - ``kinematics``: Kinematic quantities such as wheel contact positions,
+        wheel distance and base height, computed from the last observation
+        only when they are accessed.
+    - ``observation_schema``: Schema of flat observations, or ``None`` if
+        observations are dictionaries.
+    - ``robot``: Pinocchio robot wrapper, loaded upon first access and
+        shared by all environments in the process.
     - ``version``: Environment version number.
     """
 
@@ -72,6 +83,8 @@ class UpkieServos(UpkieBaseEnv):
         "maximum_torque",
     )
 
+    CHUNK_WAIT_MARGIN: int = 10
+
     JOINT_NAMES: Tuple[str, str, str, str, str, str] = (
         "left_hip",
         "left_knee",
@@ -81,45 +94,76 @@ class UpkieServos(UpkieBaseEnv):
         "right_wheel",
     )
 
-    robot: pin.RobotWrapper
+    kinematics: ServoKinematics
+    observation_schema: Optional[ObservationSchema]
     version: int = 3
 
     def __init__(
         self,
+        delta_actions: bool = False,
         fall_pitch: float = 1.0,
+        flat_observation: bool = False,
         frequency: float = 200.0,
+        history_size: int = 0,
         init_state: Optional[RobotState] = None,
+        log_step_profile: bool = False,
+        model_cache_dir: Optional[str] = None,
+        profile_steps: bool = False,
+        rate_spin_duration: float = 0.0,
         regulate_frequency: bool = True,
         shm_name: str = "/vulp",
+        soft_reset: bool = False,
         spine_config: Optional[dict] = None,
     ):
         """!
         Initialize environment.
 
+        @param delta_actions If set, only send to the spine the action fields
+            that changed since the previous step.
         @param fall_pitch Fall pitch angle, in radians.
+        @param flat_observation If set, observations are flat vectors rather
+            than dictionaries, and the observation space is the flattened
+            dictionary observation space.
         @param frequency Regulated frequency of the control loop, in Hz.
+        @param history_size If positive, keep the last ``history_size``
+            vectorized observations, actions, rewards and timestamps in a
+            preallocated ring buffer.
         @param init_state Initial state of the robot, only used in simulation.
+        @param log_step_profile If set, log the durations of the phases of the
+            last step to the ``env`` section of spine actions.
+        @param model_cache_dir Optional directory where joint limits from the
+            robot description are persisted, so that environments constructed
+            in later processes don't load the description.
+        @param profile_steps If set, measure the durations of each phase of
+            :func:`step`.
+        @param rate_spin_duration Duration before each clock tick, in seconds,
+            during which loop frequency regulation busy-waits rather than
+            sleeps.
         @param regulate_frequency Enables loop frequency regulation.
         @param shm_name Name of shared-memory file.
+        @param soft_reset If set, resets after the first one re-teleport the
+            simulated robot without restarting the spine (Bullet spine only).
         @param spine_config Additional spine configuration overriding the
             defaults from ``//config:spine.yaml``. The combined configuration
             dictionary is sent to the spine at every :func:`reset`.
         """
         super().__init__(
+            delta_actions=delta_actions,
             fall_pitch=fall_pitch,
             frequency=frequency,
+            history_size=history_size,
             init_state=init_state,
+            log_step_profile=log_step_profile,
+            profile_steps=profile_steps,
+            rate_spin_duration=rate_spin_duration,
             regulate_frequency=regulate_frequency,
             shm_name=shm_name,
+            soft_reset=soft_reset,
             spine_config=spine_config,
         )
 
-        robot = upkie_description.load_in_pinocchio(root_joint=None)
-        model = robot.model
-        q_min, q_max = box_position_limits(model)
-        v_max = box_velocity_limits(model)
-        tau_max = box_torque_limits(model)
-        joint_names = list(model.names)[1:]
+        limits = get_robot_limits(cache_dir=model_cache_dir)
+        joint_names = limits.joint_names
         if set(joint_names) != set(self.JOINT_NAMES):
             raise ModelError(
                 "Upkie joints don't match:"
@@ -132,25 +176,28 @@ class UpkieServos(UpkieBaseEnv):
         max_action = {}
         min_action = {}
         servo_space = {}
-        for name in joint_names:
-            joint = model.joints[model.getJointId(name)]
+        for i, name in enumerate(joint_names):
+            q_min = float(limits.q_min[i])
+            q_max = float(limits.q_max[i])
+            v_max = float(limits.v_max[i])
+            tau_max = float(limits.tau_max[i])
             action_space[name] = spaces.Dict(
                 {
                     "position": spaces.Box(
-                        low=q_min[joint.idx_q],
-                        high=q_max[joint.idx_q],
+                        low=q_min,
+                        high=q_max,
                         shape=(1,),
                         dtype=float,
                     ),
                     "velocity": spaces.Box(
-                        low=-v_max[joint.idx_v],
-                        high=+v_max[joint.idx_v],
+                        low=-v_max,
+                        high=+v_max,
                         shape=(1,),
                         dtype=float,
                     ),
                     "feedforward_torque": spaces.Box(
-                        low=-tau_max[joint.idx_v],
-                        high=+tau_max[joint.idx_v],
+                        low=-tau_max,
+                        high=+tau_max,
                         shape=(1,),
                         dtype=float,
                     ),
@@ -168,7 +215,7 @@ class UpkieServos(UpkieBaseEnv):
                     ),
                     "maximum_torque": spaces.Box(
                         low=0.0,
-                        high=tau_max[joint.idx_v],
+                        high=tau_max,
                         shape=(1,),
                         dtype=float,
                     ),
@@ -177,20 +224,20 @@ class UpkieServos(UpkieBaseEnv):
             servo_space[name] = spaces.Dict(
                 {
                     "position": spaces.Box(
-                        low=q_min[joint.idx_q],
-                        high=q_max[joint.idx_q],
+                        low=q_min,
+                        high=q_max,
                         shape=(1,),
                         dtype=float,
                     ),
                     "velocity": spaces.Box(
-                        low=-v_max[joint.idx_v],
-                        high=+v_max[joint.idx_v],
+                        low=-v_max,
+                        high=+v_max,
                         shape=(1,),
                         dtype=float,
                     ),
                     "torque": spaces.Box(
-                        low=-tau_max[joint.idx_v],
-                        high=+tau_max[joint.idx_v],
+                        low=-tau_max,
+                        high=+tau_max,
                         shape=(1,),
                         dtype=float,
                     ),
@@ -214,20 +261,20 @@ class UpkieServos(UpkieBaseEnv):
                 "feedforward_torque": 0.0,
                 "kp_scale": 1.0,
                 "kd_scale": 1.0,
-                "maximum_torque": tau_max[joint.idx_v],
+                "maximum_torque": tau_max,
             }
             max_action[name] = {
-                "position": q_max[joint.idx_q],
-                "velocity": v_max[joint.idx_v],
-                "feedforward_torque": tau_max[joint.idx_v],
+                "position": q_max,
+                "velocity": v_max,
+                "feedforward_torque": tau_max,
                 "kp_scale": 1.0,
                 "kd_scale": 1.0,
-                "maximum_torque": tau_max[joint.idx_v],
+                "maximum_torque": tau_max,
             }
             min_action[name] = {
-                "position": q_min[joint.idx_q],
-                "velocity": -v_max[joint.idx_v],
-                "feedforward_torque": -tau_max[joint.idx_v],
+                "position": q_min,
+                "velocity": -v_max,
+                "feedforward_torque": -tau_max,
                 "kp_scale": 0.0,
                 "kd_scale": 0.0,
                 "maximum_torque": 0.0,
@@ -281,11 +328,58 @@ class UpkieServos(UpkieBaseEnv):
             }
         )
 
+        # Flat observation mode
+        observation_schema = None
+        if flat_observation:
+            observation_schema = ObservationSchema(
+                list_observation_fields(self.observation_space)
+            )
+            self.__flat_observation = observation_schema.allocate()
+            self.observation_space = spaces.flatten_space(
+                self.observation_space
+            )
+
         # Class members
+        self.__chunk_id = 0
+        self.__chunk_schema = None
         self.__neutral_action = neutral_action
-        self.__max_action = max_action
-        self.__min_action = min_action
-        self.robot = robot
+        self.__plays_chunks = False
+        self.__spine_action = {
+            "servo": {
+                joint: dict(neutral_action[joint]) for joint in joint_names
+            }
+        }
+
+        # Action arrays with rows ordered as JOINT_NAMES and columns as
+        # ACTION_KEYS
+        def to_array(action: dict) -> NDArray[float]:
+            return np.array(
+                [
+                    [action[joint][key] for key in self.ACTION_KEYS]
+                    for joint in self.JOINT_NAMES
+                ],
+                dtype=float,
+            )
+
+        self.__action_array = to_array(neutral_action)
+        self.__clamped_array = to_array(neutral_action)
+        self.__action_key_index = {
+            key: j for j, key in enumerate(self.ACTION_KEYS)
+        }
+        self.__max_action_array = to_array(max_action)
+        self.__min_action_array = to_array(min_action)
+        self.__neutral_action_array = to_array(neutral_action)
+        self.kinematics = ServoKinematics()
+        self.observation_schema = observation_schema
+
+    @property
+    def robot(self):
+        """!
+        Pinocchio robot wrapper, loaded upon first access.
+
+        @returns Robot wrapper shared by all environments in the process.
+        """
+        return load_robot_model()
 
     def get_neutral_action(self) -> dict:
         """!
@@ -302,8 +396,12 @@ class UpkieServos(UpkieBaseEnv):
         @param spine_observation Full observation dictionary from the spine.
         @returns Environment observation.
         """
-        # If creating a new object turns out to be too slow we can switch to
-        # updating in-place.
+        self.kinematics.update(spine_observation["servo"])
+        if self.observation_schema is not None:
+            flat_observation = self.observation_schema.extract(
+                spine_observation, self.__flat_observation
+            )
+            return flat_observation.copy()  # callers may keep observations
         return {
             "imu": {
                 "angular_velocity": np.array(
@@ -329,30 +427,250 @@ class UpkieServos(UpkieBaseEnv):
             },
         }
 
-    def get_spine_action(self, env_action: dict) -> dict:
+    def action_to_array(
+        self, env_action: dict, out: Optional[NDArray[float]] = None
+    ) -> NDArray[float]:
+        """!
+        Convert a dictionary action to an action array.
+
+        @param env_action Environment action dictionary. Servo action keys
+            missing from it are taken from the neutral action, and keys that
+            are not in ``ACTION_KEYS`` are ignored.
+        @param out Optional output array of shape ``(6, 6)``.
+        @returns Action array of shape ``(6, 6)``, with rows ordered as
+            ``JOINT_NAMES`` and columns as ``ACTION_KEYS``.
+        """
+        if out is None:
+            out = np.empty((len(self.JOINT_NAMES), len(self.ACTION_KEYS)))
+        out[:] = self.__neutral_action_array
+        key_index = self.__action_key_index
+        for i, joint in enumerate(self.JOINT_NAMES):
+            for key, value in env_action[joint].items():
+                j = key_index.get(key)
+                if j is None:  # not a servo action key
+                    continue
+                if isinstance(value, float):
+                    out[i, j] = value
+                else:  # value may also be an array of shape (1,)
+                    out[i, j : j + 1] = value
+        return out
+
+    def get_neutral_action_array(self) -> NDArray[float]:
+        """!
+        Get the neutral action where servos don't move, as an action array.
+
+        @returns Action array of shape ``(6, 6)``, with rows ordered as
+            ``JOINT_NAMES`` and columns as ``ACTION_KEYS``.
+        """
+        return self.__neutral_action_array.copy()
+
+    def get_spine_action(self, env_action) -> dict:
         """!
         Convert environment action to a spine action dictionary.
 
-        @param env_action Environment action.
-        @returns Spine action dictionary.
+        @param env_action Environment action, either a dictionary from the
+            action space or an action array of shape ``(6, 6)`` with rows
+            ordered as ``JOINT_NAMES`` and columns as ``ACTION_KEYS``.
+        @returns Spine action dictionary. It is the same dictionary at every
+            step, updated in place.
         """
-        spine_action = {"servo": {}}
-        for joint in self.JOINT_NAMES:
-            servo_action = {}
-            for key in self.ACTION_KEYS:
-                action = (
-                    env_action[joint][key]
-                    if key in env_action[joint]
-                    else self.__neutral_action[joint][key]
+        if isinstance(env_action, dict):
+            env_action = self.action_to_array(env_action, self.__action_array)
+        return self.get_spine_action_from_array(env_action)
+
+    def get_spine_action_from_array(
+        self, action_array: NDArray[float]
+    ) -> dict:
+        """!
+        Convert an action array to a spine action dictionary.
+
+        Actions are clamped to their limits in a single operation, with a
+        warning for each clamped value. Position NaNs are left as is.
+
+        @param action_array Action array of shape ``(6, 6)``, with rows ordered
+            as ``JOINT_NAMES`` and columns as ``ACTION_KEYS``.
+        @returns Spine action dictionary. It is the same dictionary at every
+            step, updated in place.
+        """
+        clamped = self.__clamp_action_array(action_array)
+        servo_action = self.__spine_action["servo"]
+        for joint, values in zip(self.JOINT_NAMES, clamped.tolist()):
+            servo_action[joint].update(zip(self.ACTION_KEYS, values))
+        return self.__spine_action
+
+    def __clamp_action_array(
+        self, action_array: NDArray[float]
+    ) -> NDArray[float]:
+        min_action = self.__min_action_array
+        max_action = self.__max_action_array
+        clamped = np.clip(
+            action_array, min_action, max_action, out=self.__clamped_array
+        )
+        # Clipping leaves NaNs as they are, so that comparing bytes tells
+        # whether any value was clamped without a NaN-aware comparison
+        if clamped.tobytes() != action_array.tobytes():
+            out_of_bounds = (action_array < min_action) | (
+                action_array > max_action
+            )
+            self.__warn_clamped(action_array, clamped, out_of_bounds)
+        return clamped
+
+    def __warn_clamped(
+        self,
+        action_array: NDArray[float],
+        clamped: NDArray[float],
+        out_of_bounds: NDArray[bool],
+    ) -> None:
+        for i, j in zip(*np.nonzero(out_of_bounds)):
+            bound = "lower" if clamped[i, j] > action_array[i, j] else "upper"
+            logging.warning(
+                f"{self.JOINT_NAMES[i]}: {self.ACTION_KEYS[j]}="
+                f"{action_array[i, j]} clamped to {bound}={clamped[i, j]}"
+            )
+
+    def vectorize_action(self, action) -> NDArray[float]:
+        """!
+        Flatten an environment action into a vector.
+
+        Servo action keys missing from the action are taken from the neutral
+        action, as in :func:`get_spine_action`.
+
+        @param action Environment action, either a dictionary or an action
+            array.
+        @returns Vector of dimension ``spaces.flatdim(action_space)``.
+        """
+        if isinstance(action, dict):
+            action = self.action_to_array(action)
+        full_action = {
+            joint: dict(zip(self.ACTION_KEYS, values))
+            for joint, values in zip(self.JOINT_NAMES, action.tolist())
+        }
+        return spaces.flatten(self.action_space, full_action)
+
+    def step_chunk(
+        self, action_chunk: NDArray[float]
+    ) -> Tuple[NDArray[float], float, bool, bool, dict]:
+        """!
+        Run a chunk of servo actions, one per spine cycle, and collect the
+        flat observations that follow each of them.
+
+        The whole chunk is sent to the spine in a single action, and the
+        spine plays it back one target per cycle while recording the
+        observations that follow each target. This requires a spine that
+        plays action chunks, such as the Bullet spine, which is checked from
+        the reset observation before anything is sent. The environment then
+        waits for at most ``k + CHUNK_WAIT_MARGIN`` further observations for
+        the chunk to complete.
+
+        Intermediate observations are written in place to a batch of flat
+        vectors, laid out as in flat observation mode, without building
+        observation dictionaries. Rewards stop accumulating at the first
+        observation where a fall is detected.
+
+        @param action_chunk Array of shape ``(k, 6, 6)`` with one action
+            array per spine cycle, see :func:`action_to_array`.
+        @returns
+            - ``observations``: Array of shape ``(n, d)`` of flat observations
+              after each action, with ``n <= k`` the number of actions run
+              until a fall, if any.
+            - ``reward``: Sum of rewards over these actions.
+            - ``terminated``: Whether a fall was detected.
+            - ``truncated``: Always false.
+            - ``info``: Dictionary with the last spine observation.
+        @raise UpkieException If the chunk is empty, if the spine does not
+            play action chunks, or if the chunk does not complete in time,
+            for instance because the spine stopped servos.
+        """
+        if not self.__plays_chunks:
+            raise UpkieException("Spine does not play action chunks")
+        nb_targets = len(action_chunk)
+        if nb_targets < 1:
+            raise UpkieException("Action chunk is empty")
+        self.__chunk_id += 1
+        targets = {}
+        for i, action in enumerate(action_chunk):
+            clamped = self.__clamp_action_array(action).tolist()
+            targets[str(i)] = {
+                joint: dict(zip(self.ACTION_KEYS, values))
+                for joint, values in zip(self.JOINT_NAMES, clamped)
+            }
+
+        # The spine keeps the last target as servo action after the chunk
+        spine_action = self.__spine_action
+        for joint, target in targets[str(nb_targets - 1)].items():
+            spine_action["servo"][joint].update(target)
+        spine_action["bullet"] = {
+            "action_chunk": {
+                "id": self.__chunk_id,
+                "size": nb_targets,
+                "targets": targets,
+            }
+        }
+        try:
+            spine_observation = self._step_spine(spine_action)
+        finally:
+            del spine_action["bullet"]
+        chunk = spine_observation["action_chunk"]
+        nb_waits = 0
+        while chunk["id"] != self.__chunk_id or (
+            chunk["nb_observed"] < nb_targets
+        ):
+            if nb_waits >= nb_targets + self.CHUNK_WAIT_MARGIN:
+                raise UpkieException(
+                    f"Action chunk {self.__chunk_id} did not complete after "
+                    f"{nb_waits} observations"
                 )
-                servo_action[key] = clamp_and_warn(
-                    action,
-                    self.__min_action[joint][key],
-                    self.__max_action[joint][key],
-                    label=f"{joint}: {key}",
+            spine_observation = self._spine.get_observation()
+            chunk = spine_observation["action_chunk"]
+            nb_waits += 1
+
+        schema = self.__get_chunk_schema()
+        observations = np.empty((nb_targets, schema.size))
+        history = self.history
+        reward = 0.0
+        terminated = False
+        nb_steps = 0
+        snapshots = chunk["observations"]
+        for i, action in enumerate(action_chunk):
+            snapshot = snapshots[str(i)]
+            observation = schema.extract(snapshot, observations[nb_steps])
+            step_reward = self.get_reward(observation, action)
+            if history is not None:
+                history.append(
+                    observation,
+                    self.vectorize_action(action),
+                    step_reward,
+                    perf_counter(),
                 )
-            spine_action["servo"][joint] = servo_action
-        return spine_action
+            reward += step_reward
+            nb_steps += 1
+            if self.detect_fall(snapshot):
+                terminated = True
+                break
+        self.kinematics.update(spine_observation["servo"])
+        info = {"spine_observation": spine_observation}
+        return observations[:nb_steps], reward, terminated, False, info
+
+    def __get_chunk_schema(self) -> ObservationSchema:
+        if self.observation_schema is not None:
+            return self.observation_schema
+        if self.__chunk_schema is None:
+            self.__chunk_schema = ObservationSchema(
+                list_observation_fields(self.observation_space)
+            )
+        return self.__chunk_schema
+
+    def parse_first_observation(self, spine_observation: dict) -> None:
+        """!
+        Parse first observation after the spine interface is initialized.
+
+        @param spine_observation First observation.
+
+        Spines that play action chunks report their progress in the
+        "action_chunk" observation, which is how :func:`step_chunk` knows
+        whether it can send chunks to the spine.
+        """
+        self.__plays_chunks = "action_chunk" in spine_observation
 
     def get_reward(self, observation: dict, action: dict) -> float:
         """!
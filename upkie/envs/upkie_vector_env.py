@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+from typing import List, Optional, Sequence, Tuple
+
+import gymnasium
+import numpy as np
+from gymnasium.utils import seeding
+from gymnasium.vector.utils import batch_space
+from numpy.typing import NDArray
+
+from upkie.utils.exceptions import UpkieException
+
+from .upkie_base_env import UpkieBaseEnv
+
+try:
+    from gymnasium.vector import AutoresetMode
+
+    SAME_STEP_AUTORESET = AutoresetMode.SAME_STEP
+except ImportError:  # gymnasium < 1.0 only has same-step autoreset
+    SAME_STEP_AUTORESET = "SameStep"
+
+
+class UpkieVectorEnv(gymnasium.vector.VectorEnv):
+
+    """!
+    Vectorized environment stepping several Upkie environments, each connected
+    to its own spine, from a single Python process.
+
+    Actions are first sent to all spines, then observations are collected from
+    all spines, so that spines cycle concurrently while the agent process
+    waits. There is no Python worker process per environment and no
+    serialization of actions and observations between processes: the only
+    inter-process communication is the shared memory of each spine.
+
+    Sub-environments are automatically reset in the same step as they
+    terminate or get truncated. In that case, the final observation and info
+    dictionary of the episode are reported in the ``final_obs`` and
+    ``final_info`` keys of the info dictionary.
+
+    @note Sub-environments should be initialized with ``regulate_frequency``
+    set to false, as they are stepped back-to-back.
+    """
+
+    envs: List[UpkieBaseEnv]
+    max_episode_steps: Optional[int]
+
+    def __init__(
+        self,
+        envs: Sequence[UpkieBaseEnv],
+        max_episode_steps: Optional[int] = None,
+    ):
+        """!
+        Initialize vectorized environment.
+
+        @param envs Upkie environments, each connected to a different spine.
+        @param max_episode_steps If set, truncate episodes of sub-environments
+            after this number of steps.
+        """
+        if len(envs) < 1:
+            raise UpkieException("Vector environment needs at least one env")
+        first_env = envs[0]
+        for env in envs[1:]:
+            if env.observation_space != first_env.observation_space:
+                raise UpkieException(
+                    "Observation spaces of sub-environments don't match"
+                )
+            if env.action_space != first_env.action_space:
+                raise UpkieException(
+                    "Action spaces of sub-environments don't match"
+                )
+
+        num_envs = len(envs)
+        single_observation_space = first_env.observation_space
+        single_action_space = first_env.action_space
+
+        # gymnasium.vector.VectorEnv attributes
+        self.action_space = batch_space(single_action_space, num_envs)
+        self.closed = False
+        self.metadata = {"autoreset_mode": SAME_STEP_AUTORESET}
+        self.num_envs = num_envs
+        self.observation_space = batch_space(
+            single_observation_space, num_envs
+        )
+        self.single_action_space = single_action_space
+        self.single_observation_space = single_observation_space
+
+        # Preallocated outputs
+        self.__observations = np.zeros(
+            self.observation_space.shape,
+            dtype=single_observation_space.dtype,
+        )
+        self.__rewards = np.zeros((num_envs,), dtype=float)
+        self.__terminations = np.zeros((num_envs,), dtype=bool)
+        self.__truncations = np.zeros((num_envs,), dtype=bool)
+        self.__episode_steps = np.zeros((num_envs,), dtype=int)
+
+        self.envs = list(envs)
+        self.max_episode_steps = max_episode_steps
+
+    def reset(
+        self,
+        *,
+        seed: Optional[int] = None,
+        options: Optional[dict] = None,
+    ) -> Tuple[NDArray[float], dict]:
+        """!
+        Reset all sub-environments.
+
+        @param seed Seed for the vectorized environment. Sub-environment ``i``
+            is seeded with ``seed + i``, and the random number generator of
+            the vectorized environment, used e.g. by vector wrappers, with
+            ``seed``.
+        @param options Currently unused.
+        @returns
+            - ``observations``: Batch of initial observations, of shape
+              ``(num_envs, obs_dim)``.
+            - ``infos``: Batched dictionary of auxiliary information.
+        """
+        if seed is not None:
+            self._np_random, self._np_random_seed = seeding.np_random(seed)
+        infos = {}
+        for i, env in enumerate(self.envs):
+            env_seed = seed + i if seed is not None else None
+            observation, info = env.reset(seed=env_seed)
+            self.__observations[i] = observation
+            infos = self._add_info(infos, info, i)
+        self.__episode_steps[:] = 0
+        return self.__observations.copy(), infos
+
+    def step(
+        self,
+        actions: NDArray[float],
+    ) -> Tuple[NDArray[float], NDArray[float], NDArray, NDArray, dict]:
+        """!
+        Step all sub-environments.
+
+        @param actions Batch of actions, of shape ``(num_envs, action_dim)``.
+        @returns
+            - ``observations``: Batch of observations.
+            - ``rewards``: Batch of rewards.
+            - ``terminations``: Batch of termination flags.
+            - ``truncations``: Batch of truncation flags.
+            - ``infos``: Batched dictionary of auxiliary information.
+        """
+        # Send actions to all spines before waiting for any of them
+        for env, action in zip(self.envs, actions):
+            env.step_async(action)
+
+        infos = {}
+        self.__episode_steps += 1
+        for i, env in enumerate(self.envs):
+            observation, reward, terminated, truncated, info = env.step_wait()
+            truncated = truncated or (
+                self.max_episode_steps is not None
+                and self.__episode_steps[i] >= self.max_episode_steps
+            )
+            self.__rewards[i] = reward
+            self.__terminations[i] = terminated
+            self.__truncations[i] = truncated
+            if terminated or truncated:
+                infos = self._add_info(
+                    infos,
+                    {"final_obs": observation, "final_info": info},
+                    i,
+                )
+                observation, info = env.reset()
+                self.__episode_steps[i] = 0
+            self.__observations[i] = observation
+            infos = self._add_info(infos, info, i)
+
+        return (
+            self.__observations.copy(),
+            self.__rewards.copy(),
+            self.__terminations.copy(),
+            self.__truncations.copy(),
+            infos,
+        )
+
+    def call(self, name: str, *args, **kwargs) -> tuple:
+        """!
+        Call a method or get an attribute of each sub-environment.
+
+        @param name Name of the method or attribute.
+        @returns Tuple of results from each sub-environment.
+        """
+        results = []
+        for env in self.envs:
+            function = getattr(env, name)
+            results.append(
+                function(*args, **kwargs) if callable(function) else function
+            )
+        return tuple(results)
+
+    def close_extras(self, **kwargs) -> None:
+        """!
+        Stop all spines properly.
+        """
+        for env in self.envs:
+            env.close()
@@ -6,14 +6,18 @@
 
 from .add_action_to_observation import AddActionToObservation
 from .differentiate_action import DifferentiateAction
+from .fused_acceleration_wrapper import FusedAccelerationWrapper
 from .low_pass_filter_action import LowPassFilterAction
 from .noisify_action import NoisifyAction
 from .noisify_observation import NoisifyObservation
+from .observation_action_history import ObservationActionHistory
 
 __all__ = [
     "AddActionToObservation",
     "DifferentiateAction",
+    "FusedAccelerationWrapper",
     "LowPassFilterAction",
     "NoisifyAction",
     "NoisifyObservation",
+    "ObservationActionHistory",
 ]
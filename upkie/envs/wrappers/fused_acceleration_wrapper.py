@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+from typing import Callable, Optional, Tuple, Union
+
+import gymnasium
+import numpy as np
+from gymnasium import spaces
+from numpy.typing import NDArray
+
+from upkie.envs.wrappers.noise_block import NoiseBlock
+from upkie.utils.exceptions import UpkieException
+from upkie.utils.filters import low_pass_filter
+
+
+def _make_rescale_function(
+    box: spaces.Box,
+) -> Callable[[NDArray[float]], NDArray[float]]:
+    """!
+    Get the function mapping actions in [-1, 1] to a box, with the
+    same floating-point operations as ``gymnasium.wrappers.RescaleAction``.
+
+    @param box Target action box.
+    @returns Rescaling function.
+    """
+    try:  # gymnasium >= 1.0
+        from gymnasium.wrappers.utils import rescale_box
+
+        _, _, rescale = rescale_box(box, -1.0, 1.0)
+        return rescale
+    except ImportError:  # gymnasium 0.29
+        low, high = box.low, box.high
+        min_action = np.zeros(box.shape, dtype=box.dtype) - 1.0
+        max_action = np.zeros(box.shape, dtype=box.dtype) + 1.0
+
+        def rescale(action: NDArray[float]) -> NDArray[float]:
+            action = low + (high - low) * (
+                (action - min_action) / (max_action - min_action)
+            )
+            return np.clip(action, low, high)
+
+        return rescale
+
+
+class FusedAccelerationWrapper(gymnasium.Wrapper):
+
+    """!
+    Act on the derivative of the action of an environment, and observe the
+    history of its observations and actions, in a single wrapper.
+
+    This wrapper is equivalent, up to the last bit, to the chain:
+
+    @code{.py}
+    env = NoisifyObservation(env, observation_noise)
+    env = NoisifyAction(env, action_noise)
+    env = LowPassFilterAction(env, time_constant)
+    env = ObservationActionHistory(env, history_size)
+    env = DifferentiateAction(env, min_derivative, max_derivative)
+    env = RescaleAction(env, min_action=-1.0, max_action=+1.0)
+    @endcode
+
+    where noise and filtering stages are skipped when their parameters are
+    ``None``. It performs the same operations, including calls to random
+    number generators, in one step function with preallocated buffers.
+    Clipping is computed as ``minimum(maximum(x, low), high)``, which gives
+    the same result as ``np.clip`` with less call overhead.
+    Observations are copied from a ring buffer, as in
+    @ref ObservationActionHistory.
+    """
+
+    filtered_action: NDArray[float]
+    time_constant: Optional[float]
+    time_constant_box: Optional[spaces.Box]
+
+    def __init__(
+        self,
+        env,
+        history_size: int,
+        min_derivative: NDArray[float],
+        max_derivative: NDArray[float],
+        action_noise: Optional[NDArray[float]] = None,
+        action_penalty: float = 0.0,
+        observation_noise: Optional[NDArray[float]] = None,
+        time_constant: Optional[Union[float, spaces.Box]] = None,
+    ):
+        """!
+        Initialize wrapper.
+
+        @param env Environment to wrap.
+        @param history_size Number of observation-action rows.
+        @param min_derivative Lower bound on the derivative of the original
+            action.
+        @param max_derivative Upper bound on the derivative of the original
+            action.
+        @param action_noise Amplitudes of the uniform noise added to the
+            original action, or ``None`` to disable action noise.
+        @param action_penalty Weight for an additional penalty on the
+            differential action added to the reward.
+        @param observation_noise Amplitudes of the uniform noise added to
+            observations, or ``None`` to disable observation noise.
+        @param time_constant Cutoff period in seconds of a low-pass filter
+            applied to the original action, or ``None`` to disable filtering.
+            If a Box is provided, a new time constant is sampled uniformly at
+            random between its bounds at every reset of the environment.
+        @raise UpkieException If the history size is not positive, if
+            observation and action types differ, or if noise shapes do not
+            match their spaces.
+        """
+        super().__init__(env)
+        if history_size < 1:
+            raise UpkieException(f"History {history_size=} should be positive")
+        if env.observation_space.dtype != env.action_space.dtype:
+            raise UpkieException(
+                "Not sure which type to pick "
+                f"between {env.observation_space.dtype=} "
+                f"and {env.action_space.dtype=}"
+            )
+        if action_noise is not None and (
+            action_noise.shape != env.action_space.shape
+        ):
+            raise UpkieException(
+                f"Action {action_noise.shape=} does not "
+                f"match {env.action_space.shape=}"
+            )
+        if observation_noise is not None and (
+            observation_noise.shape != env.observation_space.shape
+        ):
+            raise UpkieException(
+                f"Observation {observation_noise.shape=} does not "
+                f"match {env.observation_space.shape=}"
+            )
+
+        # Action: rescaling, then differentiation
+        derivative_space = spaces.Box(
+            np.float32(min_derivative),
+            np.float32(max_derivative),
+            shape=env.action_space.shape,
+            dtype=np.float32,
+        )
+        self.action_space = spaces.Box(
+            low=-1.0,
+            high=+1.0,
+            shape=derivative_space.shape,
+            dtype=derivative_space.dtype,
+        )
+        self._action_high = env.action_space.high
+        self._action_low = env.action_space.low
+        self._dt = env.unwrapped.dt
+        self._integral = np.zeros(env.action_space.shape)
+        self._rescale = _make_rescale_function(derivative_space)
+        self.action_penalty = action_penalty
+
+        # Low-pass filter and noise
+        time_constant_box = (
+            time_constant
+            if isinstance(time_constant, spaces.Box) or time_constant is None
+            else spaces.Box(
+                low=time_constant - 1e-10,
+                high=time_constant + 1e-10,
+            )
+        )
+        self.filtered_action = np.zeros(env.action_space.shape)
+        self.time_constant = (
+            time_constant_box.sample()
+            if time_constant_box is not None
+            else None
+        )
+        self.time_constant_box = time_constant_box
+        self._action_noise = (
+            NoiseBlock(action_noise) if action_noise is not None else None
+        )
+        self._observation_noise = (
+            NoiseBlock(observation_noise)
+            if observation_noise is not None
+            else None
+        )
+
+        # Observation: history of observation-action rows
+        dtype = env.observation_space.dtype
+        row_low = np.concatenate(
+            [env.observation_space.low, env.action_space.low]
+        )
+        row_high = np.concatenate(
+            [env.observation_space.high, env.action_space.high]
+        )
+        self.observation_space = spaces.Box(
+            low=np.repeat(row_low[np.newaxis, ...], history_size, axis=0),
+            high=np.repeat(row_high[np.newaxis, ...], history_size, axis=0),
+            shape=(history_size,) + row_low.shape,
+            dtype=dtype,
+        )
+        self._buffer = np.zeros((2 * history_size,) + row_low.shape, dtype)
+        self._index = 0
+        self._last_action = np.zeros(env.action_space.shape, dtype=dtype)
+        self._obs_dim = env.observation_space.shape[0]
+        self._observation_high = env.observation_space.high
+        self._observation_low = env.observation_space.low
+        self.history_size = history_size
+
+    def reset(self, **kwargs):
+        """!
+        Reset the wrapped environment and fill the history with its initial
+        observation.
+
+        @param kwargs Keyword arguments forwarded to the wrapped environment.
+        @returns Pair ``(observation, info)``.
+        """
+        self._integral = np.zeros(self.action_space.shape)
+        if self.time_constant_box is not None:
+            self.filtered_action = np.zeros(self.env.action_space.shape)
+            self.time_constant = self.time_constant_box.sample()
+        observation, info = self.env.reset(**kwargs)
+        if self._observation_noise is not None:
+            self._observation_noise.reset()
+            observation = self.__noisify_observation(observation)
+        if self._action_noise is not None:
+            self._action_noise.reset()
+        buffer = self._buffer
+        buffer[:, : self._obs_dim] = observation
+        buffer[:, self._obs_dim :] = self._last_action
+        self._index = 0
+        return buffer[: self.history_size].copy(), info
+
+    def step(
+        self,
+        action: NDArray[float],
+    ) -> Tuple[NDArray[float], float, bool, bool, dict]:
+        """!
+        Step the wrapped environment.
+
+        @param action Normalized action derivative, in [-1, 1].
+        @returns Tuple ``(observation, reward, terminated, truncated, info)``.
+        """
+        dt = self._dt
+        low, high = self._action_low, self._action_high
+        derivative = self._rescale(action)
+        integral = np.minimum(
+            np.maximum(self._integral + derivative * dt, low), high
+        )
+        self._integral = integral
+        self._last_action = integral
+
+        inner_action = integral
+        if self.time_constant_box is not None:
+            if self.time_constant > 2.0 * dt:  # Nyquist–Shannon
+                self.filtered_action = low_pass_filter(
+                    self.filtered_action,
+                    self.time_constant,
+                    integral,
+                    dt,
+                )
+                inner_action = self.filtered_action
+        if self._action_noise is not None:
+            noise = self._action_noise.next(self.np_random)
+            inner_action = np.minimum(
+                np.maximum(inner_action + noise, low), high
+            )
+
+        observation, reward, terminated, truncated, info = self.env.step(
+            inner_action
+        )
+        if self._observation_noise is not None:
+            observation = self.__noisify_observation(observation)
+
+        i = self._index
+        row = self._buffer[i]
+        row[: self._obs_dim] = observation
+        row[self._obs_dim :] = integral
+        self._buffer[i + self.history_size] = row
+        self._index = i = (i + 1) % self.history_size
+        history = self._buffer[i : i + self.history_size].copy()
+        reward = reward - self.action_penalty * derivative.dot(derivative)
+        return history, reward, terminated, truncated, info
+
+    def __noisify_observation(
+        self, observation: NDArray[float]
+    ) -> NDArray[float]:
+        """!
+        Add noise to an observation of the wrapped environment.
+
+        @param observation Observation from the wrapped environment.
+        @returns Noisy observation, to be cast to the observation type when
+            written to the history.
+        """
+        noise = self._observation_noise.next(self.np_random)
+        return np.minimum(
+            np.maximum(observation + noise, self._observation_low),
+            self._observation_high,
+        )
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.signal import lfilter
+
+from upkie.utils.exceptions import UpkieException
+
+
+class NoiseBlock:
+
+    r"""!
+    Noise vectors pre-sampled in blocks and read one at a time.
+
+    White noise is sampled uniformly in ``[-amplitude, +amplitude]``. With a
+    positive correlation, it is then filtered by the first-order recursion:
+
+    \f$
+    n_t = \alpha n_{t-1} + (1 - \alpha) w_t
+    \f$
+
+    where \f$\alpha\f$ is the correlation and \f$w_t\f$ the white noise.
+    Filtered noise is colored (low-pass) and stays within the same bounds.
+
+    Blocks are sampled from the random number generator passed to
+    :func:`next`, so that the sequence of noise vectors only depends on the
+    seed of this generator. For white noise, it is the same sequence as
+    drawing one noise vector per call.
+    """
+
+    amplitude: NDArray[float]
+    block_size: int
+    correlation: float
+
+    def __init__(
+        self,
+        amplitude: NDArray[float],
+        block_size: int = 1024,
+        correlation: float = 0.0,
+    ):
+        """!
+        Initialize noise block.
+
+        @param amplitude Non-negative amplitudes of the noise vector.
+        @param block_size Number of noise vectors sampled at once.
+        @param correlation Correlation coefficient between consecutive noise
+            vectors, in [0, 1). Zero yields white noise.
+        @raise UpkieException If the block size or correlation is invalid.
+        """
+        if block_size < 1:
+            raise UpkieException(f"Noise {block_size=} should be positive")
+        if not 0.0 <= correlation < 1.0:
+            raise UpkieException(
+                f"Noise {correlation=} should be in the interval [0, 1)"
+            )
+        self.amplitude = np.abs(amplitude)
+        self.block_size = block_size
+        self.correlation = correlation
+        self.__block = np.empty((block_size,) + self.amplitude.shape)
+        self.__filter = (
+            np.array([1.0 - correlation]),
+            np.array([1.0, -correlation]),
+        )
+        self.__index = block_size
+        self.__state = np.zeros(self.amplitude.shape)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """!
+        Shape of noise vectors.
+        """
+        return self.amplitude.shape
+
+    def reset(self) -> None:
+        """!
+        Discard remaining noise vectors and reset the correlated noise state
+        to zero.
+        """
+        self.__index = self.block_size
+        self.__state.fill(0.0)
+
+    def next(self, np_random: np.random.Generator) -> NDArray[float]:
+        """!
+        Get the next noise vector, sampling a new block if needed.
+
+        @param np_random Random number generator used to sample blocks.
+        @returns Noise vector. It is a view into the current block, valid
+            until the next block is sampled.
+        """
+        if self.__index >= self.block_size:
+            self.__sample_block(np_random)
+        noise = self.__block[self.__index]
+        self.__index += 1
+        return noise
+
+    def __sample_block(self, np_random: np.random.Generator) -> None:
+        """!
+        Sample a new block of noise vectors.
+
+        @param np_random Random number generator.
+        """
+        self.__block = np_random.uniform(
+            low=-self.amplitude,
+            high=self.amplitude,
+            size=self.__block.shape,
+        )
+        if self.correlation > 0.0:
+            b, a = self.__filter
+            flat_block = self.__block.reshape(self.block_size, -1)
+            flat_block[:], _ = lfilter(
+                b,
+                a,
+                flat_block,
+                axis=0,
+                zi=self.correlation * self.__state.reshape(1, -1),
+            )
+            self.__state[...] = self.__block[-1]
+        self.__index = 0
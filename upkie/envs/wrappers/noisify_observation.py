@@ -8,6 +8,7 @@ import gymnasium
 import numpy as np
 from numpy.typing import NDArray
 
+from upkie.envs.wrappers.noise_block import NoiseBlock
 from upkie.utils.exceptions import UpkieException
 
 
@@ -15,9 +16,32 @@ class NoisifyObservation(gymnasium.ObservationWrapper):
 
     """!
     Add noise to the observation of an environment.
+
+    Noise vectors are pre-sampled in blocks from the random number generator
+    of the environment, which is reseeded by ``reset(seed=...)``. Noise is
+    thus reproducible from the environment seed.
     """
 
-    def __init__(self, env, noise: NDArray[float]):
+    def __init__(
+        self,
+        env,
+        noise: NDArray[float],
+        block_size: int = 1024,
+        correlation: float = 0.0,
+    ):
+        """!
+        Initialize wrapper.
+
+        @param env Environment to wrap.
+        @param noise Amplitudes of the uniform noise added to each observation
+            coordinate.
+        @param block_size Number of noise vectors pre-sampled at once.
+        @param correlation Correlation coefficient between noise vectors of
+            consecutive steps, in [0, 1). Zero yields white noise, positive
+            values yield low-pass (colored) noise.
+        @raise UpkieException If the noise shape does not match the
+            observation space, or if the block size or correlation is invalid.
+        """
         super().__init__(env)
         if noise.shape != env.observation_space.shape:
             raise UpkieException(
@@ -26,9 +50,24 @@ class NoisifyObservation(gymnasium.ObservationWrapper):
             )
         self.high = +np.abs(noise)
         self.low = -np.abs(noise)
+        self.noise_block = NoiseBlock(
+            noise, block_size=block_size, correlation=correlation
+        )
+
+    def reset(self, **kwargs):
+        """!
+        Reset the wrapped environment and discard pre-sampled noise, so that
+        noise after a seeded reset only depends on the seed.
+
+        @param kwargs Keyword arguments forwarded to the wrapped environment.
+        @returns Pair ``(observation, info)``.
+        """
+        observation, info = self.env.reset(**kwargs)
+        self.noise_block.reset()
+        return self.observation(observation), info
 
     def observation(self, observation):
-        noise = self.np_random.uniform(low=self.low, high=self.high)
+        noise = self.noise_block.next(self.np_random)
         noisy_observation = np.clip(
             observation + noise,
             self.env.observation_space.low,
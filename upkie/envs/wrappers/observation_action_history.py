@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+import gymnasium
+import numpy as np
+from gymnasium import spaces
+from numpy.typing import NDArray
+
+from upkie.utils.exceptions import UpkieException
+
+
+class ObservationActionHistory(gymnasium.Wrapper):
+
+    """!
+    Stack the last observation and action vectors of an environment.
+
+    Observations of the wrapped environment are arrays of shape
+    ``(history_size, obs_dim + act_dim)``, oldest entry first, where each row
+    concatenates an observation with the action that led to it. This is the
+    same as ``FrameStack(AddActionToObservation(env), history_size)``: upon
+    reset, all rows are equal to the initial observation, concatenated with
+    the last action (zero before the first step).
+
+    Rows are written in place into a preallocated ring buffer. Each row is
+    written twice, at index ``i`` and ``i + history_size``, so that the
+    history is a contiguous slice of this buffer, returned as a copy with a
+    single memory copy rather than a roll or concatenation. Copies are
+    needed as callers may keep past observations, for instance vectorized
+    environments store terminal observations before calling :func:`reset`.
+    """
+
+    _last_action: NDArray[float]
+
+    def __init__(self, env, history_size: int):
+        """!
+        Initialize wrapper.
+
+        @param env Wrapped environment.
+        @param history_size Number of observation-action rows.
+        @raise UpkieException If the history size is not positive, or if
+            observation and action types differ.
+        """
+        super().__init__(env)
+        if history_size < 1:
+            raise UpkieException(f"History {history_size=} should be positive")
+        if env.observation_space.dtype != env.action_space.dtype:
+            raise UpkieException(
+                "Not sure which type to pick "
+                f"between {env.observation_space.dtype=} "
+                f"and {env.action_space.dtype=}"
+            )
+        dtype = env.observation_space.dtype
+        row_low = np.concatenate(
+            [env.observation_space.low, env.action_space.low]
+        )
+        row_high = np.concatenate(
+            [env.observation_space.high, env.action_space.high]
+        )
+        self.observation_space = spaces.Box(
+            low=np.repeat(row_low[np.newaxis, ...], history_size, axis=0),
+            high=np.repeat(row_high[np.newaxis, ...], history_size, axis=0),
+            shape=(history_size,) + row_low.shape,
+            dtype=dtype,
+        )
+        self._buffer = np.zeros((2 * history_size,) + row_low.shape, dtype)
+        self._index = 0
+        self._last_action = np.zeros(env.action_space.shape, dtype=dtype)
+        self._obs_dim = env.observation_space.shape[0]
+        self.history_size = history_size
+
+    def reset(self, **kwargs):
+        """!
+        Reset the wrapped environment and fill the history with its initial
+        observation.
+
+        @param kwargs Keyword arguments forwarded to the wrapped environment.
+        @returns Pair ``(observation, info)``.
+        """
+        observation, info = self.env.reset(**kwargs)
+        buffer = self._buffer
+        buffer[:, : self._obs_dim] = observation
+        buffer[:, self._obs_dim :] = self._last_action
+        self._index = 0
+        return buffer[: self.history_size].copy(), info
+
+    def step(self, action: NDArray[float]):
+        """!
+        Step the wrapped environment and append its new observation, along
+        with the action, to the history.
+
+        @param action Action from the agent.
+        @returns Tuple ``(observation, reward, terminated, truncated, info)``.
+        """
+        self._last_action = action
+        observation, reward, terminated, truncated, info = self.env.step(
+            action
+        )
+        i = self._index
+        row = self._buffer[i]
+        row[: self._obs_dim] = observation
+        row[self._obs_dim :] = action
+        self._buffer[i + self.history_size] = row
+        self._index = i = (i + 1) % self.history_size
+        history = self._buffer[i : i + self.history_size].copy()
+        return history, reward, terminated, truncated, info
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Test FusedAccelerationWrapper."""
+
+import unittest
+
+import gymnasium
+import numpy as np
+from gymnasium import spaces
+from gymnasium.wrappers import RescaleAction
+
+from upkie.envs.wrappers import (
+    DifferentiateAction,
+    FusedAccelerationWrapper,
+    LowPassFilterAction,
+    NoisifyAction,
+    NoisifyObservation,
+    ObservationActionHistory,
+)
+from upkie.utils.exceptions import UpkieException
+
+
+def make_stacked_env(env, history_size, max_accel, training, lpf_seed):
+    """!
+    Stack of wrappers equivalent to the fused wrapper.
+    """
+    if training:
+        env = NoisifyObservation(env, noise=np.array([0.1, 0.2, 0.3]))
+        env = NoisifyAction(env, noise=np.array([0.4]))
+        time_constant = spaces.Box(0.2, 0.3, seed=lpf_seed)
+        env = LowPassFilterAction(env, time_constant=time_constant)
+    env = ObservationActionHistory(env, history_size)
+    env = DifferentiateAction(
+        env,
+        min_derivative=-max_accel,
+        max_derivative=+max_accel,
+    )
+    return RescaleAction(env, min_action=-1.0, max_action=+1.0)
+
+
+def make_fused_env(env, history_size, max_accel, training, lpf_seed):
+    return FusedAccelerationWrapper(
+        env,
+        history_size=history_size,
+        min_derivative=-max_accel,
+        max_derivative=+max_accel,
+        action_noise=np.array([0.4]) if training else None,
+        observation_noise=np.array([0.1, 0.2, 0.3]) if training else None,
+        time_constant=(
+            spaces.Box(0.2, 0.3, seed=lpf_seed) if training else None
+        ),
+    )
+
+
+class FusedAccelerationWrapperTestCase(unittest.TestCase):
+    def check_same_as_stacked(self, training: bool):
+        kwargs = {
+            "history_size": 4,
+            "max_accel": 10.0,
+            "training": training,
+            "lpf_seed": 12,
+        }
+        stacked_env = make_stacked_env(gymnasium.make("Pendulum-v1"), **kwargs)
+        fused_env = make_fused_env(gymnasium.make("Pendulum-v1"), **kwargs)
+        self.assertEqual(fused_env.action_space, stacked_env.action_space)
+        self.assertEqual(
+            fused_env.observation_space, stacked_env.observation_space
+        )
+        rng = np.random.default_rng(0)
+        for episode in range(3):
+            seed = episode if episode < 2 else None
+            stacked_obs, _ = stacked_env.reset(seed=seed)
+            fused_obs, _ = fused_env.reset(seed=seed)
+            self.assertTrue(np.array_equal(fused_obs, stacked_obs))
+            for _ in range(50):
+                action = rng.uniform(-1.0, 1.0, size=(1,)).astype(np.float32)
+                stacked = stacked_env.step(action)
+                fused = fused_env.step(action)
+                self.assertTrue(np.array_equal(fused[0], stacked[0]))
+                self.assertEqual(fused[1], stacked[1])
+                self.assertEqual(type(fused[1]), type(stacked[1]))
+                self.assertEqual(fused[2:4], stacked[2:4])
+
+    def test_same_as_stacked_training(self):
+        self.check_same_as_stacked(training=True)
+
+    def test_same_as_stacked_inference(self):
+        self.check_same_as_stacked(training=False)
+
+    def test_terminal_observation(self):
+        env = make_fused_env(
+            gymnasium.make("Pendulum-v1"),
+            history_size=3,
+            max_accel=1.0,
+            training=True,
+            lpf_seed=0,
+        )
+        env.reset(seed=0)
+        action = np.ones((1,), dtype=np.float32)
+        terminal_observation, _, _, _, _ = env.step(action)
+        expected = terminal_observation.copy()
+        env.reset(seed=1)  # as vectorized environments do after truncation
+        self.assertTrue(np.array_equal(terminal_observation, expected))
+
+    def test_invalid_noise(self):
+        with self.assertRaises(UpkieException):
+            FusedAccelerationWrapper(
+                gymnasium.make("Pendulum-v1"),
+                history_size=2,
+                min_derivative=-1.0,
+                max_derivative=+1.0,
+                action_noise=np.ones(2),
+            )
+
+    def test_check_env(self):
+        try:
+            from stable_baselines3.common.env_checker import check_env
+
+            env = make_fused_env(
+                gymnasium.make("Pendulum-v1"),
+                history_size=2,
+                max_accel=1.0,
+                training=True,
+                lpf_seed=0,
+            )
+            check_env(env)
+        except ImportError:
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()  # necessary for `bazel test`
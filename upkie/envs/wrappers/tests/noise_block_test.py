@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Test NoiseBlock."""
+
+import unittest
+
+import numpy as np
+
+from upkie.envs.wrappers.noise_block import NoiseBlock
+from upkie.utils.exceptions import UpkieException
+
+
+class NoiseBlockTestCase(unittest.TestCase):
+    def test_same_as_per_step_sampling(self):
+        amplitude = np.array([0.1, 0.2, 0.3])
+        noise_block = NoiseBlock(amplitude, block_size=7)
+        block_rng = np.random.default_rng(42)
+        step_rng = np.random.default_rng(42)
+        for _ in range(20):
+            noise = noise_block.next(block_rng)
+            expected = step_rng.uniform(low=-amplitude, high=amplitude)
+            self.assertTrue(np.array_equal(noise, expected))
+
+    def test_reproducible(self):
+        amplitude = np.array([0.5, 0.5])
+        first = NoiseBlock(amplitude, block_size=8, correlation=0.9)
+        second = NoiseBlock(amplitude, block_size=3, correlation=0.9)
+        first_rng = np.random.default_rng(1)
+        for _ in range(10):
+            first.next(first_rng)
+        first.reset()
+        first_rng = np.random.default_rng(2)
+        second_rng = np.random.default_rng(2)
+        first_noise = np.array([first.next(first_rng) for _ in range(8)])
+        second_noise = np.array([second.next(second_rng) for _ in range(3)])
+        self.assertTrue(np.array_equal(first_noise[:3], second_noise))
+
+    def test_correlated_recursion(self):
+        amplitude = np.array([1.0, 2.0])
+        correlation = 0.8
+        noise_block = NoiseBlock(
+            amplitude, block_size=4, correlation=correlation
+        )
+        block_rng = np.random.default_rng(0)
+        white_rng = np.random.default_rng(0)
+        white = white_rng.uniform(-amplitude, amplitude, size=(12, 2))
+        expected = np.zeros(2)
+        for t in range(12):
+            expected = correlation * expected + (1.0 - correlation) * white[t]
+            noise = noise_block.next(block_rng)
+            self.assertTrue(np.allclose(noise, expected, atol=1e-15))
+            self.assertTrue(np.all(np.abs(noise) <= amplitude))
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(UpkieException):
+            NoiseBlock(np.ones(1), block_size=0)
+        with self.assertRaises(UpkieException):
+            NoiseBlock(np.ones(1), correlation=1.0)
+        with self.assertRaises(UpkieException):
+            NoiseBlock(np.ones(1), correlation=-0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()  # necessary for `bazel test`
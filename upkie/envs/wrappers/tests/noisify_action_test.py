@@ -22,6 +22,31 @@ class NoisifyActionTestCase(unittest.TestCase):
         inner_action, _, _, _, _ = noisy_env.step(action)
         self.assertGreater(np.abs(inner_action - action), 1e-10)
 
+    def test_reproducible_from_seed(self):
+        def sample_actions(seed: int, block_size: int):
+            noisy_env = NoisifyAction(
+                gymnasium.make("Pendulum-v1"),
+                noise=np.array([0.42]),
+                block_size=block_size,
+            )
+            noisy_env.reset(seed=seed)
+            return np.array(
+                [noisy_env.action(np.zeros(1)) for _ in range(10)]
+            )
+
+        actions = sample_actions(seed=7, block_size=4)
+        self.assertTrue(np.array_equal(actions, sample_actions(7, 1024)))
+        self.assertFalse(np.array_equal(actions, sample_actions(8, 4)))
+
+    def test_correlated_noise(self):
+        noisy_env = NoisifyAction(
+            ActionObserverEnv(), noise=np.array([0.42]), correlation=0.9
+        )
+        action = np.array([1.0])
+        inner_action, _, _, _, _ = noisy_env.step(action)
+        self.assertGreater(np.abs(inner_action - action), 1e-10)
+        self.assertLess(np.abs(inner_action - action), 0.42)
+
     def test_check_env(self):
         try:
             from stable_baselines3.common.env_checker import check_env
@@ -25,6 +25,28 @@ class NoisifyObservationTestCase(unittest.TestCase):
         observation, _, _, _, _ = noisy_env.step(None)
         self.assertGreater(abs(observation[0] - 1.0), 1e-10)
 
+    def test_reproducible_from_seed(self):
+        def sample_observations(seed: int, block_size: int):
+            noisy_env = NoisifyObservation(
+                gymnasium.make("Pendulum-v1"),
+                noise=np.full(3, 0.1),
+                block_size=block_size,
+            )
+            observation, _ = noisy_env.reset(seed=seed)
+            observations = [observation]
+            for _ in range(10):
+                observation, _, _, _, _ = noisy_env.step(np.zeros(1))
+                observations.append(observation)
+            return np.array(observations)
+
+        observations = sample_observations(seed=3, block_size=4)
+        self.assertTrue(
+            np.array_equal(observations, sample_observations(3, 1024))
+        )
+        self.assertFalse(
+            np.array_equal(observations, sample_observations(4, 4))
+        )
+
     def test_check_env(self):
         try:
             from stable_baselines3.common.env_checker import check_env
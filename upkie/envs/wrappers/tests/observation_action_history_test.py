@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Test ObservationActionHistory wrapper."""
+
+import unittest
+
+import gymnasium
+import numpy as np
+
+from upkie.envs.wrappers import AddActionToObservation
+from upkie.envs.wrappers.observation_action_history import (
+    ObservationActionHistory,
+)
+from upkie.utils.exceptions import UpkieException
+
+try:
+    from gymnasium.wrappers import FrameStack
+except ImportError:  # gymnasium >= 1.0
+    from gymnasium.wrappers import FrameStackObservation as FrameStack
+
+
+class ObservationActionHistoryTestCase(unittest.TestCase):
+    def test_same_as_frame_stack(self):
+        env = gymnasium.make("Pendulum-v1")
+        history_env = ObservationActionHistory(env, history_size=3)
+        reference_env = FrameStack(
+            AddActionToObservation(gymnasium.make("Pendulum-v1")), 3
+        )
+        self.assertEqual(
+            history_env.observation_space, reference_env.observation_space
+        )
+        rng = np.random.default_rng(0)
+        for episode in range(2):
+            observation, _ = history_env.reset(seed=episode)
+            reference, _ = reference_env.reset(seed=episode)
+            self.assertTrue(np.array_equal(observation, np.array(reference)))
+            for _ in range(5):
+                action = rng.uniform(-2.0, 2.0, size=(1,)).astype(np.float32)
+                observation, _, _, _, _ = history_env.step(action)
+                reference, _, _, _, _ = reference_env.step(action)
+                self.assertTrue(observation.flags.c_contiguous)
+                self.assertTrue(
+                    np.array_equal(observation, np.array(reference))
+                )
+
+    def test_terminal_observation(self):
+        env = ObservationActionHistory(
+            gymnasium.make("Pendulum-v1"), history_size=3
+        )
+        env.reset(seed=0)
+        action = np.ones((1,), dtype=np.float32)
+        terminal_observation, _, _, _, _ = env.step(action)
+        expected = terminal_observation.copy()
+        env.reset(seed=1)  # as vectorized environments do after truncation
+        self.assertTrue(np.array_equal(terminal_observation, expected))
+
+    def test_invalid_history_size(self):
+        env = gymnasium.make("Pendulum-v1")
+        with self.assertRaises(UpkieException):
+            ObservationActionHistory(env, history_size=0)
+
+    def test_check_env(self):
+        try:
+            from stable_baselines3.common.env_checker import check_env
+
+            env = gymnasium.make("Pendulum-v1")
+            wrapped_env = ObservationActionHistory(env, history_size=2)
+            check_env(wrapped_env)
+        except ImportError:
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()  # necessary for `bazel test`
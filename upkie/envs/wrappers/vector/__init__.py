@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Wrappers for vectorized environments, operating on batches of actions and
+observations of shape ``(num_envs, dim)``."""
+
+from .add_action_to_observation import AddActionToObservation
+from .differentiate_action import DifferentiateAction
+from .low_pass_filter_action import LowPassFilterAction
+from .noisify_action import NoisifyAction
+from .noisify_observation import NoisifyObservation
+from .vector_wrapper import UpkieVectorWrapper
+
+__all__ = [
+    "AddActionToObservation",
+    "DifferentiateAction",
+    "LowPassFilterAction",
+    "NoisifyAction",
+    "NoisifyObservation",
+    "UpkieVectorWrapper",
+]
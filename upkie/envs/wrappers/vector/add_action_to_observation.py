@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+import numpy as np
+from gymnasium import spaces
+from gymnasium.vector.utils import batch_space
+from numpy.typing import NDArray
+
+from upkie.envs.wrappers.vector.vector_wrapper import UpkieVectorWrapper
+from upkie.utils.exceptions import UpkieException
+
+
+class AddActionToObservation(UpkieVectorWrapper):
+
+    """!
+    Append the last action of each sub-environment to its observation.
+
+    Batched counterpart of @ref upkie.envs.wrappers.AddActionToObservation:
+    observations of shape ``(num_envs, obs_dim)`` and last actions of shape
+    ``(num_envs, action_dim)`` are concatenated in one operation.
+    """
+
+    _last_actions: NDArray[float]
+
+    def __init__(self, env):
+        """!
+        Initialize wrapper.
+
+        @param env Vectorized environment to wrap.
+
+        The initial action is set to zero.
+        """
+        super().__init__(env)
+        single_observation_space = env.single_observation_space
+        single_action_space = env.single_action_space
+        if single_observation_space.dtype != single_action_space.dtype:
+            raise UpkieException(
+                "Not sure which type to pick "
+                f"between {single_observation_space.dtype=} "
+                f"and {single_action_space.dtype=}"
+            )
+        low = np.concatenate(
+            [single_observation_space.low, single_action_space.low]
+        )
+        self.single_observation_space = spaces.Box(
+            low=low,
+            high=np.concatenate(
+                [single_observation_space.high, single_action_space.high]
+            ),
+            shape=low.shape,
+            dtype=single_observation_space.dtype,
+        )
+        self.observation_space = batch_space(
+            self.single_observation_space, env.num_envs
+        )
+        self._last_actions = np.zeros(
+            env.action_space.shape, dtype=single_action_space.dtype
+        )
+
+    def reset(self, **kwargs):
+        observations, infos = self.env.reset(**kwargs)
+        return self.observations(observations), infos
+
+    def step(self, actions: NDArray[float]):
+        self._last_actions = actions
+        observations, rewards, terminations, truncations, infos = (
+            self.env.step(actions)
+        )
+        self.transform_final_observations(
+            infos,
+            lambda i, obs: np.concatenate([obs, self._last_actions[i]]),
+        )
+        return (
+            self.observations(observations),
+            rewards,
+            terminations,
+            truncations,
+            infos,
+        )
+
+    def observations(self, observations: NDArray[float]) -> NDArray[float]:
+        """!
+        Append last actions to a batch of observations.
+
+        @param observations Batch of observations.
+        @returns Batch of observations with last actions.
+        """
+        return np.concatenate([observations, self._last_actions], axis=1)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+from typing import Tuple
+
+import numpy as np
+from gymnasium import spaces
+from gymnasium.vector.utils import batch_space
+from numpy.typing import NDArray
+
+from upkie.envs.wrappers.vector.vector_wrapper import UpkieVectorWrapper
+
+
+class DifferentiateAction(UpkieVectorWrapper):
+
+    """!
+    Act on the derivative of the action of each sub-environment.
+
+    Batched counterpart of @ref upkie.envs.wrappers.DifferentiateAction. The
+    integral of each sub-environment is reset to zero when its episode ends.
+    """
+
+    def __init__(
+        self,
+        env,
+        min_derivative: NDArray[float],
+        max_derivative: NDArray[float],
+        action_penalty: float = 0.0,
+    ):
+        """!
+        Initialize wrapper.
+
+        @param env Vectorized environment to wrap.
+        @param min_derivative Lower bound on the derivative of the original
+            action.
+        @param max_derivative Upper bound on the derivative of the original
+            action.
+        @param action_penalty Weight for an additional penalty on the
+            differential action added to the reward.
+
+        @note We assume the original action lives in a vector space.
+        """
+        super().__init__(env)
+        self.single_action_space = spaces.Box(
+            np.float32(min_derivative),
+            np.float32(max_derivative),
+            shape=env.single_action_space.shape,
+            dtype=np.float32,
+        )
+        self.action_space = batch_space(self.single_action_space, env.num_envs)
+        self._dt = self.get_time_steps()
+        self._integrals = np.zeros(env.action_space.shape)
+        self._low = env.single_action_space.low
+        self._high = env.single_action_space.high
+        self.action_penalty = action_penalty
+
+    def reset(self, **kwargs):
+        self._integrals = np.zeros(self.action_space.shape)
+        return self.env.reset(**kwargs)
+
+    def step(
+        self,
+        actions: NDArray[float],
+    ) -> Tuple[NDArray[float], NDArray[float], NDArray, NDArray, dict]:
+        self._integrals = np.clip(
+            self._integrals + actions * self._dt,
+            self._low,
+            self._high,
+        )
+        observations, rewards, terminations, truncations, infos = (
+            self.env.step(self._integrals)
+        )
+        wrapped_rewards = rewards - self.action_penalty * np.einsum(
+            "ij,ij->i", actions, actions
+        )
+        done = terminations | truncations
+        if done.any():
+            self._integrals = np.where(
+                done[:, np.newaxis], 0.0, self._integrals
+            )
+        return observations, wrapped_rewards, terminations, truncations, infos
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+from typing import Union
+
+import numpy as np
+from gymnasium.spaces import Box
+from numpy.typing import NDArray
+
+from upkie.envs.wrappers.vector.vector_wrapper import UpkieVectorWrapper
+
+
+class LowPassFilterAction(UpkieVectorWrapper):
+
+    """!
+    Apply a low-pass filter to the action of each sub-environment.
+
+    Batched counterpart of @ref upkie.envs.wrappers.LowPassFilterAction. Each
+    sub-environment has its own filter state and time constant, sampled
+    again when its episode ends. Sub-environments whose time constant is
+    below the Nyquist–Shannon limit receive unfiltered actions.
+    """
+
+    filtered_actions: NDArray[float]
+    time_constant_box: Box
+    time_constants: NDArray[float]
+
+    def __init__(self, env, time_constant: Union[float, Box]):
+        """!
+        Initialize wrapper.
+
+        @param env Vectorized environment to wrap.
+        @param time_constant Cutoff period in seconds of a low-pass filter
+            applied to the action. If a Box is provided, couple of lower and
+            upper bounds for the action: a new time constant is sampled
+            uniformly at random between these bounds, for each
+            sub-environment, at every reset of this sub-environment.
+        """
+        super().__init__(env)
+        time_constant_box = (
+            time_constant
+            if isinstance(time_constant, Box)
+            else Box(low=time_constant - 1e-10, high=time_constant + 1e-10)
+        )
+        self._alphas = np.zeros((env.num_envs, 1))
+        self._dt = self.get_time_steps()
+        self._filtering = np.zeros((env.num_envs, 1), dtype=bool)
+        self.filtered_actions = np.zeros(env.action_space.shape)
+        self.time_constant_box = time_constant_box
+        self.time_constants = np.zeros(
+            env.num_envs, dtype=time_constant_box.dtype
+        )
+        self.__sample_time_constants(np.ones(env.num_envs, dtype=bool))
+
+    def reset(self, **kwargs):
+        self.filtered_actions = np.zeros(self.env.action_space.shape)
+        self.__sample_time_constants(
+            np.ones(len(self.time_constants), dtype=bool)
+        )
+        return self.env.reset(**kwargs)
+
+    def step(self, actions: NDArray[float]):
+        # Alphas are zero for sub-environments without filtering
+        self.filtered_actions = self.filtered_actions + self._alphas * (
+            actions - self.filtered_actions
+        )
+        observations, rewards, terminations, truncations, infos = (
+            self.env.step(
+                np.where(self._filtering, self.filtered_actions, actions)
+            )
+        )
+        done = terminations | truncations
+        if done.any():
+            self.filtered_actions = np.where(
+                done[:, np.newaxis], 0.0, self.filtered_actions
+            )
+            self.__sample_time_constants(done)
+        return observations, rewards, terminations, truncations, infos
+
+    def __sample_time_constants(self, mask: NDArray[bool]) -> None:
+        """!
+        Sample new time constants for a subset of sub-environments.
+
+        @param mask Boolean mask of sub-environments to update.
+        """
+        for i in np.flatnonzero(mask):
+            self.time_constants[i] = self.time_constant_box.sample().item()
+        # Same precision as the time constants, as in the single-env wrapper
+        dt = self._dt.astype(self.time_constants.dtype)
+        time_constants = self.time_constants.reshape(-1, 1)
+        self._filtering = time_constants > 2.0 * dt  # Nyquist–Shannon
+        self._alphas = np.where(self._filtering, dt / time_constants, 0.0)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+import numpy as np
+from numpy.typing import NDArray
+
+from upkie.envs.wrappers.noise_block import NoiseBlock
+from upkie.envs.wrappers.vector.vector_wrapper import UpkieVectorWrapper
+from upkie.utils.exceptions import UpkieException
+
+
+class NoisifyAction(UpkieVectorWrapper):
+
+    """!
+    Add noise to the action of each sub-environment.
+
+    Batched counterpart of @ref upkie.envs.wrappers.NoisifyAction. Noise
+    batches are pre-sampled in blocks from the random number generator of
+    the vectorized environment, which is reseeded by ``reset(seed=...)``.
+    """
+
+    def __init__(self, env, noise: NDArray[float], block_size: int = 1024):
+        """!
+        Initialize wrapper.
+
+        @param env Vectorized environment to wrap.
+        @param noise Amplitudes of the uniform noise added to each action
+            coordinate, of the shape of a single action.
+        @param block_size Number of noise batches pre-sampled at once.
+        @raise UpkieException If the noise shape does not match the single
+            action space.
+        """
+        super().__init__(env)
+        if noise.shape != env.single_action_space.shape:
+            raise UpkieException(
+                f"Action {noise.shape=} does not "
+                f"match {env.single_action_space.shape=}"
+            )
+        self.noise_block = NoiseBlock(
+            np.broadcast_to(noise, env.action_space.shape),
+            block_size=block_size,
+        )
+
+    def reset(self, **kwargs):
+        observations, infos = self.env.reset(**kwargs)
+        self.noise_block.reset()
+        return observations, infos
+
+    def step(self, actions: NDArray[float]):
+        noise = self.noise_block.next(self.unwrapped.np_random)
+        noisy_actions = np.clip(
+            actions + noise,
+            self.env.single_action_space.low,
+            self.env.single_action_space.high,
+        )
+        return self.env.step(noisy_actions)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+import numpy as np
+from numpy.typing import NDArray
+
+from upkie.envs.wrappers.noise_block import NoiseBlock
+from upkie.envs.wrappers.vector.vector_wrapper import UpkieVectorWrapper
+from upkie.utils.exceptions import UpkieException
+
+
+class NoisifyObservation(UpkieVectorWrapper):
+
+    """!
+    Add noise to the observation of each sub-environment.
+
+    Batched counterpart of @ref upkie.envs.wrappers.NoisifyObservation. Noise
+    batches are pre-sampled in blocks from the random number generator of
+    the vectorized environment, which is reseeded by ``reset(seed=...)``.
+    Final observations of sub-environments reset during a step get their own
+    noise vector.
+    """
+
+    def __init__(self, env, noise: NDArray[float], block_size: int = 1024):
+        """!
+        Initialize wrapper.
+
+        @param env Vectorized environment to wrap.
+        @param noise Amplitudes of the uniform noise added to each
+            observation coordinate, of the shape of a single observation.
+        @param block_size Number of noise batches pre-sampled at once.
+        @raise UpkieException If the noise shape does not match the single
+            observation space.
+        """
+        super().__init__(env)
+        if noise.shape != env.single_observation_space.shape:
+            raise UpkieException(
+                f"Observation {noise.shape=} does not "
+                f"match {env.single_observation_space.shape=}"
+            )
+        self.high = +np.abs(noise)
+        self.low = -np.abs(noise)
+        self.noise_block = NoiseBlock(
+            np.broadcast_to(noise, env.observation_space.shape),
+            block_size=block_size,
+        )
+
+    def reset(self, **kwargs):
+        observations, infos = self.env.reset(**kwargs)
+        self.noise_block.reset()
+        return self.observations(observations), infos
+
+    def step(self, actions: NDArray[float]):
+        observations, rewards, terminations, truncations, infos = (
+            self.env.step(actions)
+        )
+        self.transform_final_observations(infos, self.__noisify_final)
+        return (
+            self.observations(observations),
+            rewards,
+            terminations,
+            truncations,
+            infos,
+        )
+
+    def observations(self, observations: NDArray[float]) -> NDArray[float]:
+        """!
+        Add noise to a batch of observations.
+
+        @param observations Batch of observations.
+        @returns Batch of noisy observations.
+        """
+        noise = self.noise_block.next(self.unwrapped.np_random)
+        space = self.env.single_observation_space
+        return np.clip(observations + noise, space.low, space.high).astype(
+            space.dtype
+        )
+
+    def __noisify_final(
+        self, index: int, observation: NDArray[float]
+    ) -> NDArray[float]:
+        """!
+        Add noise to the final observation of a sub-environment.
+
+        @param index Index of the sub-environment.
+        @param observation Final observation of the sub-environment.
+        @returns Noisy final observation.
+        """
+        space = self.env.single_observation_space
+        noise = self.unwrapped.np_random.uniform(low=self.low, high=self.high)
+        return np.clip(observation + noise, space.low, space.high).astype(
+            space.dtype
+        )
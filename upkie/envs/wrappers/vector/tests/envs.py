@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+import gymnasium
+import numpy as np
+from gymnasium import spaces
+from gymnasium.utils import seeding
+from gymnasium.vector.utils import batch_space
+
+from upkie.envs.upkie_vector_env import SAME_STEP_AUTORESET
+
+
+class ActionObserverVectorEnv(gymnasium.vector.VectorEnv):
+    def __init__(self, num_envs: int):
+        single_space = spaces.Box(0.0, 2.0, shape=(1,))
+        self.action_space = batch_space(single_space, num_envs)
+        self.dones = np.zeros(num_envs, dtype=bool)
+        self.dt = 1e-3
+        self.metadata = {"autoreset_mode": SAME_STEP_AUTORESET}
+        self.num_envs = num_envs
+        self.observation_space = batch_space(single_space, num_envs)
+        self.single_action_space = single_space
+        self.single_observation_space = single_space
+
+    def reset(self, *, seed=None, options=None):
+        if seed is not None:
+            self._np_random, self._np_random_seed = seeding.np_random(seed)
+        return np.zeros(self.observation_space.shape), {}
+
+    def step(self, actions):
+        observations = np.array(actions, dtype=float)
+        infos = {}
+        for i in np.flatnonzero(self.dones):
+            infos = self._add_info(
+                infos, {"final_obs": observations[i].copy()}, i
+            )
+            observations[i] = 0.0
+        rewards = np.zeros(self.num_envs)
+        terminations = self.dones.copy()
+        truncations = np.zeros(self.num_envs, dtype=bool)
+        return observations, rewards, terminations, truncations, infos
+
+    def call(self, name, *args, **kwargs):
+        return tuple(getattr(self, name) for _ in range(self.num_envs))
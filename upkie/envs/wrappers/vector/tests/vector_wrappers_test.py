@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Test wrappers for vectorized environments."""
+
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from gymnasium import spaces
+
+from upkie.envs import UpkieGroundVelocity, UpkieVectorEnv, wrappers
+from upkie.envs.tests.mock_spine import MockSpine
+from upkie.envs.wrappers import vector
+from upkie.envs.wrappers.tests.envs import ActionObserverEnv
+from upkie.envs.wrappers.vector.tests.envs import ActionObserverVectorEnv
+from upkie.utils.exceptions import UpkieException
+
+
+class VectorWrappersTestCase(unittest.TestCase):
+    def setUp(self):
+        self.num_envs = 3
+        self.rng = np.random.default_rng(0)
+        self.vector_env = ActionObserverVectorEnv(self.num_envs)
+
+    def random_actions(self, low: float, high: float) -> np.ndarray:
+        return self.rng.uniform(low, high, size=(self.num_envs, 1))
+
+    def test_differentiate_action(self):
+        vector_env = vector.DifferentiateAction(
+            self.vector_env, min_derivative=-10.0, max_derivative=+10.0
+        )
+        single_envs = [
+            wrappers.DifferentiateAction(
+                ActionObserverEnv(),
+                min_derivative=-10.0,
+                max_derivative=+10.0,
+            )
+            for _ in range(self.num_envs)
+        ]
+        self.assertEqual(vector_env.action_space.shape, (self.num_envs, 1))
+        vector_env.reset()
+        for _ in range(20):
+            actions = self.random_actions(-10.0, 10.0)
+            observations, _, _, _, _ = vector_env.step(actions)
+            for i, env in enumerate(single_envs):
+                observation, _, _, _, _ = env.step(actions[i])
+                self.assertTrue(np.array_equal(observations[i], observation))
+
+    def test_differentiate_action_autoreset(self):
+        vector_env = vector.DifferentiateAction(
+            self.vector_env, min_derivative=-10.0, max_derivative=+10.0
+        )
+        vector_env.reset()
+        actions = np.full((self.num_envs, 1), 5.0)
+        vector_env.step(actions)
+        self.vector_env.dones[1] = True
+        vector_env.step(actions)
+        self.vector_env.dones[1] = False
+        observations, _, _, _, _ = vector_env.step(actions)
+        self.assertAlmostEqual(observations[0, 0], 3 * 5.0 * 1e-3)
+        self.assertAlmostEqual(observations[1, 0], 5.0 * 1e-3)
+
+    def test_low_pass_filter_action(self):
+        time_constant = spaces.Box(0.002, 0.02, seed=3)
+        vector_env = vector.LowPassFilterAction(
+            self.vector_env, time_constant=time_constant
+        )
+        vector_env.reset()
+        single_envs = []
+        for i in range(self.num_envs):
+            env = wrappers.LowPassFilterAction(
+                ActionObserverEnv(), time_constant=0.01
+            )
+            env.time_constant = vector_env.time_constants[i]
+            single_envs.append(env)
+        self.assertEqual(len(set(vector_env.time_constants)), self.num_envs)
+        for _ in range(20):
+            actions = self.random_actions(0.0, 2.0)
+            observations, _, _, _, _ = vector_env.step(actions)
+            for i, env in enumerate(single_envs):
+                observation, _, _, _, _ = env.step(actions[i])
+                self.assertTrue(np.array_equal(observations[i], observation))
+
+    def test_low_pass_filter_action_resample(self):
+        vector_env = vector.LowPassFilterAction(
+            self.vector_env, time_constant=spaces.Box(0.002, 0.02)
+        )
+        vector_env.reset()
+        time_constants = vector_env.time_constants.copy()
+        self.vector_env.dones[2] = True
+        vector_env.step(np.ones((self.num_envs, 1)))
+        self.assertTrue(np.all(vector_env.filtered_actions[2] == 0.0))
+        self.assertNotEqual(vector_env.time_constants[2], time_constants[2])
+        self.assertTrue(
+            np.array_equal(vector_env.time_constants[:2], time_constants[:2])
+        )
+
+    def test_low_pass_filter_action_nyquist(self):
+        vector_env = vector.LowPassFilterAction(
+            self.vector_env, time_constant=0.0015
+        )
+        vector_env.reset()
+        actions = self.random_actions(0.0, 2.0)
+        observations, _, _, _, _ = vector_env.step(actions)
+        self.assertTrue(np.array_equal(observations, actions))
+
+    def test_noisify_action(self):
+        vector_env = vector.NoisifyAction(
+            self.vector_env, noise=np.array([0.1])
+        )
+        vector_env.reset(seed=42)
+        actions = np.ones((self.num_envs, 1))
+        first, _, _, _, _ = vector_env.step(actions)
+        self.assertTrue(np.all(np.abs(first - actions) <= 0.1))
+        self.assertEqual(len(set(first[:, 0])), self.num_envs)
+        vector_env.reset(seed=42)
+        second, _, _, _, _ = vector_env.step(actions)
+        self.assertTrue(np.array_equal(first, second))
+
+    def test_noisify_observation(self):
+        vector_env = vector.NoisifyObservation(
+            self.vector_env, noise=np.array([0.1])
+        )
+        observations, _ = vector_env.reset(seed=42)
+        self.assertTrue(np.all(np.abs(observations - 0.0) <= 0.1))
+        self.vector_env.dones[0] = True
+        actions = np.ones((self.num_envs, 1))
+        observations, _, _, _, infos = vector_env.step(actions)
+        self.assertTrue(np.all(np.abs(observations[1:] - 1.0) <= 0.1))
+        self.assertLessEqual(abs(observations[0, 0]), 0.1)
+        self.assertNotEqual(infos["final_obs"][0][0], 1.0)
+        self.assertLessEqual(abs(infos["final_obs"][0][0] - 1.0), 0.1)
+
+    def test_add_action_to_observation(self):
+        vector_env = vector.AddActionToObservation(self.vector_env)
+        self.assertEqual(vector_env.observation_space.shape, (3, 2))
+        observations, _ = vector_env.reset()
+        self.assertTrue(np.all(observations == 0.0))
+        self.vector_env.dones[1] = True
+        actions = self.random_actions(0.0, 2.0)
+        observations, _, _, _, infos = vector_env.step(actions)
+        self.assertTrue(np.array_equal(observations[:, 1], actions[:, 0]))
+        self.assertEqual(infos["final_obs"][1].shape, (2,))
+        self.assertEqual(infos["final_obs"][1][1], actions[1, 0])
+
+    def test_upkie_vector_env(self):
+        envs = []
+        for _ in range(2):
+            shared_memory = SharedMemory(name=None, size=42, create=True)
+            env = UpkieGroundVelocity(
+                regulate_frequency=False,
+                shm_name=shared_memory._name,
+            )
+            shared_memory.close()
+            env._spine = MockSpine()
+            envs.append(env)
+        vector_env = vector.NoisifyObservation(
+            UpkieVectorEnv(envs), noise=np.full(4, 0.01)
+        )
+        vector_env = vector.NoisifyAction(vector_env, noise=np.full(1, 0.01))
+        vector_env = vector.LowPassFilterAction(vector_env, time_constant=0.1)
+        vector_env = vector.AddActionToObservation(vector_env)
+        vector_env = vector.DifferentiateAction(
+            vector_env, min_derivative=-1.0, max_derivative=+1.0
+        )
+        observations, _ = vector_env.reset(seed=0)
+        self.assertEqual(observations.shape, (2, 5))
+        observations, rewards, _, _, _ = vector_env.step(np.ones((2, 1)))
+        self.assertEqual(observations.shape, (2, 5))
+        self.assertEqual(rewards.shape, (2,))
+        self.assertTrue(np.allclose(observations[:, 4], 5e-3))
+
+    def test_noise_shape_mismatch(self):
+        with self.assertRaises(UpkieException):
+            vector.NoisifyAction(self.vector_env, noise=np.ones(2))
+        with self.assertRaises(UpkieException):
+            vector.NoisifyObservation(self.vector_env, noise=np.ones(2))
+
+    def test_next_step_autoreset(self):
+        self.vector_env.metadata = {"autoreset_mode": "NextStep"}
+        with self.assertRaises(UpkieException):
+            vector.DifferentiateAction(
+                self.vector_env, min_derivative=-1.0, max_derivative=1.0
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()  # necessary for `bazel test`
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+from typing import Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from upkie.envs.upkie_vector_env import SAME_STEP_AUTORESET
+from upkie.utils.exceptions import UpkieException
+
+try:
+    from gymnasium.vector import VectorWrapper
+except ImportError:  # gymnasium < 1.0
+    from gymnasium.vector import VectorEnvWrapper as VectorWrapper
+
+
+class UpkieVectorWrapper(VectorWrapper):
+
+    """!
+    Base class for wrappers of vectorized environments that transform
+    batches of actions or observations of shape ``(num_envs, dim)``.
+
+    Wrapped environments are assumed to reset their sub-environments in the
+    same step as they terminate or get truncated, as
+    @ref upkie.envs.upkie_vector_env.UpkieVectorEnv does, reporting final
+    observations in the ``final_obs`` key of the info dictionary.
+    """
+
+    def __init__(self, env):
+        """!
+        Initialize wrapper.
+
+        @param env Vectorized environment to wrap.
+        @raise UpkieException If the wrapped environment does not reset its
+            sub-environments in the same step.
+        """
+        super().__init__(env)
+        autoreset_mode = env.metadata.get("autoreset_mode", None)
+        if autoreset_mode not in (None, SAME_STEP_AUTORESET):
+            raise UpkieException(
+                f"Vector wrapper requires same-step autoreset "
+                f"but {autoreset_mode=}"
+            )
+
+    def get_time_steps(self) -> NDArray[float]:
+        """!
+        Get the time steps of sub-environments.
+
+        @returns Column vector of time steps, in seconds.
+        """
+        return np.array(self.unwrapped.call("dt"), dtype=float).reshape(-1, 1)
+
+    @staticmethod
+    def transform_final_observations(
+        infos: dict,
+        transform: Callable[[int, NDArray[float]], NDArray[float]],
+    ) -> None:
+        """!
+        Apply a transform, in place, to the final observations of
+        sub-environments that were reset during a step.
+
+        @param infos Batched info dictionary of the vectorized environment.
+        @param transform Function taking the index of a sub-environment and
+            its final observation, and returning the transformed observation.
+        """
+        if "final_obs" not in infos:
+            return
+        final_observations = infos["final_obs"]
+        for i in np.flatnonzero(infos["_final_obs"]):
+            final_observations[i] = transform(i, final_observations[i])
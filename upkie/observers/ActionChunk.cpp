@@ -0,0 +1,60 @@
+// SPDX-License-Identifier: Apache-2.0
+// Copyright 2024 Inria
+
+#include "upkie/observers/ActionChunk.h"
+
+namespace upkie::observers {
+
+ActionChunk::ActionChunk(const Parameters& params)
+    : params_(params),
+      id_(0),
+      nb_played_(0),
+      nb_observed_(0),
+      new_chunk_(false) {}
+
+void ActionChunk::reset(const Dictionary& config) {
+  id_ = 0;
+  nb_played_ = 0;
+  nb_observed_ = 0;
+  new_chunk_ = false;
+}
+
+void ActionChunk::read(const Dictionary& observation) {
+  if (!observation.has(prefix())) {
+    return;
+  }
+  const auto& chunk = observation(prefix());
+  const int id = chunk.get<int>("id");
+  if (id != id_) {
+    id_ = id;
+    nb_observed_ = 0;
+    new_chunk_ = true;
+  }
+  nb_played_ = chunk.get<int>("nb_played");
+}
+
+void ActionChunk::write(Dictionary& observation) {
+  auto& output = observation(prefix());
+  auto& observations = output("observations");
+  if (new_chunk_) {
+    observations.clear();
+    new_chunk_ = false;
+  }
+
+  // Target i is applied at the end of a cycle, so that the observation that
+  // follows it is the first one where nb_played > i
+  if (nb_observed_ < nb_played_) {
+    auto& snapshot = observations(std::to_string(nb_played_ - 1));
+    for (const auto& key : params_.keys) {
+      if (!observation.has(key)) {
+        continue;
+      }
+      const size_t size = observation(key).serialize(buffer_);
+      snapshot(key).update(buffer_.data(), size);
+    }
+    nb_observed_ = nb_played_;
+  }
+  output("nb_observed") = nb_observed_;
+}
+
+}  // namespace upkie::observers
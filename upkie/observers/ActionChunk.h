@@ -0,0 +1,87 @@
+// SPDX-License-Identifier: Apache-2.0
+// Copyright 2024 Inria
+
+#pragma once
+
+#include <palimpsest/Dictionary.h>
+
+#include <string>
+#include <vector>
+
+#include "vulp/observation/Observer.h"
+
+namespace upkie::observers {
+
+using palimpsest::Dictionary;
+using vulp::observation::Observer;
+
+/*! Record observations while the actuation interface plays an action chunk.
+ *
+ * An action chunk is a sequence of servo targets sent by the agent in a single
+ * action, that the actuation interface applies one per spine cycle. The
+ * interface reports in the "action_chunk" observation the identifier of the
+ * current chunk (key "id") and the number of targets it applied so far (key
+ * "nb_played"). This observer then copies the selected observation sections
+ * into "action_chunk/observations/<i>" after target \f$i\f$ was applied, and
+ * counts the number of such snapshots in "action_chunk/nb_observed". This
+ * way, the agent gets all intermediate observations in a single request.
+ *
+ * This observer should be appended last to the observer pipeline, so that
+ * snapshots include the outputs of all other observers.
+ */
+class ActionChunk : public Observer {
+ public:
+  //! Observer parameters.
+  struct Parameters {
+    //! Observation sections copied after each target, e.g. "servo"
+    std::vector<std::string> keys;
+  };
+
+  /*! Initialize observer.
+   *
+   * \param[in] params Observer parameters.
+   */
+  explicit ActionChunk(const Parameters& params);
+
+  /*! Read chunk progress reported by the actuation interface.
+   *
+   * \param[in] observation Dictionary to read other observations from.
+   */
+  void read(const Dictionary& observation) final;
+
+  //! Prefix of outputs in the observation dictionary.
+  inline std::string prefix() const noexcept final { return "action_chunk"; }
+
+  /*! Reset observer.
+   *
+   * \param[in] config Global configuration dictionary.
+   */
+  void reset(const Dictionary& config) override;
+
+  /*! Write outputs, called if reading was successful.
+   *
+   * \param[out] observation Dictionary to write observations to.
+   */
+  void write(Dictionary& observation) final;
+
+ private:
+  //! Observer parameters.
+  Parameters params_;
+
+  //! Identifier of the current action chunk.
+  int id_;
+
+  //! Number of targets applied so far by the actuation interface.
+  int nb_played_;
+
+  //! Number of observations recorded for the current action chunk.
+  int nb_observed_;
+
+  //! Whether the current chunk was just started.
+  bool new_chunk_;
+
+  //! Buffer used to copy observation sections.
+  std::vector<char> buffer_;
+};
+
+}  // namespace upkie::observers
@@ -5,13 +5,29 @@
 # Copyright 2022 Stéphane Caron
 
 from .base_pitch import (
+    DEFAULT_IMU_FRAME,
     compute_base_angular_velocity_from_imu,
+    compute_base_orientation_from_imu,
+    compute_base_orientations_from_imu,
     compute_base_pitch_from_imu,
+    compute_base_pitch_from_quaternion,
+    compute_base_pitches_from_imu,
+    compute_base_pitches_from_quaternions,
     compute_pitch_frame_in_parent,
+    compute_pitch_frames_in_parent,
 )
+from .imu_frame import ImuFrame
 
 __all__ = [
+    "DEFAULT_IMU_FRAME",
+    "ImuFrame",
     "compute_base_angular_velocity_from_imu",
+    "compute_base_orientation_from_imu",
+    "compute_base_orientations_from_imu",
     "compute_base_pitch_from_imu",
+    "compute_base_pitch_from_quaternion",
+    "compute_base_pitches_from_imu",
+    "compute_base_pitches_from_quaternions",
     "compute_pitch_frame_in_parent",
+    "compute_pitch_frames_in_parent",
 ]
@@ -4,13 +4,48 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright 2022 Stéphane Caron
 
+import math
 from typing import Optional, Tuple
 
 import numpy as np
 from numpy.typing import NDArray
 
 from upkie.utils.clamp import clamp
-from upkie.utils.rotations import rotation_matrix_from_quaternion
+from upkie.utils.rotations import (
+    rotation_matrices_from_quaternions,
+    rotation_matrix_from_quaternion,
+)
+
+from .imu_frame import ROTATION_ARS_TO_WORLD, ImuFrame
+
+## IMU frame for the default Upkie mounting orientation.
+DEFAULT_IMU_FRAME = ImuFrame()
+
+
+def _get_rotation_base_to_imu(
+    rotation_base_to_imu: Optional[NDArray[float]],
+    imu_frame: Optional[ImuFrame],
+) -> NDArray[float]:
+    """!
+    Get the IMU mounting rotation specified to a base-pitch function.
+
+    @param rotation_base_to_imu Rotation matrix from the base frame to the IMU
+        frame, or ``None``.
+    @param imu_frame IMU frame, or ``None``.
+    @returns Rotation matrix if it is specified, otherwise the rotation of
+        the IMU frame if it is specified, otherwise the default rotation.
+    @raise ValueError If both the rotation matrix and the IMU frame are
+        specified.
+    """
+    if rotation_base_to_imu is None:
+        if imu_frame is None:
+            imu_frame = DEFAULT_IMU_FRAME
+        return imu_frame.rotation_base_to_imu
+    if imu_frame is not None:
+        raise ValueError(
+            "Specify either rotation_base_to_imu or imu_frame, not both"
+        )
+    return rotation_base_to_imu
 
 
 def compute_pitch_frame_in_parent(
@@ -66,6 +101,7 @@ def compute_pitch_frame_in_parent(
 def compute_base_orientation_from_imu(
     quat_imu_in_ars: Tuple[float, float, float, float],
     rotation_base_to_imu: Optional[NDArray[float]] = None,
+    imu_frame: Optional[ImuFrame] = None,
 ) -> NDArray[float]:
     """!
     Get the orientation of the base frame with respect to the world frame.
@@ -76,22 +112,18 @@ def compute_base_orientation_from_imu(
     @param rotation_base_to_imu Rotation matrix from the base frame to the IMU
         frame. When not specified, the default Upkie mounting orientation is
         used.
+    @param imu_frame IMU frame, as an alternative to the rotation matrix that
+        does not recompute the rotations of the IMU mounting at every call.
     @returns Rotation matrix from the base frame to the world frame.
+    @raise ValueError If the quaternion is not normalized, or if both the
+        rotation matrix and the IMU frame are specified.
     """
-    if rotation_base_to_imu is None:
-        # Default Upkie mounting orientation: USB connectors of the raspi
-        # pointing to the left of the robot (XT-30 of the pi3hat to the right)
-        rotation_base_to_imu = np.diag([-1.0, 1.0, -1.0])
-
+    rotation_base_to_imu = _get_rotation_base_to_imu(
+        rotation_base_to_imu, imu_frame
+    )
     rotation_imu_to_ars = rotation_matrix_from_quaternion(quat_imu_in_ars)
-
-    # The attitude reference system frame has +x forward, +y right and +z down,
-    # whereas our world frame has +x forward, +y left and +z up:
-    # https://github.com/mjbots/pi3hat/blob/ab632c82bd501b9fcb6f8200df0551989292b7a1/docs/reference.md#orientation
-    rotation_ars_to_world = np.diag([1.0, -1.0, -1.0])
-
     rotation_base_to_world = (
-        rotation_ars_to_world @ rotation_imu_to_ars @ rotation_base_to_imu
+        ROTATION_ARS_TO_WORLD @ rotation_imu_to_ars @ rotation_base_to_imu
     )
     return rotation_base_to_world
 
@@ -99,6 +131,7 @@ def compute_base_orientation_from_imu(
 def compute_base_pitch_from_imu(
     quat_imu_in_ars: Tuple[float, float, float, float],
     rotation_base_to_imu: Optional[NDArray[float]] = None,
+    imu_frame: Optional[ImuFrame] = None,
 ) -> float:
     """!
     Get pitch angle of the base frame relative to the world frame.
@@ -109,23 +142,232 @@ def compute_base_pitch_from_imu(
     @param rotation_base_to_imu Rotation matrix from the base frame to the IMU
         frame. When not specified, the default Upkie mounting orientation is
         used.
+    @param imu_frame IMU frame, as an alternative to the rotation matrix that
+        does not recompute the rotations of the IMU mounting at every call.
     @returns Angle from the world z-axis (unit vector opposite to gravity) to
         the base z-axis. This angle is positive when the base leans forward.
+    @raise ValueError If the quaternion is not normalized, or if both the
+        rotation matrix and the IMU frame are specified.
+
+    When the mounting orientation is given by an IMU frame, or left to its
+    default, the pitch angle is computed in closed form from quaternion
+    coordinates, see @ref compute_base_pitch_from_quaternion. When it is
+    given by a rotation matrix, it is computed from the rotation matrix of
+    the base frame, see @ref compute_pitch_frame_in_parent.
     """
+    if rotation_base_to_imu is None:
+        return compute_base_pitch_from_quaternion(quat_imu_in_ars, imu_frame)
     rotation_base_to_world = compute_base_orientation_from_imu(
-        quat_imu_in_ars, rotation_base_to_imu
+        quat_imu_in_ars, rotation_base_to_imu, imu_frame
     )
     pitch_base_in_world = compute_pitch_frame_in_parent(rotation_base_to_world)
     return pitch_base_in_world
 
 
+def compute_base_pitch_from_quaternion(
+    quat_imu_in_ars: Tuple[float, float, float, float],
+    imu_frame: Optional[ImuFrame] = None,
+) -> float:
+    r"""!
+    Get pitch angle of the base frame relative to the world frame, in closed
+    form.
+
+    @param quat_imu_in_ars Quaternion representing the rotation matrix from
+        the IMU frame to the  attitude reference system (ARS) frame, in ``[w,
+        x, y, z]`` format.
+    @param imu_frame IMU frame. When not specified, the default Upkie
+        mounting orientation is used.
+    @returns Angle from the world z-axis (unit vector opposite to gravity) to
+        the base z-axis. This angle is positive when the base leans forward.
+    @raise ValueError If the quaternion is not normalized.
+
+    The pitch angle only depends on the sagittal vector of the base, that is
+    the first column of its rotation matrix in the world frame, and on the
+    vertical coefficient of this matrix, which tells whether the base is
+    upside down. Both are quadratic forms of the quaternion coordinates. The
+    angle is then computed by ``atan2``, which is well-conditioned around
+    zero pitch, using plain floats rather than NumPy arrays. For a
+    non-default mounting orientation, the input quaternion is first
+    multiplied by the correction quaternion of the IMU frame.
+
+    This function agrees with the matrix computation, except when the
+    sagittal vector is exactly vertical, that is, when the base lies
+    horizontally. The heading vector is then undefined, so that the matrix
+    computation yields NaN, while this function yields \f$\pm \pi / 2\f$.
+    """
+    qw, qx, qy, qz = (
+        quat_imu_in_ars.tolist()
+        if isinstance(quat_imu_in_ars, np.ndarray)
+        else quat_imu_in_ars
+    )
+    squared_norm = qw * qw + qx * qx + qy * qy + qz * qz
+    if abs(squared_norm - 1.0) > 1e-5:
+        raise ValueError(f"Quaternion {quat_imu_in_ars} is not normalized")
+    if imu_frame is not None and not imu_frame.is_default:
+        cw, cx, cy, cz = imu_frame.quat_correction
+        qw, qx, qy, qz = (
+            qw * cw - qx * cx - qy * cy - qz * cz,
+            qw * cx + qx * cw + qy * cz - qz * cy,
+            qw * cy - qx * cz + qy * cw + qz * cx,
+            qw * cz + qx * cy - qy * cx + qz * cw,
+        )
+    sagittal_x = qy * qy + qz * qz - qw * qw - qx * qx
+    sagittal_y = 2.0 * (qx * qy + qz * qw)
+    sagittal_z = 2.0 * (qx * qz - qy * qw)
+    cos_pitch = math.hypot(sagittal_x, sagittal_y)
+    if qw * qw - qx * qx - qy * qy + qz * qz < 0.0:  # base upside down
+        cos_pitch = -cos_pitch
+    return math.atan2(-sagittal_z, cos_pitch)
+
+
+def compute_pitch_frames_in_parent(
+    orientations_frame_in_parent: NDArray[float],
+) -> NDArray[float]:
+    """!
+    Get pitch angles of an array of frames relative to the parent vertical.
+
+    This is the batched counterpart of @ref compute_pitch_frame_in_parent,
+    with the same conventions. Heading vectors are flipped for frames whose
+    z-axis points downward. Frames whose sagittal vector is vertical have no
+    heading vector, and yield NaN as in the single-frame function.
+
+    @param orientations_frame_in_parent Array of shape ``(N, 3, 3)`` of
+        rotation matrices from target frames to the parent frame.
+    @returns Array of shape ``(N,)`` of angles from the parent z-axis
+        (gravity) to the frame z-axes.
+    """
+    sagittal = orientations_frame_in_parent[:, :, 0]
+    sagittal = sagittal / np.linalg.norm(sagittal, axis=1, keepdims=True)
+    heading_in_parent = sagittal - sagittal[:, 2:3] * np.array([0.0, 0.0, 1.0])
+    heading_in_parent /= np.linalg.norm(
+        heading_in_parent, axis=1, keepdims=True
+    )
+    heading_in_parent[orientations_frame_in_parent[:, 2, 2] < 0] *= -1.0
+    signs = np.where(sagittal[:, 2] < 0, 1.0, -1.0)
+    cos_pitch = np.clip(
+        np.einsum("ij,ij->i", sagittal, heading_in_parent), -1.0, 1.0
+    )
+    return signs * np.arccos(cos_pitch)
+
+
+def compute_base_orientations_from_imu(
+    quats_imu_in_ars: NDArray[float],
+    rotation_base_to_imu: Optional[NDArray[float]] = None,
+    imu_frame: Optional[ImuFrame] = None,
+) -> NDArray[float]:
+    """!
+    Get orientations of the base frame with respect to the world frame from
+    an array of IMU quaternions.
+
+    This is the batched counterpart of @ref compute_base_orientation_from_imu.
+
+    @param quats_imu_in_ars Array of shape ``(N, 4)`` of quaternions
+        representing rotation matrices from the IMU frame to the attitude
+        reference system (ARS) frame, in ``[w, x, y, z]`` format.
+    @param rotation_base_to_imu Rotation matrix from the base frame to the IMU
+        frame. When not specified, the default Upkie mounting orientation is
+        used.
+    @param imu_frame IMU frame, as an alternative to the rotation matrix.
+    @returns Array of shape ``(N, 3, 3)`` of rotation matrices from the base
+        frame to the world frame.
+    """
+    rotation_base_to_imu = _get_rotation_base_to_imu(
+        rotation_base_to_imu, imu_frame
+    )
+    rotations_imu_to_ars = rotation_matrices_from_quaternions(quats_imu_in_ars)
+    return ROTATION_ARS_TO_WORLD @ rotations_imu_to_ars @ rotation_base_to_imu
+
+
+def compute_base_pitches_from_imu(
+    quats_imu_in_ars: NDArray[float],
+    rotation_base_to_imu: Optional[NDArray[float]] = None,
+    imu_frame: Optional[ImuFrame] = None,
+) -> NDArray[float]:
+    """!
+    Get pitch angles of the base frame relative to the world frame from an
+    array of IMU quaternions.
+
+    This is the batched counterpart of @ref compute_base_pitch_from_imu. As
+    in the single-quaternion function, pitch angles are computed in closed
+    form when the mounting orientation is given by an IMU frame or left to
+    its default, see @ref compute_base_pitches_from_quaternions, and from
+    rotation matrices when it is given by a rotation matrix.
+
+    @param quats_imu_in_ars Array of shape ``(N, 4)`` of quaternions
+        representing rotation matrices from the IMU frame to the attitude
+        reference system (ARS) frame, in ``[w, x, y, z]`` format.
+    @param rotation_base_to_imu Rotation matrix from the base frame to the IMU
+        frame. When not specified, the default Upkie mounting orientation is
+        used.
+    @param imu_frame IMU frame, as an alternative to the rotation matrix.
+    @returns Array of shape ``(N,)`` of angles from the world z-axis to the
+        base z-axis, positive when the base leans forward.
+    @raise ValueError If a quaternion is not normalized, or if both the
+        rotation matrix and the IMU frame are specified.
+    """
+    if rotation_base_to_imu is None:
+        return compute_base_pitches_from_quaternions(
+            quats_imu_in_ars, imu_frame
+        )
+    rotations_base_to_world = compute_base_orientations_from_imu(
+        quats_imu_in_ars, rotation_base_to_imu, imu_frame
+    )
+    return compute_pitch_frames_in_parent(rotations_base_to_world)
+
+
+def compute_base_pitches_from_quaternions(
+    quats_imu_in_ars: NDArray[float],
+    imu_frame: Optional[ImuFrame] = None,
+) -> NDArray[float]:
+    """!
+    Get pitch angles of the base frame relative to the world frame from an
+    array of IMU quaternions, in closed form.
+
+    This is the batched counterpart of @ref
+    compute_base_pitch_from_quaternion, with the same formulas evaluated on
+    columns of quaternion coordinates. In particular, it agrees with the
+    single-quaternion function when the sagittal vector is vertical.
+
+    @param quats_imu_in_ars Array of shape ``(N, 4)`` of quaternions
+        representing rotation matrices from the IMU frame to the attitude
+        reference system (ARS) frame, in ``[w, x, y, z]`` format.
+    @param imu_frame IMU frame. When not specified, the default Upkie
+        mounting orientation is used.
+    @returns Array of shape ``(N,)`` of angles from the world z-axis to the
+        base z-axis, positive when the base leans forward.
+    @raise ValueError If a quaternion is not normalized.
+    """
+    qw, qx, qy, qz = np.asarray(quats_imu_in_ars, dtype=float).T
+    squared_norms = qw * qw + qx * qx + qy * qy + qz * qz
+    if np.any(np.abs(squared_norms - 1.0) > 1e-5):
+        raise ValueError("Quaternions are not normalized")
+    if imu_frame is not None and not imu_frame.is_default:
+        cw, cx, cy, cz = imu_frame.quat_correction
+        qw, qx, qy, qz = (
+            qw * cw - qx * cx - qy * cy - qz * cz,
+            qw * cx + qx * cw + qy * cz - qz * cy,
+            qw * cy - qx * cz + qy * cw + qz * cx,
+            qw * cz + qx * cy - qy * cx + qz * cw,
+        )
+    sagittal_x = qy * qy + qz * qz - qw * qw - qx * qx
+    sagittal_y = 2.0 * (qx * qy + qz * qw)
+    sagittal_z = 2.0 * (qx * qz - qy * qw)
+    cos_pitch = np.hypot(sagittal_x, sagittal_y)
+    upside_down = qw * qw - qx * qx - qy * qy + qz * qz < 0.0
+    cos_pitch[upside_down] *= -1.0
+    return np.arctan2(-sagittal_z, cos_pitch)
+
+
 def compute_base_angular_velocity_from_imu(
     angular_velocity_imu_in_imu: NDArray[float],
+    imu_frame: Optional[ImuFrame] = None,
 ) -> NDArray[float]:
     r"""!
     Compute the body angular velocity of the base from IMU readings.
 
     @param angular_velocity_imu_in_imu Angular velocity from the IMU.
+    @param imu_frame IMU frame. When not specified, the default Upkie
+        mounting orientation is used.
     @returns Body angular velocity of the base frame.
 
     Calculation checks:
@@ -149,10 +391,9 @@ def compute_base_angular_velocity_from_imu(
 
     Thus \f${}_B \omega_{WB} = R_{BI} {}_I \omega_{WI}\f$.
     """
-    # TODO(scaron): move to config
-    rotation_base_to_imu = np.diag([-1.0, 1.0, -1.0])
-    rotation_imu_to_base = rotation_base_to_imu.T
+    if imu_frame is None:
+        imu_frame = DEFAULT_IMU_FRAME
     angular_velocity_base_in_base = (
-        rotation_imu_to_base @ angular_velocity_imu_in_imu
+        imu_frame.rotation_imu_to_base @ angular_velocity_imu_in_imu
     )
     return angular_velocity_base_in_base
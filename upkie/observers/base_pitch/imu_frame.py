@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.spatial.transform import Rotation as ScipyRotation
+
+from upkie.utils.rotations import rotation_matrix_from_quaternion
+
+## Rotation from the attitude reference system (ARS) frame of the IMU, with
+## +x forward, +y right and +z down, to the world frame, with +x forward, +y
+## left and +z up. See the [pi3hat
+## reference](https://github.com/mjbots/pi3hat/blob/ab632c82bd501b9fcb6f8200df0551989292b7a1/docs/reference.md#orientation).
+ROTATION_ARS_TO_WORLD = np.diag([1.0, -1.0, -1.0])
+
+## Default Upkie mounting orientation: USB connectors of the raspi pointing
+## to the left of the robot (XT-30 of the pi3hat to the right).
+DEFAULT_ROTATION_BASE_TO_IMU = np.diag([-1.0, 1.0, -1.0])
+
+
+class ImuFrame:
+
+    """!
+    Mounting orientation of the IMU on the base, with the rotations used by
+    base observers computed once.
+
+    Upkies usually share the default mounting orientation. Robots with a
+    different mounting can configure it in the ``imu`` section of their
+    spine configuration, see :func:`from_config`.
+    """
+
+    is_default: bool
+    quat_correction: Tuple[float, float, float, float]
+    rotation_base_to_imu: NDArray[float]
+    rotation_imu_to_base: NDArray[float]
+
+    def __init__(self, rotation_base_to_imu: Optional[NDArray[float]] = None):
+        """!
+        Initialize IMU frame.
+
+        @param rotation_base_to_imu Rotation matrix from the base frame to the
+            IMU frame. When not specified, the default Upkie mounting
+            orientation is used.
+        @raise ValueError If the matrix is not a rotation matrix.
+        """
+        if rotation_base_to_imu is None:
+            rotation_base_to_imu = DEFAULT_ROTATION_BASE_TO_IMU
+        rotation_base_to_imu = np.array(rotation_base_to_imu, dtype=float)
+        if rotation_base_to_imu.shape != (3, 3) or not np.allclose(
+            rotation_base_to_imu @ rotation_base_to_imu.T, np.eye(3)
+        ):
+            raise ValueError(
+                f"Matrix {rotation_base_to_imu.tolist()} is not orthogonal"
+            )
+        if np.linalg.det(rotation_base_to_imu) < 0.0:
+            raise ValueError(
+                f"Matrix {rotation_base_to_imu.tolist()} is not a rotation"
+            )
+
+        # Rotation from the default mounting to the actual mounting, such
+        # that rotation_imu_to_ars @ rotation_base_to_imu is the rotation of
+        # the quaternion product (quat_imu_in_ars * quat_correction) times
+        # DEFAULT_ROTATION_BASE_TO_IMU
+        rotation_correction = (
+            rotation_base_to_imu @ DEFAULT_ROTATION_BASE_TO_IMU.T
+        )
+        qx, qy, qz, qw = ScipyRotation.from_matrix(
+            rotation_correction
+        ).as_quat()
+
+        self.is_default = bool(
+            np.allclose(rotation_base_to_imu, DEFAULT_ROTATION_BASE_TO_IMU)
+        )
+        self.quat_correction = (float(qw), float(qx), float(qy), float(qz))
+        self.rotation_base_to_imu = rotation_base_to_imu
+        self.rotation_imu_to_base = rotation_base_to_imu.T.copy()
+
+    @staticmethod
+    def from_config(spine_config: dict) -> "ImuFrame":
+        """!
+        Get the IMU frame from a spine configuration.
+
+        @param spine_config Spine configuration dictionary. The mounting
+            orientation is read from its ``imu.orientation_base_in_imu``
+            quaternion, in ``[w, x, y, z]`` format, if present.
+        @returns IMU frame, with the default mounting orientation if the
+            configuration does not specify one.
+        @raise ValueError If the quaternion is not normalized.
+        """
+        try:
+            quat_base_in_imu = spine_config["imu"]["orientation_base_in_imu"]
+        except KeyError:
+            return ImuFrame()
+        return ImuFrame(rotation_matrix_from_quaternion(quat_base_in_imu))
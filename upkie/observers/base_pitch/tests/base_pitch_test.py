@@ -13,8 +13,15 @@ import unittest
 import numpy as np
 
 from upkie.observers.base_pitch import (
+    ImuFrame,
+    compute_base_orientation_from_imu,
+    compute_base_orientations_from_imu,
     compute_base_pitch_from_imu,
+    compute_base_pitch_from_quaternion,
+    compute_base_pitches_from_imu,
+    compute_base_pitches_from_quaternions,
     compute_pitch_frame_in_parent,
+    compute_pitch_frames_in_parent,
 )
 
 
@@ -80,6 +87,191 @@ class TestBasePitch(unittest.TestCase):
         )
         self.assertAlmostEqual(pitch_base_in_world, -0.016, places=3)
 
+    def test_batched_same_as_single(self):
+        """
+        Check batched functions against their single-sample counterparts.
+        """
+        rng = np.random.default_rng(42)
+        quats = rng.normal(size=(100, 4))
+        quats /= np.linalg.norm(quats, axis=1, keepdims=True)
+        rotation_base_to_imu = np.array(
+            [[0.0, -1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]]
+        )
+        for rotation in (None, rotation_base_to_imu):
+            orientations = compute_base_orientations_from_imu(quats, rotation)
+            pitches = compute_base_pitches_from_imu(quats, rotation)
+            self.assertEqual(orientations.shape, (100, 3, 3))
+            self.assertEqual(pitches.shape, (100,))
+            for i, quat in enumerate(quats):
+                self.assertTrue(
+                    np.allclose(
+                        orientations[i],
+                        compute_base_orientation_from_imu(quat, rotation),
+                        rtol=0.0,
+                        atol=1e-15,
+                    )
+                )
+                self.assertAlmostEqual(
+                    pitches[i],
+                    compute_base_pitch_from_imu(quat, rotation),
+                    places=12,
+                )
+
+    def test_batched_edge_cases(self, theta=0.3):
+        """
+        Check heading flips of upside-down frames and vertical sagittal
+        vectors in the batched pitch computation.
+        """
+        pitch_rotation = np.array(
+            [
+                [np.cos(theta), 0.0, np.sin(theta)],
+                [0.0, 1.0, 0.0],
+                [-np.sin(theta), 0.0, np.cos(theta)],
+            ]
+        )
+        upside_down = pitch_rotation @ np.diag([1.0, -1.0, -1.0])
+        vertical_sagittal = np.array(
+            [[0.0, 0.0, -1.0], [0.0, 1.0, 0.0], [1.0, 0.0, 0.0]]
+        )
+        orientations = np.stack(
+            [np.eye(3), pitch_rotation, upside_down, vertical_sagittal]
+        )
+        with np.errstate(invalid="ignore"):
+            pitches = compute_pitch_frames_in_parent(orientations.copy())
+            for i, orientation in enumerate(orientations):
+                pitch = compute_pitch_frame_in_parent(orientation.copy())
+                if np.isnan(pitch):
+                    self.assertTrue(np.isnan(pitches[i]))
+                else:
+                    self.assertAlmostEqual(pitches[i], pitch, places=12)
+        self.assertEqual(pitches[0], 0.0)
+        self.assertAlmostEqual(pitches[1], theta)
+        self.assertTrue(np.isnan(pitches[3]))
+
+    def test_batched_not_normalized(self):
+        quats = np.array([[1.0, 0.0, 0.0, 0.0], [1.0, 1.0, 0.0, 0.0]])
+        with self.assertRaises(ValueError):
+            compute_base_pitches_from_imu(quats)
+
+
+class TestBasePitchFromQuaternion(unittest.TestCase):
+    """
+    Property-based checks of the closed-form pitch computation on randomly
+    sampled quaternions.
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        quats = rng.normal(size=(10_000, 4))
+        quats /= np.linalg.norm(quats, axis=1, keepdims=True)
+        self.quats = quats
+        self.rng = rng
+
+    def assertSameAngle(self, a: float, b: float, tol: float):
+        difference = (a - b + np.pi) % (2.0 * np.pi) - np.pi
+        self.assertLess(abs(difference), tol)
+
+    def test_same_as_matrix_path(self):
+        """
+        Closed form agrees with the rotation-matrix computation. Tolerance
+        accounts for the arccos in the matrix computation, which loses half
+        of the significant digits of its input around zero pitch.
+        """
+        default_mounting = np.diag([-1.0, 1.0, -1.0])
+        for quat in self.quats:
+            self.assertSameAngle(
+                compute_base_pitch_from_imu(quat),
+                compute_base_pitch_from_imu(quat, default_mounting),
+                tol=1e-7,
+            )
+
+    def test_default_fast_path(self):
+        for quat in self.quats[:100]:
+            self.assertEqual(
+                compute_base_pitch_from_imu(quat),
+                compute_base_pitch_from_quaternion(quat),
+            )
+            self.assertEqual(
+                compute_base_pitch_from_quaternion(quat),
+                compute_base_pitch_from_quaternion(list(quat)),
+            )
+
+    def test_opposite_quaternion(self):
+        """
+        Quaternions q and -q represent the same rotation.
+        """
+        for quat in self.quats:
+            self.assertEqual(
+                compute_base_pitch_from_quaternion(quat),
+                compute_base_pitch_from_quaternion(-quat),
+            )
+
+    def test_yaw_invariance(self):
+        """
+        Pitch does not depend on rotations around the vertical axis.
+        """
+        for quat in self.quats[:1000]:
+            half_yaw = self.rng.uniform(-np.pi, np.pi)
+            qw, qx, qy, qz = quat
+            cz, sz = np.cos(half_yaw), np.sin(half_yaw)
+            yawed_quat = [  # rotation around the ARS z-axis, then quat
+                cz * qw - sz * qz,
+                cz * qx - sz * qy,
+                cz * qy + sz * qx,
+                cz * qz + sz * qw,
+            ]
+            self.assertSameAngle(
+                compute_base_pitch_from_quaternion(yawed_quat),
+                compute_base_pitch_from_quaternion(quat),
+                tol=1e-12,
+            )
+
+    def test_pure_pitch(self):
+        """
+        Pure rotations around the lateral axis are recovered to machine
+        precision, including small angles.
+        """
+        for pitch in np.concatenate(
+            [self.rng.uniform(-np.pi / 2, np.pi / 2, 1000), [1e-9, -1e-6]]
+        ):
+            quat = [np.cos(pitch / 2), 0.0, np.sin(pitch / 2), 0.0]
+            self.assertAlmostEqual(
+                compute_base_pitch_from_quaternion(quat),
+                pitch,
+                delta=1e-15 + 1e-15 * abs(pitch),
+            )
+
+    def test_not_normalized(self):
+        with self.assertRaises(ValueError):
+            compute_base_pitch_from_quaternion([1.0, 0.1, 0.0, 0.0])
+
+    def test_batched_same_as_single(self):
+        imu_frame = ImuFrame(
+            np.array([[0.0, -1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+        )
+        for frame in (None, imu_frame):
+            pitches = compute_base_pitches_from_quaternions(self.quats, frame)
+            self.assertEqual(pitches.shape, (len(self.quats),))
+            for quat, pitch in zip(self.quats[:1000], pitches):
+                self.assertAlmostEqual(
+                    pitch,
+                    compute_base_pitch_from_quaternion(quat, frame),
+                    places=14,
+                )
+
+    def test_batched_vertical_sagittal(self):
+        """
+        Batched closed form agrees with the single-quaternion function, not
+        with the matrix computation, when the base lies horizontally.
+        """
+        half = np.sqrt(0.5)
+        quats = np.array([[half, 0.0, half, 0.0], [half, 0.0, -half, 0.0]])
+        pitches = compute_base_pitches_from_quaternions(quats)
+        for quat, pitch in zip(quats, pitches):
+            self.assertFalse(np.isnan(pitch))
+            self.assertEqual(pitch, compute_base_pitch_from_quaternion(quat))
+        self.assertAlmostEqual(abs(pitches[0]), np.pi / 2)
+
 
 if __name__ == "__main__":
     unittest.main()
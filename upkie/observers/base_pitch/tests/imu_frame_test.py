@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""
+Test IMU frame.
+"""
+
+import unittest
+
+import numpy as np
+from scipy.spatial.transform import Rotation as ScipyRotation
+
+from upkie.config import SPINE_CONFIG
+from upkie.observers.base_pitch import (
+    DEFAULT_IMU_FRAME,
+    ImuFrame,
+    compute_base_angular_velocity_from_imu,
+    compute_base_orientation_from_imu,
+    compute_base_orientations_from_imu,
+    compute_base_pitch_from_imu,
+    compute_base_pitch_from_quaternion,
+    compute_base_pitches_from_imu,
+)
+
+
+class TestImuFrame(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        quats = rng.normal(size=(1000, 4))
+        quats /= np.linalg.norm(quats, axis=1, keepdims=True)
+        self.quats = quats
+        self.rng = rng
+
+    def test_default(self):
+        self.assertTrue(DEFAULT_IMU_FRAME.is_default)
+        self.assertTrue(
+            np.allclose(
+                DEFAULT_IMU_FRAME.rotation_base_to_imu,
+                np.diag([-1.0, 1.0, -1.0]),
+            )
+        )
+        self.assertTrue(np.allclose(DEFAULT_IMU_FRAME.quat_correction[0], 1))
+
+    def test_from_config(self):
+        imu_frame = ImuFrame.from_config(SPINE_CONFIG)
+        self.assertTrue(imu_frame.is_default)
+        self.assertTrue(
+            np.allclose(
+                imu_frame.rotation_base_to_imu,
+                DEFAULT_IMU_FRAME.rotation_base_to_imu,
+            )
+        )
+        self.assertTrue(ImuFrame.from_config({}).is_default)
+        imu_frame = ImuFrame.from_config(
+            {"imu": {"orientation_base_in_imu": [0.0, 0.0, 0.0, 1.0]}}
+        )
+        self.assertFalse(imu_frame.is_default)
+        self.assertTrue(
+            np.allclose(
+                imu_frame.rotation_base_to_imu, np.diag([-1.0, -1.0, 1.0])
+            )
+        )
+
+    def test_invalid_rotation(self):
+        with self.assertRaises(ValueError):
+            ImuFrame(np.diag([1.0, 1.0, 2.0]))
+        with self.assertRaises(ValueError):
+            ImuFrame(np.diag([1.0, 1.0, -1.0]))  # reflection
+        with self.assertRaises(ValueError):
+            ImuFrame.from_config(
+                {"imu": {"orientation_base_in_imu": [1.0, 1.0, 0.0, 0.0]}}
+            )
+
+    def test_rotation_and_frame_exclusive(self):
+        with self.assertRaises(ValueError):
+            compute_base_orientation_from_imu(
+                self.quats[0],
+                DEFAULT_IMU_FRAME.rotation_base_to_imu,
+                DEFAULT_IMU_FRAME,
+            )
+
+    def test_same_as_rotation_matrix(self):
+        """
+        Functions give the same results with an IMU frame as with its
+        rotation matrix, for random mounting orientations.
+        """
+        for seed in range(10):
+            rotation_base_to_imu = ScipyRotation.random(
+                random_state=seed
+            ).as_matrix()
+            imu_frame = ImuFrame(rotation_base_to_imu)
+            self.assertTrue(
+                np.allclose(
+                    compute_base_orientations_from_imu(
+                        self.quats, imu_frame=imu_frame
+                    ),
+                    compute_base_orientations_from_imu(
+                        self.quats, rotation_base_to_imu
+                    ),
+                )
+            )
+            pitches = compute_base_pitches_from_imu(
+                self.quats, imu_frame=imu_frame
+            )
+            for quat, pitch in zip(self.quats, pitches):
+                closed_form_pitch = compute_base_pitch_from_imu(
+                    quat, imu_frame=imu_frame
+                )
+                self.assertEqual(
+                    closed_form_pitch,
+                    compute_base_pitch_from_quaternion(quat, imu_frame),
+                )
+                matrix_pitch = compute_base_pitch_from_imu(
+                    quat, rotation_base_to_imu
+                )
+                for reference in (matrix_pitch, pitch):
+                    difference = (
+                        closed_form_pitch - reference + np.pi
+                    ) % (2.0 * np.pi) - np.pi
+                    self.assertLess(abs(difference), 1e-7)
+            angular_velocity = self.rng.normal(size=3)
+            self.assertTrue(
+                np.allclose(
+                    compute_base_angular_velocity_from_imu(
+                        angular_velocity, imu_frame
+                    ),
+                    rotation_base_to_imu.T @ angular_velocity,
+                )
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()  # necessary for `bazel test`
@@ -0,0 +1,75 @@
+// SPDX-License-Identifier: Apache-2.0
+// Copyright 2024 Inria
+
+#include <palimpsest/Dictionary.h>
+
+#include <memory>
+
+#include "gtest/gtest.h"
+#include "upkie/observers/ActionChunk.h"
+
+namespace upkie::observers::tests {
+
+using palimpsest::Dictionary;
+
+class ActionChunkTest : public ::testing::Test {
+ protected:
+  void SetUp() override {
+    ActionChunk::Parameters params;
+    params.keys = {"imu", "servo"};
+    action_chunk_ = std::make_unique<ActionChunk>(params);
+    action_chunk_->reset(Dictionary{});
+  }
+
+  //! Run one spine cycle of the observer.
+  void cycle(Dictionary& observation) {
+    action_chunk_->read(observation);
+    action_chunk_->write(observation);
+  }
+
+ protected:
+  //! Observer
+  std::unique_ptr<ActionChunk> action_chunk_;
+};
+
+TEST_F(ActionChunkTest, NoChunk) {
+  Dictionary observation;
+  cycle(observation);
+  ASSERT_EQ(observation("action_chunk").get<int>("nb_observed"), 0);
+}
+
+TEST_F(ActionChunkTest, RecordObservations) {
+  Dictionary observation;
+  observation("action_chunk")("id") = 1;
+  for (int i = 0; i < 3; ++i) {
+    observation("action_chunk")("nb_played") = i;
+    observation("servo")("left_wheel")("velocity") = 0.1 * i;
+    observation("cpu_temperature") = 42.0;
+    cycle(observation);
+    ASSERT_EQ(observation("action_chunk").get<int>("nb_observed"), i);
+  }
+  const auto& observations = observation("action_chunk")("observations");
+  ASSERT_TRUE(observations.has("0"));
+  ASSERT_TRUE(observations.has("1"));
+  ASSERT_FALSE(observations.has("2"));
+  ASSERT_DOUBLE_EQ(
+      observations("1")("servo")("left_wheel").get<double>("velocity"), 0.2);
+  ASSERT_FALSE(observations("1").has("imu"));
+  ASSERT_FALSE(observations("1").has("cpu_temperature"));
+}
+
+TEST_F(ActionChunkTest, NewChunk) {
+  Dictionary observation;
+  observation("servo")("left_wheel")("velocity") = 1.0;
+  observation("action_chunk")("id") = 1;
+  observation("action_chunk")("nb_played") = 2;
+  cycle(observation);
+  ASSERT_EQ(observation("action_chunk").get<int>("nb_observed"), 2);
+  observation("action_chunk")("id") = 2;
+  observation("action_chunk")("nb_played") = 0;
+  cycle(observation);
+  ASSERT_EQ(observation("action_chunk").get<int>("nb_observed"), 0);
+  ASSERT_FALSE(observation("action_chunk")("observations").has("1"));
+}
+
+}  // namespace upkie::observers::tests
@@ -15,3 +15,7 @@ class FallDetected(UpkieException):
 
 class ModelError(UpkieException):
     """Error related to the robot model."""
+
+
+class SpineError(UpkieException):
+    """Error raised when a spine process fails."""
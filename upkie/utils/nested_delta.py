@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+## Types of leaves compared by value.
+SCALAR_TYPES = (bool, float, int, str)
+
+_MISSING = object()
+
+
+def nested_delta(new_dict: dict, last_dict: dict) -> dict:
+    """!
+    Compute the leaves of a dictionary that changed since its last value.
+
+    Consider the following example:
+
+        >>> last = {}
+        >>> nested_delta({"a": {"b": 1, "c": 2}}, last)
+        {'a': {'b': 1, 'c': 2}}
+        >>> nested_delta({"a": {"b": 1, "c": 3}}, last)
+        {'a': {'c': 3}}
+        >>> nested_delta({"a": {"b": 1, "c": 3}}, last)
+        {}
+
+    Scalar leaves are compared by value, with NaNs equal to each other. Other
+    leaves, such as lists or arrays, are always considered changed.
+
+    @param new_dict New value of the dictionary.
+    @param last_dict Last known value of the dictionary, updated in place with
+        the new one.
+    @returns Dictionary with only the leaves that changed.
+    """
+    delta = {}
+    for key, value in new_dict.items():
+        value_type = type(value)
+        if value_type is dict:
+            last_value = last_dict.get(key)
+            if type(last_value) is not dict:
+                last_value = last_dict[key] = {}
+            sub_delta = nested_delta(value, last_value)
+            if sub_delta:
+                delta[key] = sub_delta
+        elif value_type in SCALAR_TYPES or isinstance(value, float):
+            last_value = last_dict.get(key, _MISSING)
+            if last_value == value or (
+                value != value and last_value != last_value  # both NaN
+            ):
+                continue
+            last_dict[key] = value
+            delta[key] = value
+        else:  # not compared
+            last_dict.pop(key, None)
+            delta[key] = value
+    return delta
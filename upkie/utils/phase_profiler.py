@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+from time import perf_counter
+from typing import Dict, Sequence
+
+import numpy as np
+
+from .exceptions import UpkieException
+
+
+class PhaseProfiler:
+
+    """!
+    Measure durations of the successive phases of a loop.
+
+    Durations are stored in a preallocated rolling window, so that recording a
+    phase does not allocate memory. Percentiles are only computed when
+    statistics are requested.
+
+    Usage:
+
+        >>> profiler = PhaseProfiler(["observe", "act"])
+        >>> profiler.start()
+        >>> observe()
+        >>> profiler.lap(0)
+        >>> act()
+        >>> profiler.lap(1)
+        >>> profiler.next_cycle()
+    """
+
+    phases: Sequence[str]
+    window: int
+
+    def __init__(self, phases: Sequence[str], window: int = 1000):
+        """!
+        Initialize profiler.
+
+        @param phases Names of the phases of a cycle.
+        @param window Number of cycles over which statistics are computed.
+        """
+        if window < 1:
+            raise UpkieException(f"Profiling window {window=} is empty")
+        self.__count = 0
+        self.__durations = np.zeros((len(phases), window))
+        self.__index = 0
+        self.__last = np.zeros(len(phases))
+        self.__mark = perf_counter()
+        self.phases = tuple(phases)
+        self.window = window
+
+    def start(self) -> None:
+        """!
+        Start measuring time from now.
+        """
+        self.__mark = perf_counter()
+
+    def lap(self, phase: int) -> None:
+        """!
+        Record the duration of a phase since the last call to either
+        :func:`start` or :func:`lap`.
+
+        @param phase Index of the phase in ``phases``.
+        """
+        now = perf_counter()
+        self.__durations[phase, self.__index] = now - self.__mark
+        self.__mark = now
+
+    def next_cycle(self) -> None:
+        """!
+        Close the current cycle and move on to the next one.
+        """
+        self.__last[:] = self.__durations[:, self.__index]
+        self.__index = (self.__index + 1) % self.window
+        self.__count = min(self.__count + 1, self.window)
+
+    @property
+    def nb_cycles(self) -> int:
+        """!
+        Number of cycles in the rolling window.
+        """
+        return self.__count
+
+    def get_last(self) -> Dict[str, float]:
+        """!
+        Get phase durations of the last completed cycle.
+
+        @returns Dictionary mapping phase names to durations in seconds.
+        """
+        return {
+            phase: float(duration)
+            for phase, duration in zip(self.phases, self.__last)
+        }
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """!
+        Get statistics of phase durations over the rolling window.
+
+        @returns Dictionary mapping phase names to dictionaries with ``p50``,
+            ``p99`` and ``max`` durations in seconds.
+        """
+        if self.__count < 1:
+            return {}
+        durations = self.__durations[:, : self.__count]
+        p50, p99 = np.percentile(durations, [50.0, 99.0], axis=1)
+        max_durations = durations.max(axis=1)
+        return {
+            phase: {
+                "p50": float(p50[i]),
+                "p99": float(p99[i]),
+                "max": float(max_durations[i]),
+            }
+            for i, phase in enumerate(self.phases)
+        }
@@ -4,15 +4,21 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright 2023 Inria
 
-from typing import Tuple
+import functools
+import os
+import tempfile
+from importlib.metadata import PackageNotFoundError, version
+from typing import TYPE_CHECKING, NamedTuple, Optional, Tuple
 
 import numpy as np
-import pinocchio as pin
 from numpy.typing import NDArray
 
+if TYPE_CHECKING:  # pinocchio is imported lazily
+    import pinocchio as pin
+
 
 def box_position_limits(
-    model: pin.Model,
+    model: "pin.Model",
 ) -> Tuple[NDArray[float], NDArray[float]]:
     r"""!
     Compute position limits in box format:
@@ -37,7 +43,7 @@ def box_position_limits(
 
 
 def box_velocity_limits(
-    model: pin.Model,
+    model: "pin.Model",
 ) -> Tuple[NDArray[float], NDArray[float]]:
     r"""!
     Compute velocity limits in box format:
@@ -60,7 +66,7 @@ def box_velocity_limits(
 
 
 def box_torque_limits(
-    model: pin.Model,
+    model: "pin.Model",
 ) -> Tuple[NDArray[float], NDArray[float]]:
     r"""!
     Compute velocity limits in box format:
@@ -80,3 +86,132 @@ def box_torque_limits(
     tau_max = model.effortLimit.copy()
     tau_max[no_torque_limit] = np.inf
     return tau_max
+
+
+class RobotLimits(NamedTuple):
+    """!
+    Joint limits of the robot model, with one entry per joint in the order of
+    the model. Arrays are read-only as they are shared between callers.
+    """
+
+    ## Names of the joints of the model.
+    joint_names: Tuple[str, ...]
+
+    ## Lower position limits, with -infinity where there is no limit.
+    q_min: NDArray[float]
+
+    ## Upper position limits, with +infinity where there is no limit.
+    q_max: NDArray[float]
+
+    ## Velocity limits, with +infinity where there is no limit.
+    v_max: NDArray[float]
+
+    ## Torque limits, with +infinity where there is no limit.
+    tau_max: NDArray[float]
+
+
+@functools.lru_cache(maxsize=None)
+def load_robot_model() -> "pin.RobotWrapper":
+    """!
+    Load the robot description in Pinocchio, with a fixed base.
+
+    The model is loaded once per process, then shared by all callers, which
+    should therefore not modify it. Pinocchio is only imported upon the first
+    call to this function.
+
+    @returns Pinocchio robot wrapper.
+    """
+    from upkie_description import load_in_pinocchio
+
+    return load_in_pinocchio(root_joint=None)
+
+
+def compute_robot_limits(model: "pin.Model") -> RobotLimits:
+    """!
+    Compute joint limits from a model whose joints have one degree of freedom
+    each.
+
+    @param model Pinocchio model.
+    @returns Joint limits of the model.
+    """
+    q_min, q_max = box_position_limits(model)
+    v_max = box_velocity_limits(model)
+    tau_max = box_torque_limits(model)
+    joint_names = tuple(model.names)[1:]
+    joints = [model.joints[model.getJointId(name)] for name in joint_names]
+    idx_q = [joint.idx_q for joint in joints]
+    idx_v = [joint.idx_v for joint in joints]
+    return RobotLimits(
+        joint_names=joint_names,
+        q_min=q_min[idx_q],
+        q_max=q_max[idx_q],
+        v_max=v_max[idx_v],
+        tau_max=tau_max[idx_v],
+    )
+
+
+def _get_cache_path(cache_dir: str) -> Optional[str]:
+    try:
+        description_version = version("upkie_description")
+    except PackageNotFoundError:
+        return None
+    filename = f"upkie_description-{description_version}-limits.npz"
+    return os.path.join(cache_dir, filename)
+
+
+def _load_limits(path: str) -> Optional[RobotLimits]:
+    try:
+        with np.load(path) as data:
+            return RobotLimits(
+                joint_names=tuple(str(name) for name in data["joint_names"]),
+                q_min=data["q_min"],
+                q_max=data["q_max"],
+                v_max=data["v_max"],
+                tau_max=data["tau_max"],
+            )
+    except (KeyError, OSError, ValueError):  # missing or invalid file
+        return None
+
+
+def _save_limits(limits: RobotLimits, path: str) -> None:
+    cache_dir = os.path.dirname(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            np.savez(
+                file,
+                joint_names=np.array(limits.joint_names),
+                q_min=limits.q_min,
+                q_max=limits.q_max,
+                v_max=limits.v_max,
+                tau_max=limits.tau_max,
+            )
+        os.replace(tmp_path, path)  # atomic for concurrent processes
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+@functools.lru_cache(maxsize=None)
+def get_robot_limits(cache_dir: Optional[str] = None) -> RobotLimits:
+    """!
+    Get joint limits of the robot description.
+
+    Limits are computed once per process. If a cache directory is provided,
+    they are also saved there to a small npz file keyed by the version of the
+    robot description, so that later processes load this file rather than
+    the whole description. Pinocchio is not imported in that case.
+
+    @param cache_dir Optional directory where limits are persisted.
+    @returns Joint limits of the robot description.
+    """
+    path = _get_cache_path(cache_dir) if cache_dir is not None else None
+    limits = _load_limits(path) if path is not None else None
+    if limits is None:
+        limits = compute_robot_limits(load_robot_model().model)
+        if path is not None:
+            _save_limits(limits, path)
+    for array in limits[1:]:
+        array.flags.writeable = False
+    return limits
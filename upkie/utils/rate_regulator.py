@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+from bisect import bisect_right
+from time import perf_counter, sleep
+from typing import List, Tuple
+
+from .exceptions import UpkieException
+from .spdlog import logging
+
+
+class RateRegulator:
+
+    """!
+    Regulate the frequency of a loop and keep statistics on its timing.
+
+    This class has the same interface as ``loop_rate_limiters.RateLimiter``.
+    In addition, it counts deadline misses (calls to :func:`sleep` arriving
+    after the clock tick) and consecutive overruns, and it records the jitter,
+    that is, the delay between the clock tick and the time :func:`sleep`
+    returns. Jitters are summarized by their mean, standard deviation, maximum
+    and a histogram with fixed bins, so that statistics take constant memory
+    however long the loop runs.
+
+    The operating system usually wakes a sleeping process a bit after the
+    requested time. When ``spin_duration`` is positive, the regulator sleeps
+    until that duration before the clock tick, then busy-waits for the
+    remaining time. This reduces jitter at the cost of CPU time.
+    """
+
+    ## Upper bounds of jitter histogram bins, in seconds. The last bin
+    ## collects all jitters above the last bound.
+    JITTER_BINS: Tuple[float, ...] = (
+        10e-6,
+        20e-6,
+        50e-6,
+        100e-6,
+        200e-6,
+        500e-6,
+        1e-3,
+        2e-3,
+        5e-3,
+        10e-3,
+    )
+
+    name: str
+    spin_duration: float
+    warn: bool
+
+    def __init__(
+        self,
+        frequency: float,
+        name: str = "rate regulator",
+        spin_duration: float = 0.0,
+        warn: bool = True,
+    ):
+        """!
+        Initialize rate regulator.
+
+        @param frequency Desired frequency in Hz.
+        @param name Human-readable name used for logging.
+        @param spin_duration Duration before each clock tick, in seconds,
+            during which the regulator busy-waits rather than sleeps.
+        @param warn If set, warn when a call to :func:`sleep` is late by more
+            than 10% of the period.
+        @raise UpkieException If the frequency or spin duration are invalid.
+        """
+        if frequency <= 0.0:
+            raise UpkieException(f"Invalid rate {frequency=}")
+        if spin_duration < 0.0:
+            raise UpkieException(f"Invalid {spin_duration=}")
+        self.__period = 1.0 / frequency
+        self.name = name
+        self.spin_duration = spin_duration
+        self.warn = warn
+        self.reset_stats()
+        self.restart()
+
+    @property
+    def dt(self) -> float:
+        """!
+        Desired period between two calls to :func:`sleep`, in seconds.
+        """
+        return self.__period
+
+    @property
+    def period(self) -> float:
+        """!
+        Desired period between two calls to :func:`sleep`, in seconds.
+        """
+        return self.__period
+
+    @property
+    def next_tick(self) -> float:
+        """!
+        Time of the next clock tick.
+        """
+        return self.__next_tick
+
+    @property
+    def slack(self) -> float:
+        """!
+        Duration between the last call to :func:`sleep` and its clock tick, in
+        seconds. Negative slacks are deadline misses.
+        """
+        return self.__slack
+
+    @property
+    def consecutive_overruns(self) -> int:
+        """!
+        Number of deadline misses since the last call to :func:`sleep` that
+        arrived in time.
+        """
+        return self.__consecutive_overruns
+
+    @property
+    def deadline_misses(self) -> int:
+        """!
+        Number of calls to :func:`sleep` that arrived after their clock tick.
+        """
+        return self.__deadline_misses
+
+    def remaining(self) -> float:
+        """!
+        Get the time remaining until the next clock tick.
+
+        @returns Time remaining until the next clock tick, in seconds.
+        """
+        return self.__next_tick - perf_counter()
+
+    def restart(self) -> None:
+        """!
+        Start a new clock with a first tick one period from now.
+
+        Statistics are kept. Call :func:`reset_stats` to clear them as well.
+        """
+        self.__next_tick = perf_counter() + self.__period
+        self.__slack = 0.0
+
+    def reset_stats(self) -> None:
+        """!
+        Forget all timing statistics.
+        """
+        self.__consecutive_overruns = 0
+        self.__count = 0
+        self.__deadline_misses = 0
+        self.__jitter_histogram = [0] * (len(self.JITTER_BINS) + 1)
+        self.__jitter_m2 = 0.0
+        self.__jitter_max = 0.0
+        self.__jitter_mean = 0.0
+        self.__max_consecutive_overruns = 0
+
+    def sleep(self) -> None:
+        """!
+        Wait until the next clock tick, then update statistics.
+        """
+        next_tick = self.__next_tick
+        slack = next_tick - perf_counter()
+        if slack > 0.0:
+            if slack > self.spin_duration:
+                sleep(slack - self.spin_duration)
+            while perf_counter() < next_tick:
+                pass
+        now = perf_counter()
+        self.__slack = slack
+        self.__next_tick = now + self.__period
+        self.__update_stats(slack, jitter=now - next_tick)
+
+    def __update_stats(self, slack: float, jitter: float) -> None:
+        self.__count += 1
+        if slack < 0.0:
+            self.__deadline_misses += 1
+            self.__consecutive_overruns += 1
+            if self.__consecutive_overruns > self.__max_consecutive_overruns:
+                self.__max_consecutive_overruns = self.__consecutive_overruns
+            if self.warn and slack < -0.1 * self.__period:
+                logging.warning(
+                    "%s is late by %.1f [ms]",
+                    self.name,
+                    round(-1e3 * slack, 1),
+                )
+        else:
+            self.__consecutive_overruns = 0
+        delta = jitter - self.__jitter_mean
+        self.__jitter_mean += delta / self.__count
+        self.__jitter_m2 += delta * (jitter - self.__jitter_mean)
+        if jitter > self.__jitter_max:
+            self.__jitter_max = jitter
+        self.__jitter_histogram[bisect_right(self.JITTER_BINS, jitter)] += 1
+
+    def get_jitter_histogram(self) -> List[int]:
+        """!
+        Get the histogram of jitters.
+
+        @returns Number of jitters in each bin, where bin ``i`` counts jitters
+            below ``JITTER_BINS[i]`` and the last bin counts jitters above all
+            bounds.
+        """
+        return list(self.__jitter_histogram)
+
+    def get_jitter_percentile(self, percent: float) -> float:
+        """!
+        Get an upper bound on a jitter percentile from the histogram.
+
+        @param percent Percentile, between 0 and 100.
+        @returns Upper bound of the histogram bin containing the percentile,
+            in seconds. The maximum jitter is returned for the last bin.
+        """
+        if self.__count < 1:
+            return 0.0
+        threshold = percent * self.__count / 100.0
+        cumulated = 0
+        for i, bound in enumerate(self.JITTER_BINS):
+            cumulated += self.__jitter_histogram[i]
+            if cumulated >= threshold:
+                return min(bound, self.__jitter_max)
+        return self.__jitter_max
+
+    def get_stats(self) -> dict:
+        """!
+        Get timing statistics since the last call to :func:`reset_stats`.
+
+        @returns Dictionary with the number of calls to :func:`sleep`
+            (``count``), deadline misses, current and maximum numbers of
+            consecutive overruns, and jitter statistics in seconds.
+        """
+        variance = (
+            self.__jitter_m2 / (self.__count - 1) if self.__count > 1 else 0.0
+        )
+        return {
+            "count": self.__count,
+            "deadline_misses": self.__deadline_misses,
+            "consecutive_overruns": self.__consecutive_overruns,
+            "max_consecutive_overruns": self.__max_consecutive_overruns,
+            "jitter": {
+                "mean": self.__jitter_mean,
+                "std": variance**0.5,
+                "max": self.__jitter_max,
+                "p50": self.get_jitter_percentile(50.0),
+                "p99": self.get_jitter_percentile(99.0),
+                "histogram": self.get_jitter_histogram(),
+            },
+        }
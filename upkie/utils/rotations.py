@@ -46,3 +46,37 @@ def rotation_matrix_from_quaternion(
             ],
         ]
     )
+
+
+def rotation_matrices_from_quaternions(
+    quats: NDArray[float],
+) -> NDArray[float]:
+    """!
+    Convert an array of unit quaternions to the matrices representing the
+    same rotations.
+
+    @param quats Array of shape ``(N, 4)`` of unit quaternions to convert, in
+        ``[w, x, y, z]`` format.
+    @return Array of shape ``(N, 3, 3)`` of rotation matrices.
+    @raise ValueError If a quaternion is not normalized.
+
+    This is the batched counterpart of @ref rotation_matrix_from_quaternion.
+    """
+    quats = np.asarray(quats, dtype=float)
+    squared_norms = np.einsum("ij,ij->i", quats, quats)
+    not_normalized = np.abs(squared_norms - 1.0) > 1e-5
+    if np.any(not_normalized):
+        first = int(np.argmax(not_normalized))
+        raise ValueError(f"Quaternion {quats[first]} is not normalized")
+    qw, qx, qy, qz = quats.T
+    matrices = np.empty((quats.shape[0], 3, 3))
+    matrices[:, 0, 0] = 1 - 2 * (qy**2 + qz**2)
+    matrices[:, 0, 1] = 2 * (qx * qy - qz * qw)
+    matrices[:, 0, 2] = 2 * (qw * qy + qx * qz)
+    matrices[:, 1, 0] = 2 * (qx * qy + qz * qw)
+    matrices[:, 1, 1] = 1 - 2 * (qx**2 + qz**2)
+    matrices[:, 1, 2] = 2 * (qy * qz - qx * qw)
+    matrices[:, 2, 0] = 2 * (qx * qz - qy * qw)
+    matrices[:, 2, 1] = 2 * (qy * qz + qx * qw)
+    matrices[:, 2, 2] = 1 - 2 * (qx**2 + qy**2)
+    return matrices
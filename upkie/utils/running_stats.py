@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+
+class RunningStats:
+
+    """!
+    Running statistics of a scalar signal in constant memory.
+    """
+
+    count: int
+    last: float
+    max: float
+    mean: float
+
+    def __init__(self):
+        """!
+        Initialize statistics with no sample.
+        """
+        self.reset()
+
+    def reset(self) -> None:
+        """!
+        Forget all samples.
+        """
+        self.count = 0
+        self.last = 0.0
+        self.max = 0.0
+        self.mean = 0.0
+
+    def update(self, value: float) -> None:
+        """!
+        Add a new sample.
+
+        @param value New sample.
+        """
+        self.count += 1
+        self.last = value
+        self.max = value if self.count == 1 else max(self.max, value)
+        self.mean += (value - self.mean) / self.count
+
+    def as_dict(self) -> dict:
+        """!
+        Get statistics as a dictionary, e.g. for logging.
+
+        @returns Dictionary with ``count``, ``last``, ``max`` and ``mean``
+            keys.
+        """
+        return {
+            "count": self.count,
+            "last": self.last,
+            "max": self.max,
+            "mean": self.mean,
+        }
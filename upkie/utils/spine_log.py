@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+from typing import Iterator
+
+import msgpack
+
+
+def read_spine_log(path: str) -> Iterator[dict]:
+    """!
+    Iterate over the entries of a spine log.
+
+    Spines log their full action and observation dictionaries at every cycle,
+    as a stream of MessagePack dictionaries, for instance to
+    ``/tmp/<datetime>_bullet_spine.mpack``.
+
+    @param path Path to the log file.
+    @returns Iterator over log entries, oldest first.
+    """
+    with open(path, "rb") as file:
+        unpacker = msgpack.Unpacker(file, raw=False)
+        for entry in unpacker:
+            yield entry
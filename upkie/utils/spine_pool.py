@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""!
+Manage the lifecycle of a pool of spine processes.
+"""
+
+import os
+import secrets
+import signal
+import subprocess
+import threading
+import time
+from typing import List, Optional, Sequence
+
+from .exceptions import SpineError
+from .spdlog import logging
+
+
+class SpinePool:
+
+    """!
+    Pool of spine processes, typically Bullet spines for training.
+
+    Each spine gets a unique shared-memory name, built from the process ID of
+    the pool, the index of the spine and a random token, so that several pools
+    can run on the same machine without collision. Spines are started in
+    parallel and the pool waits until each of them has created its
+    shared-memory file, so that environments can connect to them right away.
+
+    Crashed spines are restarted by :func:`check`, either called by the user
+    or periodically by a watchdog thread, see :func:`start_watchdog`.
+    Environments then reconnect to them, see
+    @ref upkie.envs.upkie_base_env.UpkieBaseEnv.reconnect_spine.
+
+    Usage:
+
+        >>> with SpinePool("bazel-bin/spines/bullet_spine", 4) as pool:
+        ...     envs = [
+        ...         UpkieGroundVelocity(shm_name=shm_name)
+        ...         for shm_name in pool.shm_names
+        ...     ]
+    """
+
+    argv: List[str]
+    shm_names: List[str]
+    spine_path: str
+    startup_timeout: float
+
+    def __init__(
+        self,
+        spine_path: str,
+        nb_spines: int,
+        argv: Optional[Sequence[str]] = None,
+        startup_timeout: float = 10.0,
+    ):
+        """!
+        Start spine processes and wait until they are ready.
+
+        @param spine_path Path to the spine binary.
+        @param nb_spines Number of spines to start.
+        @param argv Additional command-line arguments for all spines, for
+            instance ``["--nb-substeps", "5"]``.
+        @param startup_timeout Maximum duration in seconds to wait for a spine
+            to create its shared memory.
+        @raise SpineError If a spine exits or times out during startup.
+        """
+        token = secrets.token_hex(4)
+        self.__lock = threading.RLock()
+        self.__watchdog: Optional[threading.Thread] = None
+        self.__watchdog_stop = threading.Event()
+        self.__processes: List[Optional[subprocess.Popen]] = [
+            None for _ in range(nb_spines)
+        ]
+        self.argv = list(argv) if argv is not None else []
+        self.shm_names = [
+            f"/upkie_{os.getpid()}_{token}_{index}"
+            for index in range(nb_spines)
+        ]
+        self.spine_path = spine_path
+        self.startup_timeout = startup_timeout
+        try:
+            for index in range(nb_spines):
+                self.__spawn(index)
+            for index in range(nb_spines):
+                self.__wait_until_ready(index)
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.shm_names)
+
+    def __get_shm_path(self, index: int) -> str:
+        return "/dev/shm/" + self.shm_names[index].lstrip("/")
+
+    def __spawn(self, index: int) -> None:
+        shm_name = self.shm_names[index]
+        shm_path = self.__get_shm_path(index)
+        if os.path.exists(shm_path):  # left over by a crashed spine
+            os.unlink(shm_path)
+        self.__processes[index] = subprocess.Popen(
+            [self.spine_path, "--shm-name", shm_name] + self.argv,
+            stdin=subprocess.DEVNULL,
+        )
+
+    def __wait_until_ready(self, index: int) -> None:
+        process = self.__processes[index]
+        shm_path = self.__get_shm_path(index)
+        stop = time.perf_counter() + self.startup_timeout
+        while not os.path.exists(shm_path):
+            if process.poll() is not None:
+                raise SpineError(
+                    f"Spine {self.shm_names[index]} exited during startup "
+                    f"with return code {process.returncode}"
+                )
+            if time.perf_counter() > stop:
+                raise SpineError(
+                    f"Spine {self.shm_names[index]} did not start within "
+                    f"{self.startup_timeout} s"
+                )
+            time.sleep(0.01)
+
+    def get_pid(self, index: int) -> int:
+        """!
+        Get the process ID of a spine.
+
+        @param index Index of the spine in the pool.
+        @returns Process ID of the spine.
+        @raise SpineError If the spine is not running.
+        """
+        process = self.__processes[index]
+        if process is None:
+            raise SpineError(f"Spine {self.shm_names[index]} is not running")
+        return process.pid
+
+    def is_alive(self, index: int) -> bool:
+        """!
+        Check whether a spine process is running.
+
+        @param index Index of the spine in the pool.
+        @returns True if and only if the spine process is running.
+        """
+        process = self.__processes[index]
+        return process is not None and process.poll() is None
+
+    def check(self) -> List[int]:
+        """!
+        Health-check all spines and restart those that have exited.
+
+        @returns Indices of restarted spines.
+
+        @note Environments connected to a restarted spine need to reconnect to
+        its shared memory, which has the same name as before.
+        """
+        restarted = []
+        with self.__lock:
+            for index in range(len(self)):
+                if not self.is_alive(index):
+                    logging.warning(
+                        f"Spine {self.shm_names[index]} exited, "
+                        "restarting it..."
+                    )
+                    self.restart(index)
+                    restarted.append(index)
+        return restarted
+
+    def start_watchdog(self, period: float = 0.1) -> None:
+        """!
+        Check spines periodically from a background thread, restarting those
+        that have exited.
+
+        @param period Duration in seconds between two checks.
+
+        @note Start the watchdog after forking processes that use the pool,
+        for instance after creating a ``SubprocVecEnv``.
+        """
+        if self.__watchdog is not None:
+            return
+        self.__watchdog_stop.clear()
+        self.__watchdog = threading.Thread(
+            target=self.__watch, args=(period,), daemon=True
+        )
+        self.__watchdog.start()
+
+    def stop_watchdog(self) -> None:
+        """!
+        Stop the watchdog thread, if it is running.
+        """
+        if self.__watchdog is None:
+            return
+        self.__watchdog_stop.set()
+        self.__watchdog.join()
+        self.__watchdog = None
+
+    def __watch(self, period: float) -> None:
+        while not self.__watchdog_stop.wait(period):
+            try:
+                self.check()
+            except SpineError as exception:  # retry at the next check
+                logging.error(str(exception))
+
+    def restart(self, index: int) -> None:
+        """!
+        Restart a spine with the same shared-memory name.
+
+        @param index Index of the spine in the pool.
+        """
+        with self.__lock:
+            self.__terminate(index)
+            self.__spawn(index)
+            self.__wait_until_ready(index)
+
+    def __terminate(self, index: int) -> None:
+        process = self.__processes[index]
+        if process is None:
+            return
+        if process.poll() is None:
+            process.send_signal(signal.SIGINT)  # spines stop cleanly on SIGINT
+            try:
+                process.wait(timeout=self.startup_timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        self.__processes[index] = None
+
+    def close(self) -> None:
+        """!
+        Stop the watchdog and terminate all spine processes.
+        """
+        self.stop_watchdog()
+        with self.__lock:
+            for index in range(len(self)):
+                self.__terminate(index)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Test nested dictionary deltas."""
+
+import math
+import unittest
+
+import numpy as np
+
+from upkie.utils.nested_delta import nested_delta
+
+
+class TestNestedDelta(unittest.TestCase):
+    def test_first_delta_is_full(self):
+        last = {}
+        new = {"a": {"b": 1.0, "c": "foo"}, "d": 2}
+        self.assertEqual(nested_delta(new, last), new)
+        self.assertEqual(last, new)
+
+    def test_changed_leaves(self):
+        last = {}
+        nested_delta({"a": {"b": 1.0, "c": 2.0}, "d": 3.0}, last)
+        delta = nested_delta({"a": {"b": 1.0, "c": 4.0}, "d": 3.0}, last)
+        self.assertEqual(delta, {"a": {"c": 4.0}})
+        self.assertEqual(nested_delta({"a": {"c": 4.0}}, last), {})
+
+    def test_nan(self):
+        last = {}
+        nested_delta({"position": math.nan}, last)
+        self.assertEqual(nested_delta({"position": math.nan}, last), {})
+        self.assertEqual(
+            nested_delta({"position": 1.0}, last), {"position": 1.0}
+        )
+
+    def test_arrays_always_sent(self):
+        last = {}
+        nested_delta({"x": np.zeros(3)}, last)
+        delta = nested_delta({"x": np.zeros(3)}, last)
+        self.assertIn("x", delta)
+
+    def test_leaf_becomes_dict(self):
+        last = {}
+        nested_delta({"a": 1.0}, last)
+        delta = nested_delta({"a": {"b": 2.0}}, last)
+        self.assertEqual(delta, {"a": {"b": 2.0}})
+
+
+if __name__ == "__main__":
+    unittest.main()
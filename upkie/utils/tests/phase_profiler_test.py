@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Test phase profiler."""
+
+import unittest
+
+from upkie.utils.exceptions import UpkieException
+from upkie.utils.phase_profiler import PhaseProfiler
+
+
+class TestPhaseProfiler(unittest.TestCase):
+    def test_empty_window(self):
+        with self.assertRaises(UpkieException):
+            PhaseProfiler(["a"], window=0)
+
+    def test_no_cycle(self):
+        profiler = PhaseProfiler(["a", "b"])
+        self.assertEqual(profiler.get_stats(), {})
+
+    def test_stats(self):
+        profiler = PhaseProfiler(["a", "b"], window=10)
+        for _ in range(25):
+            profiler.start()
+            profiler.lap(0)
+            profiler.lap(1)
+            profiler.next_cycle()
+        self.assertEqual(profiler.nb_cycles, 10)
+        stats = profiler.get_stats()
+        self.assertEqual(set(stats.keys()), {"a", "b"})
+        for phase_stats in stats.values():
+            self.assertGreaterEqual(phase_stats["p99"], phase_stats["p50"])
+            self.assertGreaterEqual(phase_stats["max"], phase_stats["p99"])
+        last = profiler.get_last()
+        self.assertGreaterEqual(last["a"], 0.0)
+        self.assertLessEqual(last["b"], stats["b"]["max"])
+
+
+if __name__ == "__main__":
+    unittest.main()
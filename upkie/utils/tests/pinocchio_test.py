@@ -6,6 +6,8 @@
 
 """Test Pinocchio utility functions."""
 
+import os
+import tempfile
 import unittest
 
 import numpy as np
@@ -15,6 +17,9 @@ from upkie.utils.pinocchio import (
     box_position_limits,
     box_torque_limits,
     box_velocity_limits,
+    compute_robot_limits,
+    get_robot_limits,
+    load_robot_model,
 )
 
 
@@ -55,6 +60,28 @@ class TestPinocchio(unittest.TestCase):
         self.assertTrue(np.allclose(v_max, [+np.inf, 42.0, +np.inf]))
         self.assertTrue(np.allclose(tau_max, [+np.inf, 1.0, +np.inf]))
 
+    def test_get_robot_limits(self):
+        limits = get_robot_limits()
+        self.assertIs(get_robot_limits(), limits)
+        self.assertEqual(len(limits.joint_names), 6)
+        self.assertEqual(limits.q_min.shape, (6,))
+        self.assertFalse(limits.tau_max.flags.writeable)
+        model = load_robot_model().model
+        reference = compute_robot_limits(model)
+        for array, ref_array in zip(limits[1:], reference[1:]):
+            self.assertTrue(np.array_equal(array, ref_array))
+
+    def test_robot_limits_cache_dir(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            limits = get_robot_limits(cache_dir)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            get_robot_limits.cache_clear()
+            loaded = get_robot_limits(cache_dir)
+            self.assertIsNot(loaded, limits)
+            self.assertEqual(loaded.joint_names, limits.joint_names)
+            for array, ref_array in zip(loaded[1:], limits[1:]):
+                self.assertTrue(np.array_equal(array, ref_array))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Test rate regulator."""
+
+import time
+import unittest
+
+from upkie.utils.exceptions import UpkieException
+from upkie.utils.rate_regulator import RateRegulator
+
+
+class TestRateRegulator(unittest.TestCase):
+    def test_invalid_parameters(self):
+        with self.assertRaises(UpkieException):
+            RateRegulator(0.0)
+        with self.assertRaises(UpkieException):
+            RateRegulator(100.0, spin_duration=-1.0)
+
+    def test_period(self):
+        rate = RateRegulator(100.0)
+        self.assertAlmostEqual(rate.dt, 0.01)
+        self.assertAlmostEqual(rate.period, 0.01)
+
+    def test_regular_loop(self):
+        rate = RateRegulator(1000.0, spin_duration=1e-3)
+        t0 = time.perf_counter()
+        for _ in range(20):
+            rate.sleep()
+        self.assertGreaterEqual(time.perf_counter() - t0, 19e-3)
+        stats = rate.get_stats()
+        self.assertEqual(stats["count"], 20)
+        self.assertEqual(stats["deadline_misses"], 0)
+        self.assertEqual(sum(stats["jitter"]["histogram"]), 20)
+        self.assertGreaterEqual(stats["jitter"]["mean"], 0.0)
+        self.assertLessEqual(stats["jitter"]["p50"], stats["jitter"]["p99"])
+        self.assertLessEqual(stats["jitter"]["p99"], stats["jitter"]["max"])
+
+    def test_overruns(self):
+        rate = RateRegulator(1000.0, warn=False)
+        for _ in range(3):
+            time.sleep(2e-3)
+            rate.sleep()
+        self.assertLess(rate.slack, 0.0)
+        self.assertEqual(rate.deadline_misses, 3)
+        self.assertEqual(rate.consecutive_overruns, 3)
+        rate.restart()
+        rate.sleep()
+        self.assertEqual(rate.consecutive_overruns, 0)
+        stats = rate.get_stats()
+        self.assertEqual(stats["deadline_misses"], 3)
+        self.assertEqual(stats["max_consecutive_overruns"], 3)
+        self.assertGreaterEqual(stats["jitter"]["max"], 1e-3)
+
+    def test_reset_stats(self):
+        rate = RateRegulator(1000.0, warn=False)
+        time.sleep(2e-3)
+        rate.sleep()
+        rate.reset_stats()
+        stats = rate.get_stats()
+        self.assertEqual(stats["count"], 0)
+        self.assertEqual(stats["deadline_misses"], 0)
+        self.assertEqual(stats["jitter"]["p99"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
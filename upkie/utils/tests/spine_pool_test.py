@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Inria
+
+"""Test spine pool."""
+
+import os
+import signal
+import stat
+import sys
+import tempfile
+import time
+import unittest
+
+from upkie.utils.exceptions import SpineError
+from upkie.utils.spine_pool import SpinePool
+
+FAKE_SPINE = f"""#!{sys.executable}
+import os, signal, sys, time
+shm_path = "/dev/shm/" + sys.argv[sys.argv.index("--shm-name") + 1][1:]
+if "--crash" in sys.argv:
+    sys.exit(1)
+def stop(signum, frame):
+    os.unlink(shm_path)
+    sys.exit(0)
+signal.signal(signal.SIGINT, stop)
+open(shm_path, "w").close()
+while True:
+    time.sleep(0.01)
+"""
+
+
+class TestSpinePool(unittest.TestCase):
+    def setUp(self):
+        fd, self.spine_path = tempfile.mkstemp(suffix="_spine.py")
+        with os.fdopen(fd, "w") as fh:
+            fh.write(FAKE_SPINE)
+        os.chmod(self.spine_path, stat.S_IRWXU)
+
+    def tearDown(self):
+        os.unlink(self.spine_path)
+
+    def test_start_and_close(self):
+        with SpinePool(self.spine_path, 3) as pool:
+            self.assertEqual(len(pool), 3)
+            self.assertEqual(len(set(pool.shm_names)), 3)
+            for index, shm_name in enumerate(pool.shm_names):
+                self.assertTrue(pool.is_alive(index))
+                self.assertTrue(os.path.exists(f"/dev/shm{shm_name}"))
+        for index, shm_name in enumerate(pool.shm_names):
+            self.assertFalse(pool.is_alive(index))
+            self.assertFalse(os.path.exists(f"/dev/shm{shm_name}"))
+
+    def test_unique_names(self):
+        with SpinePool(self.spine_path, 1) as pool_1:
+            with SpinePool(self.spine_path, 1) as pool_2:
+                self.assertNotEqual(pool_1.shm_names, pool_2.shm_names)
+
+    def test_crash_on_startup(self):
+        with self.assertRaises(SpineError):
+            SpinePool(self.spine_path, 2, argv=["--crash"])
+
+    def test_startup_timeout(self):
+        with open(self.spine_path, "w") as fh:
+            fh.write(f"#!{sys.executable}\nimport time\ntime.sleep(10)\n")
+        with self.assertRaises(SpineError):
+            SpinePool(self.spine_path, 1, startup_timeout=0.1)
+
+    def test_check_restarts_crashed_spines(self):
+        with SpinePool(self.spine_path, 2) as pool:
+            self.assertEqual(pool.check(), [])
+            pid = pool.get_pid(1)
+            os.kill(pid, signal.SIGKILL)
+            while pool.is_alive(1):
+                time.sleep(0.01)
+            self.assertEqual(pool.check(), [1])
+            self.assertTrue(pool.is_alive(1))
+            self.assertNotEqual(pool.get_pid(1), pid)
+
+    def test_watchdog_restarts_crashed_spines(self):
+        with SpinePool(self.spine_path, 1) as pool:
+            pool.start_watchdog(period=0.01)
+            pid = pool.get_pid(0)
+            os.kill(pid, signal.SIGKILL)
+            stop = time.perf_counter() + 5.0
+            while time.perf_counter() < stop:
+                if pool.is_alive(0) and pool.get_pid(0) != pid:
+                    break
+                time.sleep(0.01)
+            self.assertTrue(pool.is_alive(0))
+            self.assertNotEqual(pool.get_pid(0), pid)
+        self.assertFalse(pool.is_alive(0))
+
+
+if __name__ == "__main__":
+    unittest.main()